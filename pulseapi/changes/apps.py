@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ChangesConfig(AppConfig):
+    name = 'pulseapi.changes'
+
+    def ready(self):
+        # Importing this file so the signals in signals.py works.
+        # The noqa is added as tests fail regarding an 'unused import' without it.
+        import pulseapi.changes.signals  # noqa: F401
@@ -0,0 +1,35 @@
+"""
+Prune the change log, keeping every change of the last days and only the
+latest change of other objects. Meant to run periodically, e.g. daily.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from pulseapi.changes.models import Change
+
+
+class Command(BaseCommand):
+    help = 'Remove changes that clients syncing from scratch no longer need from the change feed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            action='store',
+            type=int,
+            default=settings.CHANGE_FEED_RETENTION_DAYS,
+            dest='days',
+            help='How many days of changes to keep in full. Default: {}'.format(settings.CHANGE_FEED_RETENTION_DAYS)
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        count = Change.objects.prune(before)
+
+        self.stdout.write('Removed {count} changes made before {before}'.format(
+            count=count,
+            before=before.isoformat(),
+        ))
+        self.stdout.write(self.style.SUCCESS('Done!'))
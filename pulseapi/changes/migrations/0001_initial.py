@@ -0,0 +1,28 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:53
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('object_type', models.CharField(choices=[('entry', 'entry'), ('profile', 'profile')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('created', 'created'), ('modified', 'modified'), ('moderated', 'moderated'), ('deleted', 'deleted')], max_length=20)),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
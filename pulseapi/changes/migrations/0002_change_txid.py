@@ -0,0 +1,29 @@
+# Generated by Django 2.2.13 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='change',
+            options={'ordering': ['txid', 'id']},
+        ),
+        # Existing changes were all committed long ago, so they share a
+        # transaction id that comes before every new one.
+        migrations.AddField(
+            model_name='change',
+            name='txid',
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['txid', 'id'], name='changes_txid_id'),
+        ),
+    ]
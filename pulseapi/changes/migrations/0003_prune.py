@@ -0,0 +1,30 @@
+# Generated by Django 2.2.13 on 2026-10-18 14:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0002_change_txid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Prune',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField()),
+                ('before', models.DateTimeField()),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='change',
+            index=models.Index(fields=['object_type', 'object_id', 'txid'], name='changes_object'),
+        ),
+    ]
@@ -0,0 +1,139 @@
+"""A change log of entries and profiles, for clients that sync incrementally"""
+from django.db import models, transaction
+from django.utils import timezone
+
+from pulseapi.utility.expressions import AssignedTransactionId, OldestRunningTransactionId, TransactionId
+
+
+class ChangeQuerySet(models.query.QuerySet):
+    """
+    A queryset for changes with convenience queries
+    """
+
+    def record(self, object_type, object_ids, action):
+        """
+        Append a change with the same action for each of the given objects
+        """
+        now = timezone.now()
+
+        return self.bulk_create([
+            Change(object_type=object_type, object_id=object_id, action=action, timestamp=now, txid=TransactionId())
+            for object_id in object_ids
+        ])
+
+    def prune(self, before):
+        """
+        Remove the changes made before `before` that clients syncing from
+        scratch don't need: all but the latest change of every object, and
+        the latest changes of deleted objects. Sequence tokens from before
+        the pruned changes expire, see `Prune`.
+
+        The changes that are left are moved to the last pruned transaction,
+        so that syncing them from scratch never hands out a sequence token
+        that looks expired.
+        """
+        pruned = self.filter(timestamp__lt=before)
+        txid = pruned.aggregate(txid=models.Max('txid'))['txid']
+
+        if txid is None:
+            return 0
+
+        later_changes = Change.objects.filter(
+            models.Q(txid__gt=models.OuterRef('txid')) |
+            models.Q(txid=models.OuterRef('txid'), id__gt=models.OuterRef('id')),
+            object_type=models.OuterRef('object_type'),
+            object_id=models.OuterRef('object_id'),
+        )
+        unneeded = pruned.annotate(superseded=models.Exists(later_changes)).filter(
+            models.Q(superseded=True) | models.Q(action=Change.DELETED)
+        )
+
+        with transaction.atomic():
+            Prune.objects.create(txid=txid, before=before)
+            count, _ = self.filter(pk__in=unneeded.values('pk')).delete()
+            self.filter(txid__lt=txid).update(txid=txid)
+
+        return count
+
+    def settled(self):
+        """
+        Return the changes that no transaction still running can add to:
+        those of transactions older than the oldest running one, and those
+        of the current transaction.
+        """
+        return self.filter(
+            models.Q(txid__lt=OldestRunningTransactionId()) |
+            models.Q(txid=AssignedTransactionId())
+        )
+
+
+class Change(models.Model):
+    """
+    A change to an entry or a profile. Changes are appended by the signal
+    handlers in signals.py, and by the touch() methods of entries and
+    profiles.
+
+    Changes are listed in the order of the transactions that made them, and
+    the id of its transaction is the sequence token that clients sync from.
+    Ids of changes are handed out when they are saved rather than when they
+    are committed, so a long transaction can commit changes with lower ids
+    than changes that clients already synced.
+    """
+    ENTRY = 'entry'
+    PROFILE = 'profile'
+    OBJECT_TYPES = (
+        (ENTRY, 'entry'),
+        (PROFILE, 'profile'),
+    )
+
+    CREATED = 'created'
+    MODIFIED = 'modified'
+    MODERATED = 'moderated'
+    DELETED = 'deleted'
+    ACTIONS = (
+        (CREATED, 'created'),
+        (MODIFIED, 'modified'),
+        (MODERATED, 'moderated'),
+        (DELETED, 'deleted'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    object_type = models.CharField(max_length=20, choices=OBJECT_TYPES)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=20, choices=ACTIONS)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
+    txid = models.BigIntegerField(editable=False)
+
+    objects = ChangeQuerySet.as_manager()
+
+    def __str__(self):
+        return '{object_type} {object_id} {action}'.format(
+            object_type=self.object_type,
+            object_id=self.object_id,
+            action=self.action,
+        )
+
+    class Meta:
+        ordering = ['txid', 'id']
+        indexes = [
+            models.Index(fields=['txid', 'id'], name='changes_txid_id'),
+            models.Index(fields=['object_type', 'object_id', 'txid'], name='changes_object'),
+        ]
+
+
+class Prune(models.Model):
+    """
+    A pruning of the change log (see `ChangeQuerySet.prune`). Clients that
+    synced up to a transaction before `txid`, or that ask for changes since
+    a time before `before`, could miss deletions, and have to sync again
+    from scratch.
+    """
+    txid = models.BigIntegerField()
+    before = models.DateTimeField()
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return 'changes before {before}'.format(before=self.before)
+
+    class Meta:
+        ordering = ['id']
@@ -0,0 +1,20 @@
+"""Serialize the models"""
+from rest_framework import serializers
+
+from pulseapi.changes.models import Change
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    """
+    Serializes changes, with the id of their transaction as their `sequence`
+    """
+    sequence = serializers.ReadOnlyField(source='txid')
+    type = serializers.ReadOnlyField(source='object_type')
+    id = serializers.ReadOnlyField(source='object_id')
+
+    class Meta:
+        """
+        Meta class. Because it's required by ModelSerializer
+        """
+        model = Change
+        read_only_fields = fields = ('sequence', 'type', 'id', 'action', 'timestamp',)
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from pulseapi.entries.models import Entry
+from pulseapi.profiles.models import UserProfile
+from .models import Change
+
+# Saving an entry touch()es it (see pulseapi/entries/signals.py), which
+# records the modification, so only the other entry actions are recorded here.
+
+
+@receiver(pre_save, sender=Entry)
+def remember_moderation_state(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        instance._previous_moderation_state_id = Entry.objects.filter(
+            pk=instance.pk
+        ).values_list('moderation_state_id', flat=True).first()
+
+
+@receiver(post_save, sender=Entry)
+def record_entry_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if created:
+        Change.objects.record(Change.ENTRY, [instance.pk], Change.CREATED)
+    elif instance.moderation_state_id != getattr(instance, '_previous_moderation_state_id', None):
+        Change.objects.record(Change.ENTRY, [instance.pk], Change.MODERATED)
+
+
+@receiver(post_save, sender=UserProfile)
+def record_profile_change(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        Change.objects.record(Change.PROFILE, [instance.pk], Change.CREATED if created else Change.MODIFIED)
+
+
+@receiver(post_delete, sender=Entry)
+def record_entry_deletion(sender, instance, **kwargs):
+    Change.objects.record(Change.ENTRY, [instance.pk], Change.DELETED)
+
+
+@receiver(post_delete, sender=UserProfile)
+def record_profile_deletion(sender, instance, **kwargs):
+    Change.objects.record(Change.PROFILE, [instance.pk], Change.DELETED)
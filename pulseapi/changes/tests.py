@@ -0,0 +1,189 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Max
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from pulseapi.changes.models import Change
+from pulseapi.entries.models import ModerationState
+from pulseapi.profiles.models import UserBookmarks, UserProfile
+from pulseapi.tests import boostrap
+
+
+class TestChangeFeed(TransactionTestCase):
+    # Sequence tokens are transaction ids, so changes have to be made in
+    # transactions of their own rather than in a single test transaction.
+    # Data created by migrations (like moderation states) is restored for
+    # every test.
+    serialized_rollback = True
+
+    def setUp(self):
+        boostrap(self, name='plain user', email='test@example.org', is_active=True)
+        self.sequence = Change.objects.aggregate(sequence=Max('txid'))['sequence']
+
+    def get_changes(self, **params):
+        params.setdefault('since', self.sequence)
+        response = self.client.get(reverse('changes'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_actions(self, **params):
+        return {
+            (change['type'], change['id']): change['action']
+            for change in self.get_changes(**params)['results']
+        }
+
+    def test_no_changes(self):
+        """
+        Make sure the sequence token stays the same when nothing changed
+        """
+        changes = self.get_changes()
+
+        self.assertEqual(changes, {'sequence': self.sequence, 'next': None, 'results': []})
+
+    def test_entry_changes(self):
+        """
+        Make sure modified, moderated and deleted entries are listed
+        """
+        entry = self.entries[0]
+        profile = self.user.profile
+
+        UserBookmarks.objects.toggle_bookmark(profile, entry.id)
+        actions = self.get_actions()
+        self.assertEqual(actions[('entry', entry.id)], 'modified')
+        self.assertEqual(actions[('profile', profile.id)], 'modified')
+
+        changes = self.get_changes()
+        entry.moderation_state = ModerationState.objects.get(name='Pending')
+        entry.save()
+        self.assertEqual(self.get_actions(since=changes['sequence'])[('entry', entry.id)], 'moderated')
+
+        # Changes to entries that aren't public aren't listed
+        changes = self.get_changes()
+        entry.title = 'a brand new title'
+        entry.save()
+        self.assertNotIn(('entry', entry.id), self.get_actions(since=changes['sequence']))
+        self.assertGreater(self.get_changes(since=changes['sequence'])['sequence'], changes['sequence'])
+
+        entry_id = entry.id
+        entry.delete()
+        self.assertEqual(self.get_actions()[('entry', entry_id)], 'deleted')
+
+    def test_created_profiles(self):
+        """
+        Make sure new profiles are listed as created, however often they change
+        """
+        profile = UserProfile.objects.create()
+        profile.location = 'Springfield, IL'
+        profile.save()
+
+        self.assertEqual(self.get_actions()[('profile', profile.id)], 'created')
+
+        profile_id = profile.id
+        profile.delete()
+        self.assertEqual(self.get_actions()[('profile', profile_id)], 'deleted')
+
+    def test_paging(self):
+        """
+        Make sure changes can be synced page by page
+        """
+        for entry in self.entries:
+            entry.title = 'a brand new title'
+            entry.save()
+
+        changes = self.get_changes(page_size=1)
+        self.assertEqual(len(changes['results']), 1)
+        self.assertIn('since={}'.format(changes['sequence']), changes['next'])
+
+        seen = {(change['type'], change['id']) for change in changes['results']}
+        while changes['next']:
+            changes = self.client.get(changes['next']).json()
+            seen.update((change['type'], change['id']) for change in changes['results'])
+
+        self.assertEqual(seen, set(self.get_actions()))
+
+    def test_updated_since(self):
+        """
+        Make sure changes can be requested by date and time
+        """
+        entry = self.entries[0]
+        entry.title = 'a brand new title'
+        entry.save()
+        timestamp = Change.objects.filter(object_type=Change.ENTRY, object_id=entry.id).latest('id').timestamp
+
+        changes = self.client.get(reverse('changes'), {'updated_since': timestamp.isoformat()}).json()
+        self.assertIn(('entry', entry.id), {(change['type'], change['id']) for change in changes['results']})
+
+        changes = self.client.get(reverse('changes'), {'updated_since': '2999-01-01T00:00:00'}).json()
+        self.assertEqual(changes['results'], [])
+
+        for params in ({'updated_since': 'yesterday'}, {'since': 'a'}, {'page_size': -1}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('changes'), params).status_code, 400)
+
+    def test_running_transactions_hold_back_changes(self):
+        """
+        Make sure changes aren't listed while an older transaction is still
+        running, so that the changes it commits later aren't skipped
+        """
+        entry = self.entries[0]
+        other_connection = connection.copy()
+        self.addCleanup(other_connection.close)
+        other_connection.set_autocommit(False)
+
+        with other_connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO changes_change (object_type, object_id, action, timestamp, txid) '
+                "VALUES ('entry', %s, 'modified', NOW(), txid_current())",
+                [entry.id],
+            )
+
+        profile = UserProfile.objects.create()
+        self.assertEqual(self.get_changes(), {'sequence': self.sequence, 'next': None, 'results': []})
+
+        other_connection.commit()
+        changes = self.get_changes()['results']
+        self.assertEqual([(change['type'], change['id']) for change in changes], [
+            ('entry', entry.id),
+            ('profile', profile.id),
+        ])
+        self.assertLess(changes[0]['sequence'], changes[1]['sequence'])
+
+    def test_pruning(self):
+        """
+        Make sure pruning keeps the latest change of every object that still
+        exists, and that clients that synced before it have to start over
+        """
+        entry = self.entries[0]
+        for title in ('a brand new title', 'another title'):
+            entry.title = title
+            entry.save()
+
+        profile = UserProfile.objects.create()
+        profile_id = profile.id
+        profile.delete()
+
+        month_ago = timezone.now() - timedelta(days=40)
+        Change.objects.update(timestamp=month_ago)
+        call_command('prune_changes', days=30, stdout=StringIO())
+
+        entry_changes = Change.objects.filter(object_type=Change.ENTRY, object_id=entry.id)
+        self.assertEqual(entry_changes.count(), 1)
+        self.assertFalse(Change.objects.filter(object_type=Change.PROFILE, object_id=profile_id).exists())
+
+        for params in ({'since': self.sequence}, {'updated_since': month_ago.isoformat()}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('changes'), params).status_code, 410)
+
+        changes = self.get_changes(since=0)
+        self.assertIn(('entry', entry.id), {(change['type'], change['id']) for change in changes['results']})
+        self.assertEqual(self.get_changes(since=changes['sequence'])['results'], [])
+
+        # Syncing from scratch again never hands out an expired token
+        changes = self.get_changes(since=0, page_size=1)
+        self.assertIsNone(changes['next'])
+        self.assertEqual(self.get_changes(since=changes['sequence'])['results'], [])
@@ -0,0 +1,8 @@
+from django.conf.urls import url
+
+from pulseapi.changes.views import ChangeListView
+
+
+urlpatterns = [
+    url('^$', ChangeListView.as_view(), name='changes'),
+]
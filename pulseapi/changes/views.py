@@ -0,0 +1,141 @@
+"""
+The change feed of entries and profiles, for clients that keep
+a copy of them and want to sync only what changed
+"""
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+from pulseapi.changes.models import Change, Prune
+from pulseapi.changes.serializers import ChangeSerializer
+from pulseapi.entries.models import Entry
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def get_positive_int(query_params, name, default):
+    value = query_params.get(name)
+
+    if value is None:
+        return default
+
+    try:
+        value = int(value)
+    except ValueError:
+        value = -1
+
+    if value < 0:
+        raise ValidationError({name: 'Must be a positive integer'})
+
+    return value
+
+
+def collapse_changes(changes):
+    """
+    Return one change per object: the last one, except that an object
+    that was created and not deleted since is reported as created.
+    """
+    collapsed = {}
+
+    for change in changes:
+        key = (change.object_type, change.object_id)
+        previous = collapsed.pop(key, None)
+
+        if previous and previous.action == Change.CREATED and change.action != Change.DELETED:
+            change.action = Change.CREATED
+
+        collapsed[key] = change
+
+    return list(collapsed.values())
+
+
+class ChangeListView(APIView):
+    """
+    A view to retrieve the entries and profiles that were created, modified,
+    moderated or deleted after a sequence token (`?since=`) or a point in
+    time (`?updated_since=`), oldest first.
+
+    Each response has a `sequence` token to sync from next time, and a
+    `next` url if there are more changes. Sequence tokens are transaction
+    ids, and changes are held back until every older transaction is done,
+    so that changes that are still being committed are never skipped.
+    Pages hold whole transactions, so they can have more than `page_size`
+    changes.
+
+    Old changes are pruned from time to time, after which clients that are
+    behind get a 410 and have to sync again from scratch.
+    """
+    def get_queryset(self, since, updated_since):
+        changes = Change.objects.settled().filter(txid__gt=since)
+
+        if updated_since:
+            changes = changes.filter(timestamp__gte=updated_since)
+
+        return changes
+
+    def get(self, request, *args, **kwargs):
+        query_params = request.query_params
+        since = get_positive_int(query_params, 'since', 0)
+        page_size = min(get_positive_int(query_params, 'page_size', DEFAULT_PAGE_SIZE) or 1, MAX_PAGE_SIZE)
+        updated_since = query_params.get('updated_since')
+
+        if updated_since:
+            updated_since = parse_datetime(updated_since)
+
+            if updated_since is None:
+                raise ValidationError({'updated_since': 'Must be an ISO 8601 date and time'})
+
+            if timezone.is_naive(updated_since):
+                updated_since = timezone.make_aware(updated_since, timezone.utc)
+
+        prune = Prune.objects.aggregate(txid=Max('txid'), before=Max('before'))
+
+        if (since and prune['txid'] and since < prune['txid']) or (
+            updated_since and prune['before'] and updated_since < prune['before']
+        ):
+            return Response(
+                {'detail': 'Changes since then were pruned, sync again from scratch'},
+                status=status.HTTP_410_GONE,
+            )
+
+        changes = self.get_queryset(since, updated_since)
+
+        # Entries that aren't public are only reported once they are
+        # moderated or deleted, because that is when clients see them
+        # appear or disappear.
+        visible_changes = changes.exclude(
+            Q(object_type=Change.ENTRY) &
+            Q(action__in=(Change.CREATED, Change.MODIFIED)) &
+            ~Q(object_id__in=Entry.objects.public().values('pk'))
+        )
+        page = list(visible_changes[:page_size + 1])
+        has_more = len(page) > page_size
+
+        if has_more:
+            # Finish the transaction of the last change on the page, as the
+            # next page starts after it.
+            last_change = page[page_size - 1]
+            page = page[:page_size] + list(visible_changes.filter(txid=last_change.txid, id__gt=last_change.id))
+            sequence = last_change.txid
+            has_more = visible_changes.filter(txid__gt=sequence).exists()
+
+        if not has_more:
+            # Hidden changes are skipped too, so that clients don't
+            # look at them again the next time.
+            sequence = changes.aggregate(sequence=Max('txid'))['sequence'] or since
+
+        next_url = None
+        if has_more:
+            next_url = replace_query_param(request.build_absolute_uri(), 'since', sequence)
+
+        return Response({
+            'sequence': sequence,
+            'next': next_url,
+            'results': ChangeSerializer(collapse_changes(page), many=True).data,
+        })
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creators', '0015_auto_20180517_1507'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entrycreator',
+            index=models.Index(fields=['profile', 'entry'], name='creators_profile_entry'),
+        ),
+    ]
@@ -35,6 +35,7 @@ class EntryCreator(models.Model):
         order_with_respect_to = 'entry'
         indexes = [
             models.Index(fields=['entry', '_order'], name='uk_entrycreator_entryid_order'),
-            models.Index(fields=['entry', 'profile'], name='uk_entrycreator_entry_profile')
+            models.Index(fields=['entry', 'profile'], name='uk_entrycreator_entry_profile'),
+            models.Index(fields=['profile', 'entry'], name='creators_profile_entry'),
         ]
         unique_together = ('entry', 'profile',)
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 
 class EntriesConfig(AppConfig):
-    name = 'entries'
+    name = 'pulseapi.entries'
+
+    def ready(self):
+        # Importing this file so the signals in signals.py works.
+        # The noqa is added as tests fail regarding an 'unused import' without it.
+        import pulseapi.entries.signals  # noqa: F401
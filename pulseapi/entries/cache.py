@@ -0,0 +1,103 @@
+"""
+Response caching for entry listings.
+
+Cached responses are keyed on a global "entries generation" counter that is
+bumped whenever something that ends up in a serialized entry changes (see
+signals.py in this app). Bumping the counter does not delete anything: stale
+responses are simply never looked up again and expire on their own.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+
+ENTRIES_GENERATION_KEY = 'entries:generation'
+
+
+def get_entries_generation():
+    """
+    Return the current entries generation, initializing it if needed.
+    """
+    generation = cache.get(ENTRIES_GENERATION_KEY)
+
+    if generation is None:
+        # We seed the counter from the clock rather than starting at zero so
+        # that, if the counter ever gets evicted, we can't end up reusing a
+        # generation for which stale responses are still in the cache.
+        cache.add(ENTRIES_GENERATION_KEY, int(time.time() * 1000), timeout=None)
+        generation = cache.get(ENTRIES_GENERATION_KEY)
+
+    return generation
+
+
+def bump_entries_generation():
+    """
+    Invalidate every cached entry response by moving to a new generation.
+    """
+    try:
+        cache.incr(ENTRIES_GENERATION_KEY)
+    except ValueError:
+        # The counter doesn't exist (yet, or anymore), so there is
+        # nothing that could still be served from the cache.
+        get_entries_generation()
+
+
+def get_entries_cache_key(prefix, request, view_name):
+    """
+    Build a cache key for a request, based on the view that handles it,
+    the API version, the absolute url (since paginated responses contain
+    absolute links) and the normalized query parameters.
+    """
+    query_params = request.query_params
+    params = sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+    )
+    raw_key = '|'.join([
+        view_name,
+        str(request.version),
+        request.build_absolute_uri(request.path),
+        urlencode(params),
+    ])
+
+    return 'entries:{prefix}:{generation}:{digest}'.format(
+        prefix=prefix,
+        generation=get_entries_generation(),
+        digest=hashlib.md5(raw_key.encode('utf-8')).hexdigest(),
+    )
+
+
+def get_entry_cache_keys(serializer_name, version, entry_ids, fields=None):
+    """
+    Build a dictionary of {entry id: cache key} for the user-independent
+    serializations of a set of entries, optionally limited to some fields.
+    """
+    generation = get_entries_generation()
+
+    if fields is not None:
+        serializer_name = '{name}[{fields}]'.format(name=serializer_name, fields=','.join(sorted(fields)))
+
+    return {
+        entry_id: 'entries:entry:{generation}:{serializer}:{version}:{entry_id}'.format(
+            generation=generation,
+            serializer=serializer_name,
+            version=version,
+            entry_id=entry_id,
+        )
+        for entry_id in entry_ids
+    }
+
+
+def get_feed_cache_key(feed_name, request, etag):
+    """
+    Build the cache key for a syndication feed served at a given url,
+    for its ETag. Feeds are keyed on their ETag rather than on the entries
+    generation, so they outlive changes that don't affect them.
+    """
+    digest = hashlib.md5(
+        '|'.join([feed_name, request.build_absolute_uri(), etag]).encode('utf-8')
+    ).hexdigest()
+
+    return 'entries:feed:{digest}'.format(digest=digest)
@@ -25,7 +25,7 @@ class EntryAdminForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         if self.instance.pk:
             self.initial['creators'] = self.instance.related_entry_creators.values_list('profile__pk', flat=True)
-            self.initial['bookmark_count'] = self.instance.bookmarked_by.count()
+            self.initial['bookmark_count'] = self.instance.bookmark_count
 
         if not self.current_user.has_perm('entries.change_creators'):
             self.fields['creators'].disabled = True
@@ -0,0 +1,16 @@
+from pulseapi.entries.cache import bump_entries_generation
+from pulseapi.entries.models import Entry
+from pulseapi.jobs.registry import register
+
+
+@register('entries.update_search_vectors')
+def update_search_vectors(entry_ids):
+    Entry.objects.filter(pk__in=entry_ids).update_search_vectors()
+    # Search results are cached along with the other entry lists
+    bump_entries_generation()
+
+
+@register('entries.update_facets')
+def update_facets(entry_ids):
+    Entry.objects.filter(pk__in=entry_ids).update_facets()
+    bump_entries_generation()
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.13 on 2026-10-18 10:47
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_bookmarks(apps, schema_editor):
+    Entry = apps.get_model('entries', 'Entry')
+    UserBookmarks = apps.get_model('profiles', 'UserBookmarks')
+
+    bookmark_counts = UserBookmarks.objects.filter(
+        entry=models.OuterRef('pk')
+    ).order_by().values('entry').annotate(count=models.Count('*')).values('count')
+
+    Entry.objects.update(bookmark_count=Coalesce(models.Subquery(bookmark_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0025_auto_20190509_0029'),
+        ('profiles', '0025_transfer_user_isactive_to_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='bookmark_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_bookmarks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.13 on 2026-10-18 10:56
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def build_search_vectors(apps, schema_editor):
+    Entry = apps.get_model('entries', 'Entry')
+    Tag = apps.get_model('tags', 'Tag')
+
+    tag_names = Tag.objects.filter(
+        entries=models.OuterRef('pk')
+    ).order_by().values('entries').annotate(names=StringAgg('name', delimiter=' ')).values('names')
+
+    Entry.objects.update(search_vector=(
+        SearchVector('title', weight='A', config='english') +
+        SearchVector(
+            models.Subquery(tag_names, output_field=models.TextField()),
+            weight='B',
+            config='english',
+        ) +
+        SearchVector('description', weight='C', config='english') +
+        SearchVector('get_involved', 'interest', weight='D', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0026_entry_bookmark_count'),
+        ('tags', '0004_remove_commas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='entries_ent_search__d5204b_gin'),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 2.2.13 on 2026-10-18 11:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_facets(apps, schema_editor):
+    Entry = apps.get_model('entries', 'Entry')
+    EntryFacet = apps.get_model('entries', 'EntryFacet')
+
+    listed_entries = Entry.objects.filter(
+        moderation_state__name='Approved',
+        published_by__profile__is_active=True,
+    )
+    facets = []
+
+    for entry_id, entry_type, featured in listed_entries.values_list('pk', 'entry_type', 'featured'):
+        facets.append(EntryFacet(entry_id=entry_id, facet='entry_type', value=entry_type))
+
+        if featured:
+            facets.append(EntryFacet(entry_id=entry_id, facet='featured', value='True'))
+
+    for facet, lookup in (('tag', 'tags__name'), ('issue', 'issues__name'), ('help_type', 'help_types__name')):
+        values = listed_entries.filter(**{lookup + '__isnull': False}).values_list('pk', lookup).distinct()
+        facets.extend(
+            EntryFacet(entry_id=entry_id, facet=facet, value=value)
+            for entry_id, value in values
+        )
+
+    EntryFacet.objects.bulk_create(facets, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0027_entry_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntryFacet',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('tag', 'tag'), ('issue', 'issue'), ('help_type', 'help type'), ('entry_type', 'entry type'), ('featured', 'featured')], max_length=20)),
+                ('value', models.CharField(max_length=250)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='entries.Entry')),
+            ],
+        ),
+        # Facet values are matched case-insensitively, and Django 2.2
+        # can't declare expression indexes on models.
+        migrations.RunSQL(
+            'CREATE INDEX entries_entryfacet_facet_value_upper '
+            'ON entries_entryfacet (facet, UPPER(value));',
+            'DROP INDEX entries_entryfacet_facet_value_upper;',
+        ),
+        migrations.RunPython(build_facets, migrations.RunPython.noop),
+    ]
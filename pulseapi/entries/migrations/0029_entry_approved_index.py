@@ -0,0 +1,34 @@
+# Generated by Django 2.2.13 on 2026-10-18 14:05
+
+from django.db import migrations
+
+
+def create_approved_entries_index(apps, schema_editor):
+    ModerationState = apps.get_model('entries', 'ModerationState')
+    # Normally created by 0008_moderationstate_defaults, but the index
+    # must not be silently skipped if it was removed since.
+    approved, _ = ModerationState.objects.get_or_create(name='Approved')
+
+    # Public entry listings filter on the id of the approved moderation
+    # state, which is only known at this point, so the index can't be
+    # declared on the model.
+    schema_editor.execute(
+        'CREATE INDEX entries_entry_approved_id '
+        'ON entries_entry (id, published_by_id) '
+        'WHERE moderation_state_id = %s;' % int(approved.id)
+    )
+
+
+def drop_approved_entries_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS entries_entry_approved_id;')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0028_entry_facets'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_approved_entries_index, drop_approved_entries_index),
+    ]
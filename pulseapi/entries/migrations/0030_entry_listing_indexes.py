@@ -0,0 +1,39 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0029_entry_approved_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['featured', '-created'], name='entries_featured_created'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['moderation_state', '-created', '-id'], name='entries_state_created'),
+        ),
+        # Filtering entries by tag, issue or help type reads the m2m tables
+        # by their target, which Django only indexes on its own. These let
+        # Postgres find the matching entry ids with an index-only scan.
+        migrations.RunSQL(
+            'CREATE INDEX entries_entry_tags_tag_entry '
+            'ON entries_entry_tags (tag_id, entry_id);',
+            'DROP INDEX entries_entry_tags_tag_entry;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX entries_entry_issues_issue_entry '
+            'ON entries_entry_issues (issue_id, entry_id);',
+            'DROP INDEX entries_entry_issues_issue_entry;',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX entries_entry_help_types_helptype_entry '
+            'ON entries_entry_help_types (helptype_id, entry_id);',
+            'DROP INDEX entries_entry_help_types_helptype_entry;',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0030_entry_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
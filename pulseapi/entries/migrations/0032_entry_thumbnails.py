@@ -0,0 +1,19 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:58
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0031_entry_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='thumbnails',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,7 +1,13 @@
 """Main entry data"""
 import os
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.html import format_html
 
@@ -26,20 +32,146 @@ class ModerationState(models.Model):
         return str(self.name)
 
 
+class ModerationStateRegistry:
+    """
+    A map of moderation state names to ids, so that filtering and
+    creating entries by moderation state doesn't need to look up states
+    or join their table. The map is kept in the default cache, which is
+    shared by every worker process when CACHE_URL points at a shared
+    cache, and is loaded on first use and again whenever a name is
+    missing. It is cleared by the signal handlers in signals.py whenever
+    a state is saved or deleted.
+    """
+    cache_key = 'entries:moderation_states'
+
+    # Process-local caches can't be cleared by other workers, so the
+    # changes those workers make are picked up when the map expires.
+    process_local_timeout = 60
+
+    def get_timeout(self):
+        if settings.CACHES['default']['BACKEND'] in settings.PROCESS_LOCAL_CACHE_BACKENDS:
+            return self.process_local_timeout
+
+        return None
+
+    def load(self):
+        ids = dict(ModerationState.objects.values_list('name', 'id'))
+        cache.set(self.cache_key, ids, timeout=self.get_timeout())
+        return ids
+
+    def clear(self):
+        cache.delete(self.cache_key)
+
+    def get_ids(self):
+        ids = cache.get(self.cache_key)
+
+        if ids is None:
+            ids = self.load()
+
+        return ids
+
+    def get_id(self, name):
+        """
+        Return the id of the moderation state with the given name,
+        or None if there is no such state.
+        """
+        ids = self.get_ids()
+
+        if name not in ids:
+            ids = self.load()
+
+        return ids.get(name)
+
+    def get_default_id(self):
+        """
+        Return the id of the first moderation state, or None if there
+        are no moderation states.
+        """
+        ids = self.get_ids()
+
+        if not ids:
+            ids = self.load()
+
+        return min(ids.values(), default=None)
+
+
+moderation_states = ModerationStateRegistry()
+
+
+class ModerationStateId(models.Expression):
+    """
+    The id of a moderation state, looked up by name in the registry
+    when the query is compiled rather than when it is built, so that
+    querysets can be defined before the database is available.
+    """
+    output_field = models.IntegerField()
+
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def as_sql(self, compiler, connection):
+        return '%s', [moderation_states.get_id(self.name)]
+
+
 def get_default_moderation_state():
     """
     Helper function to ensure there is a default
     ModerationState that can be tacked onto Entries.
     """
+    default_state = moderation_states.get_default_id()
 
-    states = ModerationState.objects.all()
-    if len(states) == 0:
+    if default_state is None:
         return -1
 
-    default_state = states[0].id
     return default_state
 
 
+# The text search configuration used for the entries' search_vector
+SEARCH_CONFIG = 'english'
+
+
+# The related data that is needed to serialize entries
+ENTRY_RELATED_LOOKUPS = (
+    'tags',
+    'issues',
+    'help_types',
+    'published_by',
+    'published_by__profile',
+    'moderation_state',
+    'related_entry_creators__profile__related_user',
+)
+
+# The related data that each serialized entry field needs, for
+# responses that only contain some of the entry fields
+ENTRY_FIELD_LOOKUPS = {
+    'tags': ('tags',),
+    'issues': ('issues',),
+    'help_types': ('help_types',),
+    'published_by': ('published_by__profile',),
+    'submitter_profile_id': ('published_by__profile',),
+    'related_creators': ('related_entry_creators__profile__related_user',),
+}
+
+
+def get_entry_related_lookups(fields=None):
+    """
+    Return the prefetch lookups needed to serialize the given entry
+    fields, or all of the entry related data if no fields are given.
+    """
+    if fields is None:
+        return ENTRY_RELATED_LOOKUPS
+
+    lookups = []
+
+    for field in fields:
+        for lookup in ENTRY_FIELD_LOOKUPS.get(field, ()):
+            if lookup not in lookups:
+                lookups.append(lookup)
+
+    return tuple(lookups)
+
+
 class EntryQuerySet(models.query.QuerySet):
     """
     A queryset for entries which returns all entries
@@ -49,31 +181,119 @@ class EntryQuerySet(models.query.QuerySet):
         """
         Return all entries that have been approved
         """
-        return self.filter(moderation_state__name='Approved')
+        return self.filter(moderation_state_id=ModerationStateId('Approved'))
 
-    def with_related(self):
+    def with_related(self, fields=None):
+        """
+        Return all entries with their related data as separate queries.
+        If `fields` is given, only the related data needed to serialize
+        those entry fields is fetched.
+        """
+
+        return self.prefetch_related(*get_entry_related_lookups(fields))
+
+    def touch(self):
+        """
+        Bump the `modified` timestamp of all entries in this queryset, and
+        of the profiles that published or created them, because profile
+        responses include their entries. The modifications are recorded
+        in the change log.
+        """
+        # Import these here to avoid circular imports
+        from pulseapi.changes.models import Change
+        from pulseapi.creators.models import EntryCreator
+        from pulseapi.profiles.models import UserProfile
+
+        # The ids are looked up first, so that both updates can find
+        # their rows by primary key.
+        entries = list(self.values_list('pk', 'published_by__profile'))
+
+        if not entries:
+            return
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        profile_ids = {profile_id for _, profile_id in entries}
+        profile_ids.update(EntryCreator.objects.filter(entry__in=entry_ids).values_list('profile', flat=True))
+        profile_ids.discard(None)
+
+        now = timezone.now()
+        Entry.objects.filter(pk__in=entry_ids).update(modified=now)
+        UserProfile.objects.filter(pk__in=profile_ids).update(modified=now)
+        Change.objects.record(Change.ENTRY, entry_ids, Change.MODIFIED)
+        Change.objects.record(Change.PROFILE, profile_ids, Change.MODIFIED)
+
+    def update_bookmark_counts(self):
         """
-        Return all entries with their related data as separate queries
+        Recompute the bookmark_count for all entries in this queryset
+        with a single UPDATE query
         """
+        # Import UserBookmarks here to avoid circular import
+        from pulseapi.profiles.models import UserBookmarks
 
-        return self.prefetch_related(
-            'tags',
-            'issues',
-            'help_types',
-            'published_by',
-            'bookmarked_by',
-            'bookmarked_by__profile__related_user',
-            'published_by__profile',
-            'moderation_state',
-            'related_entry_creators__profile__related_user',
+        bookmark_counts = UserBookmarks.objects.filter(
+            entry=models.OuterRef('pk')
+        ).order_by().values('entry').annotate(count=models.Count('*')).values('count')
+
+        return self.update(
+            bookmark_count=Coalesce(models.Subquery(bookmark_counts), 0)
         )
 
+    def update_search_vectors(self):
+        """
+        Recompute the search_vector for all entries in this queryset
+        with a single UPDATE query
+        """
+        tag_names = Tag.objects.filter(
+            entries=models.OuterRef('pk')
+        ).order_by().values('entries').annotate(names=StringAgg('name', delimiter=' ')).values('names')
+
+        return self.update(search_vector=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+            SearchVector(
+                models.Subquery(tag_names, output_field=models.TextField()),
+                weight='B',
+                config=SEARCH_CONFIG,
+            ) +
+            SearchVector('description', weight='C', config=SEARCH_CONFIG) +
+            SearchVector('get_involved', 'interest', weight='D', config=SEARCH_CONFIG)
+        ))
+
     def by_active_profile(self):
         """
         Return all entries that have been created by pulse users who's profiles are set to "Active" by moderator.
         """
         return self.filter(published_by__profile__is_active=True)
 
+    def update_facets(self):
+        """
+        Rebuild the EntryFacet rows of all entries in this queryset. Only
+        entries that show up in entry listings get facet rows.
+        """
+        entry_ids = list(self.values_list('pk', flat=True))
+
+        if not entry_ids:
+            return
+
+        listed_entries = Entry.objects.filter(pk__in=entry_ids).public().by_active_profile()
+        facets = []
+
+        for entry_id, entry_type, featured in listed_entries.values_list('pk', 'entry_type', 'featured'):
+            facets.append(EntryFacet(entry_id=entry_id, facet='entry_type', value=entry_type))
+
+            if featured:
+                facets.append(EntryFacet(entry_id=entry_id, facet='featured', value='True'))
+
+        for facet, lookup in EntryFacet.RELATED_FACETS:
+            values = listed_entries.filter(**{lookup + '__isnull': False}).values_list('pk', lookup).distinct()
+            facets.extend(
+                EntryFacet(entry_id=entry_id, facet=facet, value=value)
+                for entry_id, value in values
+            )
+
+        with transaction.atomic():
+            EntryFacet.objects.filter(entry_id__in=entry_ids).delete()
+            EntryFacet.objects.bulk_create(facets, batch_size=1000)
+
 
 class Entry(models.Model):
     """
@@ -115,6 +335,14 @@ class Entry(models.Model):
         blank=True
     )
 
+    # Resized versions of the thumbnail, see pulseapi/utility/thumbnails.py
+    thumbnails = JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+    )
+    thumbnail_widths = (200, 400, 800)
+
     def thumbnail_image_tag(self):
         if not self.thumbnail:
             return format_html('<span>No image to preview</span>')
@@ -163,6 +391,30 @@ class Entry(models.Model):
         default=timezone.now
     )
 
+    # When this entry, or anything that is serialized with it, last changed.
+    # Saving the entry updates it, and the signal handlers in signals.py
+    # touch() the entry when its creators, tags or bookmarks change. It is
+    # the version that the ETags of entry responses are derived from.
+    modified = models.DateTimeField(
+        auto_now=True,
+    )
+
+    # The number of times this entry has been bookmarked. This is kept up
+    # to date by the UserBookmarks signal handlers in signals.py using
+    # atomic UPDATEs, so that we never have to count bookmark rows.
+    bookmark_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    # A weighted full-text search document made up of the title, the tags,
+    # the description and the call to action fields. It is refreshed by the
+    # signal handlers in signals.py, and searched by EntriesListView.
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
     # moderation information
     moderation_state = models.ForeignKey(
         ModerationState,
@@ -178,10 +430,25 @@ class Entry(models.Model):
         self.moderation_state = moderation_state
 
     def is_approved(self):
-        return self.moderation_state.name == 'Approved'
+        return self.moderation_state_id == moderation_states.get_id('Approved')
 
     objects = EntryQuerySet.as_manager()
 
+    # Fields that are only ever changed with UPDATE queries, see save()
+    denormalized_fields = ('bookmark_count', 'search_vector', 'thumbnails')
+
+    def save(self, *args, **kwargs):
+        # Denormalized fields are only ever changed with UPDATE queries, so
+        # when saving an existing entry we leave them out to avoid writing
+        # back stale in-memory values.
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.denormalized_fields
+            ]
+
+        super().save(*args, **kwargs)
+
     def frontend_entry_url(self):
         return '{frontend_url}/entry/{pk}'.format(frontend_url=settings.PULSE_FRONTEND_HOSTNAME, pk=self.id)
 
@@ -191,9 +458,76 @@ class Entry(models.Model):
         """
         verbose_name_plural = "entries"
         ordering = ['-id']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            # The featured feeds, and ?ordering=-created listings of public entries
+            models.Index(fields=['featured', '-created'], name='entries_featured_created'),
+            models.Index(fields=['moderation_state', '-created', '-id'], name='entries_state_created'),
+        ]
         permissions = (
             ('change_creators', 'Can change the creators for entries'),
         )
 
     def __str__(self):
         return str(self.title)
+
+
+class EntryFacetQuerySet(models.query.QuerySet):
+    def filter_entries(self, facet, value, exclude=False):
+        """
+        Only keep the facets of entries that have (or, with `exclude`,
+        don't have) a facet with the given value. Values are matched
+        case-insensitively, and a `value` of None matches any value.
+        """
+        matching_facets = EntryFacet.objects.filter(facet=facet)
+
+        if value is not None:
+            matching_facets = matching_facets.filter(value__iexact=value)
+
+        matching_entries = models.Q(entry_id__in=matching_facets.values('entry_id'))
+
+        return self.exclude(matching_entries) if exclude else self.filter(matching_entries)
+
+    def counts(self):
+        """
+        Return the number of entries for every facet value
+        """
+        return self.order_by().values('facet', 'value').annotate(count=models.Count('entry_id'))
+
+
+class EntryFacet(models.Model):
+    """
+    A materialized (entry, facet, value) row for the tags, issues, help
+    types, entry type and featured flag of every entry that shows up in
+    entry listings, so that facet counts can be aggregated without going
+    through the entries table and its many-to-many tables. Rows are
+    rebuilt by the signal handlers in signals.py whenever an entry, its
+    relations or its publisher's profile changes.
+    """
+    FACETS = (
+        ('tag', 'tag'),
+        ('issue', 'issue'),
+        ('help_type', 'help type'),
+        ('entry_type', 'entry type'),
+        ('featured', 'featured'),
+    )
+
+    # Facets whose values are the names of an entry's related objects
+    RELATED_FACETS = (
+        ('tag', 'tags__name'),
+        ('issue', 'issues__name'),
+        ('help_type', 'help_types__name'),
+    )
+
+    entry = models.ForeignKey(
+        Entry,
+        related_name='facets',
+        on_delete=models.CASCADE,
+    )
+    facet = models.CharField(max_length=20, choices=FACETS)
+    value = models.CharField(max_length=250)
+
+    objects = EntryFacetQuerySet.as_manager()
+
+    def __str__(self):
+        return '{facet}: {value}'.format(facet=self.facet, value=self.value)
@@ -2,6 +2,7 @@ from .base import (
     associate_entry_with_creator_data,
     CreatableSlugRelatedField,
     ModerationStateSerializer,
+    EntryListSerializer,
     EntryBaseSerializer,
     EntryWithV1CreatorsBaseSerializer,
     EntryWithCreatorsBaseSerializer,
@@ -20,6 +21,7 @@ __all__ = [
     'associate_entry_with_creator_data',
     'CreatableSlugRelatedField',
     'ModerationStateSerializer',
+    'EntryListSerializer',
     'EntryBaseSerializer',
     'EntryWithV1CreatorsBaseSerializer',
     'EntryWithCreatorsBaseSerializer',
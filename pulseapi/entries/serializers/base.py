@@ -1,11 +1,15 @@
 """Serialize the models"""
 from rest_framework import serializers
 from django.utils.encoding import smart_text
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+from django.conf import settings
+from django.db import models, transaction
 from django.db.utils import IntegrityError
 
-from pulseapi.entries.models import Entry, ModerationState
+from pulseapi.entries.cache import get_entry_cache_keys
+from pulseapi.entries.models import Entry, ModerationState, get_entry_related_lookups
+from pulseapi.profiles.models import UserBookmarks
 from pulseapi.tags.models import Tag
 from pulseapi.issues.models import Issue
 from pulseapi.helptypes.models import HelpType
@@ -14,6 +18,7 @@ from pulseapi.creators.serializers import (
     RelatedEntryCreatorV1Field,
     RelatedEntryCreatorField,
 )
+from pulseapi.utility.serializer_fields import ThumbnailsField
 
 
 def associate_entry_with_creator_data(entry, creator_data=[], user=None):
@@ -54,9 +59,87 @@ class ModerationStateSerializer(serializers.ModelSerializer):
         exclude = ()
 
 
+class EntryListSerializer(serializers.ListSerializer):
+    """
+    Serializes a list of entries.
+
+    If the `cache_entries` context flag is set, the user-independent
+    representation of each entry is cached per entry and API version
+    (when API responses are cached at all), and related data is only
+    fetched for entries that weren't cached.
+    `is_bookmarked` is then filled in for the requesting user with a
+    single bookmark query for the whole list.
+
+    Only the related data needed by the fields of the entry serializer
+    is fetched, so lists of entries with fewer fields are cheaper. The
+    common entry serializers skip DRF's field machinery altogether and
+    are serialized by the fast path in fast.py.
+    """
+    def to_representation(self, data):
+        if not self.context.get('cache_entries'):
+            return super().to_representation(data)
+
+        entries = list(data.all() if isinstance(data, models.Manager) else data)
+        cache_keys = get_entry_cache_keys(
+            serializer_name=type(self.child).__name__,
+            version=self.context.get('version'),
+            entry_ids=[entry.id for entry in entries],
+            fields=self.context.get('fields'),
+        )
+        serialized_entries = cache.get_many(cache_keys.values()) if settings.CACHE_API_RESPONSES else {}
+        uncached_entries = [entry for entry in entries if cache_keys[entry.id] not in serialized_entries]
+
+        if uncached_entries:
+            # Import the fast path here to avoid circular import
+            from pulseapi.entries.serializers.fast import compile_serializer, serialize_entries
+
+            plan = compile_serializer(self.child)
+
+            if plan is None:
+                models.prefetch_related_objects(uncached_entries, *get_entry_related_lookups(self.child.fields))
+                serialized_uncached_entries = [self.child.to_representation(entry) for entry in uncached_entries]
+            else:
+                serialized_uncached_entries = serialize_entries(uncached_entries, plan)
+
+            uncached_data = {}
+
+            for entry, serialized_entry in zip(uncached_entries, serialized_uncached_entries):
+                if 'is_bookmarked' in serialized_entry:
+                    serialized_entry['is_bookmarked'] = False
+                uncached_data[cache_keys[entry.id]] = serialized_entry
+
+            if settings.CACHE_API_RESPONSES:
+                cache.set_many(uncached_data, settings.API_RESPONSE_CACHE_TIMEOUT)
+            serialized_entries.update(uncached_data)
+
+        bookmarked_ids = set()
+        user = self.context.get('user')
+
+        if entries and user and user.is_authenticated and user.profile_id:
+            bookmarked_ids = set(
+                UserBookmarks.objects.filter(
+                    profile_id=user.profile_id,
+                    entry_id__in=cache_keys.keys(),
+                ).values_list('entry_id', flat=True)
+            )
+
+        representation = []
+
+        for entry in entries:
+            serialized_entry = serialized_entries[cache_keys[entry.id]]
+            if 'is_bookmarked' in serialized_entry:
+                serialized_entry['is_bookmarked'] = entry.id in bookmarked_ids
+            representation.append(serialized_entry)
+
+        return representation
+
+
 class EntryBaseSerializer(serializers.ModelSerializer):
     """
     Serializes an entry with minimal information
+
+    If the `fields` context value is set, only the entry fields
+    listed in it are serialized.
     """
 
     # As an optional-for-some-types-of-entries, this
@@ -65,28 +148,46 @@ class EntryBaseSerializer(serializers.ModelSerializer):
     # types that don't actually need it.
     content_url = serializers.URLField(required=True)
 
+    thumbnails = ThumbnailsField()
+
     is_bookmarked = serializers.SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     def get_is_bookmarked(self, instance):
         """
         Check whether the current user has bookmarked this
         Entry. Anonymous users always see False
         """
+        if self.context.get('cache_entries'):
+            # EntryListSerializer fills this in for the entire list at once
+            return False
+
         user = self.context.get('user')
 
-        if user and user.is_authenticated:
-            # instance.bookmarked_by.all() is already prefetched and cached in the QuerySet
-            return any(bookmark_by.profile.user == user for bookmark_by in instance.bookmarked_by.all())
+        if user and user.is_authenticated and user.profile_id:
+            if 'bookmarked_by' in getattr(instance, '_prefetched_objects_cache', {}):
+                return any(bookmark_by.profile_id == user.profile_id for bookmark_by in instance.bookmarked_by.all())
+
+            return instance.bookmarked_by.filter(profile_id=user.profile_id).exists()
 
         return False
 
     class Meta:
         model = Entry
+        list_serializer_class = EntryListSerializer
         read_only_fields = fields = (
             'id',
             'title',
             'content_url',
             'thumbnail',
+            'thumbnails',
             'is_bookmarked',
         )
 
@@ -158,21 +259,18 @@ class EntrySerializer(EntryBaseSerializer):
         read_only=True,
     )
 
-    bookmark_count = serializers.SerializerMethodField()
-
-    def get_bookmark_count(self, instance):
-        """
-        Get the total number of bookmarks this entry received
-        """
-        return instance.bookmarked_by.count()
+    bookmark_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         """
         Meta class. Because
         """
         model = Entry
+        list_serializer_class = EntryListSerializer
         exclude = (
             'internal_notes',
+            'search_vector',
+            'modified',
         )
 
 
@@ -0,0 +1,231 @@
+"""
+A read-only fast path for serializing lists of entries.
+
+Going through DRF's field machinery for every field of every entry is
+expensive for large pages, so for the entry serializers listed in
+FAST_SERIALIZER_CLASSES we build the same representation directly: scalar
+fields are read off the entry rows that were already loaded, and related
+data (tags, issues, help types, publishers and creators) is loaded with one
+`values_list()` query per relation instead of prefetching model instances.
+
+The output has to stay identical to what the DRF serializers produce, which
+is checked by the golden tests in pulseapi/entries/tests/test_fast_serializer.py.
+"""
+from collections import OrderedDict, defaultdict
+
+from rest_framework import serializers
+
+from pulseapi.creators.models import EntryCreator
+from pulseapi.creators.serializers import RelatedEntryCreatorV1Field
+from pulseapi.entries.serializers.base import (
+    EntryBaseSerializer,
+    EntryWithCreatorsBaseSerializer,
+    EntryWithV1CreatorsBaseSerializer,
+    EntrySerializerWithCreators,
+    EntrySerializerWithV1Creators,
+)
+from pulseapi.helptypes.models import HelpType
+from pulseapi.issues.models import Issue
+from pulseapi.tags.models import Tag
+from pulseapi.users.models import EmailUser
+from pulseapi.utility.thumbnails import get_thumbnail_urls
+
+# Only serializers whose fields are all known here can use the fast path.
+# Subclasses are deliberately not included, since they can change fields.
+FAST_SERIALIZER_CLASSES = (
+    EntryBaseSerializer,
+    EntryWithCreatorsBaseSerializer,
+    EntryWithV1CreatorsBaseSerializer,
+    EntrySerializerWithCreators,
+    EntrySerializerWithV1Creators,
+)
+
+DATETIME_FIELD = serializers.DateTimeField()
+
+# Entry fields that are serialized as is
+SCALAR_FIELDS = (
+    'id',
+    'entry_type',
+    'title',
+    'content_url',
+    'description',
+    'get_involved',
+    'get_involved_url',
+    'interest',
+    'featured',
+    'published_by_creator',
+    'bookmark_count',
+)
+
+
+def get_profile_name(custom_name, user_name):
+    # The same fallback as UserProfile.name
+    if not custom_name or not custom_name.strip():
+        return user_name
+
+    return custom_name
+
+
+def load_related_names(model, entry_ids):
+    """
+    Return a dictionary of {entry id: [names]} for a tag-like model,
+    in the same order as prefetching the relation would.
+    """
+    names = defaultdict(list)
+
+    for entry_id, name in model.objects.filter(entries__in=entry_ids).values_list('entries', 'name'):
+        names[entry_id].append(name)
+
+    return names
+
+
+def load_publishers(entries):
+    """
+    Return a dictionary of {user id: (profile id, profile name)} for
+    the users that published the entries
+    """
+    users = EmailUser.objects.filter(
+        id__in={entry.published_by_id for entry in entries},
+    ).values_list('id', 'name', 'profile_id', 'profile__custom_name')
+
+    return {
+        user_id: (profile_id, get_profile_name(custom_name, name)) if profile_id else None
+        for user_id, name, profile_id, custom_name in users
+    }
+
+
+def load_creators(entry_ids):
+    """
+    Return a dictionary of {entry id: [(profile id, name, is active)]}
+    with the creators of every entry, in order
+    """
+    creators = defaultdict(list)
+    entry_creators = EntryCreator.objects.filter(entry_id__in=entry_ids).values_list(
+        'entry_id',
+        'profile_id',
+        'profile__custom_name',
+        'profile__related_user__name',
+        'profile__is_active',
+    )
+
+    for entry_id, profile_id, custom_name, user_name, is_active in entry_creators:
+        creators[entry_id].append((profile_id, get_profile_name(custom_name, user_name), is_active))
+
+    return creators
+
+
+RELATION_LOADERS = {
+    'tags': lambda entries, entry_ids: load_related_names(Tag, entry_ids),
+    'issues': lambda entries, entry_ids: load_related_names(Issue, entry_ids),
+    'help_types': lambda entries, entry_ids: load_related_names(HelpType, entry_ids),
+    'publishers': lambda entries, entry_ids: load_publishers(entries),
+    'creators': lambda entries, entry_ids: load_creators(entry_ids),
+}
+
+
+def get_scalar(name):
+    return None, lambda entry, related: getattr(entry, name)
+
+
+def get_names(relation):
+    return relation, lambda entry, related: related[relation].get(entry.id, [])
+
+
+def get_thumbnail(entry, related):
+    thumbnail = entry.thumbnail
+    return thumbnail.url if thumbnail else None
+
+
+def get_thumbnails(entry, related):
+    return get_thumbnail_urls(entry.thumbnail, entry.thumbnails)
+
+
+def get_created(entry, related):
+    created = entry.created
+    return None if created is None else DATETIME_FIELD.to_representation(created)
+
+
+def get_publisher_value(index):
+    def get_value(entry, related):
+        publisher = related['publishers'].get(entry.published_by_id)
+        return None if publisher is None else publisher[index]
+
+    return 'publishers', get_value
+
+
+def get_creators(entry, related):
+    return [
+        {'name': name, 'profile_id': profile_id, 'is_active': is_active}
+        for profile_id, name, is_active in related['creators'].get(entry.id, [])
+    ]
+
+
+def get_v1_creators(entry, related):
+    return [
+        {'name': name, 'profile_id': profile_id, 'is_active': is_active, 'creator_id': profile_id}
+        for profile_id, name, is_active in related['creators'].get(entry.id, [])
+    ]
+
+
+FIELD_GETTERS = dict(
+    {name: get_scalar(name) for name in SCALAR_FIELDS},
+    thumbnail=(None, get_thumbnail),
+    thumbnails=(None, get_thumbnails),
+    created=(None, get_created),
+    moderation_state=get_scalar('moderation_state_id'),
+    # Filled in by EntryListSerializer for the requesting user
+    is_bookmarked=(None, lambda entry, related: False),
+    tags=get_names('tags'),
+    issues=get_names('issues'),
+    help_types=get_names('help_types'),
+    published_by=get_publisher_value(1),
+    submitter_profile_id=get_publisher_value(0),
+)
+
+compiled_serializers = {}
+
+
+def compile_serializer(serializer):
+    """
+    Return a list of (field name, relation, getter) tuples that build the
+    representation of an entry for the given serializer instance, or None
+    if the serializer can't use the fast path.
+    """
+    if type(serializer) not in FAST_SERIALIZER_CLASSES:
+        return None
+
+    fields = serializer.fields
+    key = (type(serializer), tuple(fields))
+
+    if key not in compiled_serializers:
+        plan = []
+
+        for name, field in fields.items():
+            if name == 'related_creators':
+                is_v1 = isinstance(field.child_relation, RelatedEntryCreatorV1Field)
+                plan.append((name, 'creators', get_v1_creators if is_v1 else get_creators))
+            elif name in FIELD_GETTERS:
+                plan.append((name,) + FIELD_GETTERS[name])
+            else:
+                plan = None
+                break
+
+        compiled_serializers[key] = plan
+
+    return compiled_serializers[key]
+
+
+def serialize_entries(entries, plan):
+    """
+    Serialize a list of entries with a plan from `compile_serializer`
+    """
+    entry_ids = [entry.id for entry in entries]
+    related = {
+        relation: RELATION_LOADERS[relation](entries, entry_ids)
+        for relation in {relation for name, relation, getter in plan if relation}
+    }
+
+    return [
+        OrderedDict((name, getter(entry, related)) for name, relation, getter in plan)
+        for entry in entries
+    ]
@@ -5,10 +5,12 @@ from .base import EntrySerializerWithCreators
 class SessionEntrySerializer(EntrySerializerWithCreators):
 
     content_url = serializers.URLField(required=False)
+    thumbnails = None
 
     class Meta(EntrySerializerWithCreators.Meta):
         exclude = EntrySerializerWithCreators.Meta.exclude + (
             'thumbnail',
+            'thumbnails',
             'get_involved',
             'get_involved_url',
         )
@@ -0,0 +1,262 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from pulseapi.creators.models import EntryCreator
+from pulseapi.jobs.registry import enqueue
+from pulseapi.profiles.models import UserBookmarks, UserProfile
+from pulseapi.profiles.models.bookmarks import touch_bookmarks
+from pulseapi.tags.models import Tag
+from pulseapi.users.models import EmailUser
+from pulseapi.utility.thumbnails import schedule_thumbnail_update
+from .cache import bump_entries_generation
+from .models import Entry, ModerationState, moderation_states
+
+# Every model whose data ends up in serialized entries, or that
+# determines which entries show up in entry listings at all.
+ENTRY_DEPENDENCIES = (
+    Entry,
+    EntryCreator,
+    UserBookmarks,
+    Tag,
+    ModerationState,
+    UserProfile,
+    EmailUser,
+)
+
+
+def invalidate_entries_cache(sender, **kwargs):
+    # Logging in updates a user's last_login, which has no
+    # bearing on entries, so we don't throw the cache away for it.
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+
+    bump_entries_generation()
+
+
+for model in ENTRY_DEPENDENCIES:
+    post_save.connect(
+        invalidate_entries_cache,
+        sender=model,
+        dispatch_uid=f'invalidate_entries_cache_on_save_{model.__name__}',
+    )
+    post_delete.connect(
+        invalidate_entries_cache,
+        sender=model,
+        dispatch_uid=f'invalidate_entries_cache_on_delete_{model.__name__}',
+    )
+
+for field_name in ('tags', 'issues', 'help_types'):
+    m2m_changed.connect(
+        invalidate_entries_cache,
+        sender=getattr(Entry, field_name).through,
+        dispatch_uid=f'invalidate_entries_cache_on_{field_name}_change',
+    )
+
+
+@receiver(post_save, sender=UserBookmarks)
+def increment_bookmark_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Entry.objects.filter(pk=instance.entry_id).update(bookmark_count=F('bookmark_count') + 1)
+
+
+@receiver(post_delete, sender=UserBookmarks)
+def decrement_bookmark_count(sender, instance, **kwargs):
+    Entry.objects.filter(pk=instance.entry_id, bookmark_count__gt=0).update(bookmark_count=F('bookmark_count') - 1)
+
+
+def schedule_entry_updates(entries, search_vectors=False):
+    """
+    Queue jobs to rebuild the facets, and if `search_vectors` is set
+    the search vectors, of the entries in a queryset. Both only feed
+    the facets and search routes, so they can lag behind a little.
+    """
+    entry_ids = list(entries.values_list('pk', flat=True))
+
+    if not entry_ids:
+        return
+
+    if search_vectors:
+        enqueue('entries.update_search_vectors', entry_ids=entry_ids)
+
+    enqueue('entries.update_facets', entry_ids=entry_ids)
+
+
+@receiver(post_save, sender=Entry)
+def update_entry_search_vector_and_facets(sender, instance, raw=False, **kwargs):
+    if not raw:
+        enqueue('entries.update_search_vectors', entry_ids=[instance.pk])
+        enqueue('entries.update_facets', entry_ids=[instance.pk])
+
+
+def get_m2m_changed_entries(instance, action, reverse, pk_set):
+    """
+    Return the entries whose relations were changed by an m2m_changed
+    signal, or None if the relations haven't been changed yet.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            return Entry.objects.filter(pk=instance.pk)
+        return None
+
+    # When the change is made from the related object's side, `pk_set` holds
+    # entry ids, except when clearing, in which case we have to look them up
+    # beforehand.
+    if action == 'pre_clear':
+        instance._cleared_entry_ids = list(instance.entries.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        return Entry.objects.filter(pk__in=instance._cleared_entry_ids)
+    elif action in ('post_add', 'post_remove'):
+        return Entry.objects.filter(pk__in=pk_set)
+
+    return None
+
+
+def update_entries_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    entries = get_m2m_changed_entries(instance, action, reverse, pk_set)
+
+    if entries is None:
+        return
+
+    schedule_entry_updates(entries, search_vectors=sender is Entry.tags.through)
+    entries.touch()
+
+
+def update_entries_on_related_save(sender, instance, created, raw=False, **kwargs):
+    # New tags, issues and help types don't belong to any entries yet
+    if created or raw:
+        return
+
+    entries = instance.entries.all()
+
+    schedule_entry_updates(entries, search_vectors=sender is Tag)
+    entries.touch()
+
+
+def remember_related_entries(sender, instance, **kwargs):
+    instance._related_entry_ids = list(instance.entries.values_list('pk', flat=True))
+
+
+def update_entries_on_related_delete(sender, instance, **kwargs):
+    entries = Entry.objects.filter(pk__in=instance._related_entry_ids)
+
+    schedule_entry_updates(entries, search_vectors=sender is Tag)
+    entries.touch()
+
+
+for field_name in ('tags', 'issues', 'help_types'):
+    related_model = Entry._meta.get_field(field_name).related_model
+
+    m2m_changed.connect(
+        update_entries_on_m2m_change,
+        sender=getattr(Entry, field_name).through,
+        dispatch_uid=f'update_entries_on_{field_name}_change',
+    )
+    post_save.connect(
+        update_entries_on_related_save,
+        sender=related_model,
+        dispatch_uid=f'update_entries_on_{related_model.__name__}_save',
+    )
+    pre_delete.connect(
+        remember_related_entries,
+        sender=related_model,
+        dispatch_uid=f'remember_related_entries_on_{related_model.__name__}_delete',
+    )
+    post_delete.connect(
+        update_entries_on_related_delete,
+        sender=related_model,
+        dispatch_uid=f'update_entries_on_{related_model.__name__}_delete',
+    )
+
+
+@receiver(post_save, sender=UserProfile)
+def update_facets_on_profile_save(sender, instance, created, raw=False, **kwargs):
+    # Whether a profile is active decides whether its entries are listed
+    if not created and not raw:
+        schedule_entry_updates(Entry.objects.filter(published_by__profile=instance))
+
+
+@receiver(post_save, sender=EmailUser)
+def update_facets_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or (update_fields and set(update_fields) == {'last_login'}):
+        return
+
+    schedule_entry_updates(Entry.objects.filter(published_by=instance))
+
+
+def get_profile_entries(profile_id):
+    """
+    Return the entries that a profile published or created
+    """
+    entry_ids = set(Entry.objects.filter(published_by__profile=profile_id).values_list('pk', flat=True))
+    entry_ids.update(EntryCreator.objects.filter(profile=profile_id).values_list('entry', flat=True))
+
+    return Entry.objects.filter(pk__in=entry_ids)
+
+
+@receiver(post_save, sender=Entry)
+@receiver(pre_delete, sender=Entry)
+def touch_entry(sender, instance, raw=False, **kwargs):
+    # Saving an entry updates its own modified timestamp, but
+    # the profiles that it is listed under have to be touched too.
+    if not raw:
+        Entry.objects.filter(pk=instance.pk).touch()
+
+
+@receiver(post_save, sender=EntryCreator)
+@receiver(post_delete, sender=EntryCreator)
+def touch_creator(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Entry.objects.filter(pk=instance.entry_id).touch()
+        UserProfile.objects.filter(pk=instance.profile_id).touch()
+
+
+@receiver(post_save, sender=UserBookmarks)
+@receiver(post_delete, sender=UserBookmarks)
+def touch_bookmark(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_bookmarks(instance.profile_id, Entry.objects.filter(pk=instance.entry_id))
+
+
+@receiver(post_save, sender=UserProfile)
+def touch_profile_entries(sender, instance, created, raw=False, **kwargs):
+    # Entries include the names of the profiles that published or created them
+    if not created and not raw:
+        get_profile_entries(instance.pk).touch()
+
+
+@receiver(post_save, sender=EmailUser)
+def touch_user_profile(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if created or raw or not instance.profile_id or (update_fields and set(update_fields) == {'last_login'}):
+        return
+
+    # Profiles fall back to the name of their user
+    UserProfile.objects.filter(pk=instance.profile_id).touch()
+    get_profile_entries(instance.profile_id).touch()
+
+
+@receiver(m2m_changed, sender=UserProfile.issues.through)
+def touch_profiles_on_issues_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            UserProfile.objects.filter(pk=instance.pk).touch()
+    elif action in ('post_add', 'post_remove'):
+        UserProfile.objects.filter(pk__in=pk_set).touch()
+    elif action == 'pre_clear':
+        instance.userprofile_set.touch()
+
+
+@receiver(post_save, sender=Entry)
+@receiver(post_save, sender=UserProfile)
+def update_thumbnails_on_save(sender, instance, raw=False, **kwargs):
+    thumbnails = instance.thumbnails or {}
+
+    if not raw and (instance.thumbnail.name or '') != thumbnails.get('source', ''):
+        schedule_thumbnail_update(instance)
+
+
+@receiver(post_save, sender=ModerationState)
+@receiver(post_delete, sender=ModerationState)
+def clear_moderation_state_registry(sender, **kwargs):
+    moderation_states.clear()
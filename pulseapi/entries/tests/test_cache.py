@@ -0,0 +1,127 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pulseapi.entries.models import Entry
+from pulseapi.profiles.models import UserBookmarks
+from pulseapi.tags.models import Tag
+from pulseapi.tests import PulseMemberTestCase
+
+
+@override_settings(CACHE_API_RESPONSES=True)
+class TestEntryListCache(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.logout()
+
+    def get_entry_list(self, url=None):
+        response = self.client.get(url or reverse('entries-list'))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(str(response.content, 'utf-8'))
+
+    def test_anonymous_list_is_served_from_cache(self):
+        """
+        Make sure repeated anonymous list requests don't hit the database
+        """
+        first = self.get_entry_list()
+
+        with self.assertNumQueries(0):
+            second = self.get_entry_list()
+
+        self.assertEqual(first, second)
+
+    def test_query_params_are_normalized(self):
+        """
+        Make sure the order of query parameters doesn't affect caching
+        """
+        self.get_entry_list('{url}?page=1&page_size=1'.format(url=reverse('entries-list')))
+
+        with self.assertNumQueries(0):
+            self.get_entry_list('{url}?page_size=1&page=1'.format(url=reverse('entries-list')))
+
+    def test_cache_invalidated_on_entry_change(self):
+        """
+        Make sure changing an entry invalidates cached listings
+        """
+        entry = self.entries[0]
+        self.get_entry_list()
+
+        entry.title = 'a brand new title'
+        entry.save()
+
+        titles = [result['title'] for result in self.get_entry_list()['results']]
+        self.assertIn('a brand new title', titles)
+
+    def test_cache_invalidated_on_tag_change(self):
+        """
+        Make sure adding tags to an entry invalidates cached listings
+        """
+        entry = Entry.objects.get(id=self.entries[0].id)
+        self.get_entry_list()
+
+        tag, _ = Tag.objects.get_or_create(name='test_cache_tag')
+        entry.tags.add(tag)
+
+        results = self.get_entry_list()['results']
+        tags = next(result['tags'] for result in results if result['id'] == entry.id)
+        self.assertIn('test_cache_tag', tags)
+
+    def test_authenticated_list_is_not_cached(self):
+        """
+        Make sure responses with per-user data are not served from the cache
+        """
+        self.get_entry_list()
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_entry_list()
+
+        self.assertGreater(len(context.captured_queries), 0)
+
+    def test_is_bookmarked_is_overlaid_per_user(self):
+        """
+        Make sure cached entries still report bookmarks for the requesting user
+        """
+        bookmarked_entry = self.entries[0]
+        UserBookmarks.objects.create(entry=bookmarked_entry, profile=self.user.profile)
+
+        # warm up the entry cache anonymously
+        self.get_entry_list()
+        self.client.force_login(self.user)
+
+        for result in self.get_entry_list()['results']:
+            self.assertEqual(result['is_bookmarked'], result['id'] == bookmarked_entry.id)
+
+    def test_cached_entries_are_shared_between_users(self):
+        """
+        Make sure authenticated users reuse cached entries instead of
+        fetching their related data again
+        """
+        self.get_entry_list()
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_entry_list()
+
+        queried_tables = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('"tags_tag"', queried_tables)
+        self.assertNotIn('"creators_entrycreator"', queried_tables)
+
+    @override_settings(CACHE_API_RESPONSES=False)
+    def test_responses_are_not_cached_without_shared_cache(self):
+        """
+        Make sure responses aren't cached when the cache isn't shared by every
+        worker process, as other processes would never learn of changes
+        """
+        self.get_entry_list()
+
+        # Changes made by another process only reach this one through the database
+        Entry.objects.filter(pk=self.entries[0].pk).update(title='a brand new title')
+
+        titles = [result['title'] for result in self.get_entry_list()['results']]
+        self.assertIn('a brand new title', titles)
@@ -0,0 +1,124 @@
+import json
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from pulseapi.entries.models import Entry, EntryFacet, ModerationState
+from pulseapi.helptypes.models import HelpType
+from pulseapi.issues.models import Issue
+from pulseapi.jobs.worker import run_pending_jobs
+from pulseapi.tags.models import Tag
+from pulseapi.tests import PulseMemberTestCase
+
+
+class TestEntryFacets(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.tag = Tag.objects.create(name='test_facet_tag')
+        self.issue = Issue.objects.get(name='Decentralization')
+        self.help_type, _ = HelpType.objects.get_or_create(name='Facet helpers')
+
+        first, second = self.entries
+        first.tags.add(self.tag)
+        first.issues.add(self.issue)
+        second.tags.add(self.tag)
+        second.help_types.add(self.help_type)
+
+    def get_facets(self, query=''):
+        # Facets are rebuilt by background jobs
+        run_pending_jobs()
+        response = self.client.get('{url}{query}'.format(url=reverse('entries-facets'), query=query))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(str(response.content, 'utf-8'))
+
+    def get_count(self, facets, key, name):
+        return next((facet['count'] for facet in facets[key] if facet['name'] == name), 0)
+
+    def test_facets_match_entry_listings(self):
+        """
+        Make sure facet counts are the number of listed entries
+        """
+        facets = self.get_facets()
+
+        self.assertEqual(facets['count'], Entry.objects.public().by_active_profile().count())
+        self.assertEqual(self.get_count(facets, 'tags', self.tag.name), 2)
+        self.assertEqual(self.get_count(facets, 'issues', self.issue.name), 1)
+        self.assertEqual(self.get_count(facets, 'help_types', self.help_type.name), 1)
+        self.assertEqual(self.get_count(facets, 'entry_types', 'base'), facets['count'])
+
+    def test_facets_are_filtered(self):
+        """
+        Make sure facets only count the entries that match the filters
+        """
+        facets = self.get_facets('?issue={}'.format(self.issue.name.upper()))
+        self.assertEqual(facets['count'], 1)
+        self.assertEqual(self.get_count(facets, 'tags', self.tag.name), 1)
+        self.assertEqual(self.get_count(facets, 'help_types', self.help_type.name), 0)
+
+        facets = self.get_facets('?tag={tag}&has_help_types=False'.format(tag=self.tag.name))
+        self.assertEqual(facets['count'], 1)
+        self.assertEqual(self.get_count(facets, 'issues', self.issue.name), 1)
+
+    def test_facets_use_entry_list_filters(self):
+        """
+        Make sure facets are filtered by the other query parameters of entry listings
+        """
+        first, second = self.entries
+
+        facets = self.get_facets('?ids={}'.format(first.id))
+        self.assertEqual(facets['count'], 1)
+        self.assertEqual(self.get_count(facets, 'tags', self.tag.name), 1)
+        self.assertEqual(self.get_count(facets, 'issues', self.issue.name), 1)
+
+        second.title = 'Facetious tagging'
+        second.save()
+        query = '?search=facetious&tag={tag}'.format(tag=self.tag.name)
+        facets = self.get_facets(query)
+        entries = json.loads(str(self.client.get('{url}{query}'.format(
+            url=reverse('entries-list'),
+            query=query,
+        )).content, 'utf-8'))
+        self.assertEqual(facets['count'], entries['count'])
+        self.assertEqual(self.get_count(facets, 'help_types', self.help_type.name), 1)
+
+    def test_facets_follow_entry_changes(self):
+        """
+        Make sure facets are updated when entries or their relations change
+        """
+        first, second = self.entries
+
+        second.tags.remove(self.tag)
+        self.assertEqual(self.get_count(self.get_facets(), 'tags', self.tag.name), 1)
+
+        first.moderation_state = ModerationState.objects.get(name='Pending')
+        first.save()
+        self.assertEqual(self.get_count(self.get_facets(), 'tags', self.tag.name), 0)
+
+        self.tag.entries.add(first, second)
+        first.moderation_state = ModerationState.objects.get(name='Approved')
+        first.featured = True
+        first.save()
+        facets = self.get_facets()
+        self.assertEqual(self.get_count(facets, 'tags', self.tag.name), 2)
+        self.assertEqual(facets['featured'], 1)
+
+        self.tag.name = 'renamed_facet_tag'
+        self.tag.save()
+        self.assertEqual(self.get_count(self.get_facets(), 'tags', 'renamed_facet_tag'), 2)
+
+        self.tag.delete()
+        run_pending_jobs()
+        self.assertFalse(EntryFacet.objects.filter(facet='tag', value='renamed_facet_tag').exists())
+
+    def test_facets_exclude_inactive_profiles(self):
+        """
+        Make sure entries published by inactive profiles aren't counted
+        """
+        first, second = self.entries
+        profile = first.published_by.profile
+        profile.is_active = False
+        profile.save()
+
+        expected_count = Entry.objects.public().by_active_profile().count()
+        self.assertEqual(self.get_facets()['count'], expected_count)
@@ -0,0 +1,136 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from pulseapi.creators.models import EntryCreator
+from pulseapi.entries.factory import EntryFactory
+from pulseapi.entries.models import Entry
+from pulseapi.entries.serializers import (
+    EntrySerializerWithCreators,
+    EntrySerializerWithV1Creators,
+    ProjectEntrySerializer,
+)
+from pulseapi.entries.serializers.fast import compile_serializer
+from pulseapi.helptypes.models import HelpType
+from pulseapi.issues.models import Issue
+from pulseapi.profiles.factory import BasicUserProfileFactory
+from pulseapi.settings import API_VERSION_LIST
+from pulseapi.tags.models import Tag
+from pulseapi.tests import PulseMemberTestCase
+
+
+class TestFastEntrySerializer(PulseMemberTestCase):
+    """
+    Golden output tests: the fast path has to produce exactly
+    the same responses as the DRF entry serializers
+    """
+    def setUp(self):
+        super().setUp()
+        help_type, _ = HelpType.objects.get_or_create(name='Fast helpers')
+        tags = [Tag.objects.create(name='fast_{}'.format(name)) for name in ('b', 'a', 'c')]
+        issues = list(Issue.objects.all()[:3])
+
+        for i in range(4):
+            entry = EntryFactory(published_by_creator=(i % 2 == 0), get_involved='Help out')
+            entry.tags.add(*tags[i:])
+            entry.issues.add(*issues[:i])
+            entry.help_types.add(help_type)
+
+        # Orphan profiles with and without a name
+        entry = self.entries[0]
+        EntryCreator.objects.create(entry=entry, profile=BasicUserProfileFactory(custom_name='   '))
+        EntryCreator.objects.create(entry=entry, profile=BasicUserProfileFactory(use_custom_name=True))
+
+        entry.thumbnail.name = 'images/entries/fast.png'
+        entry.thumbnails = {
+            'source': 'images/entries/fast.png',
+            'sizes': [{
+                'width': 200,
+                'height': 100,
+                'jpeg': 'images/entries/thumbnails/fast-200w.jpg',
+                'webp': 'images/entries/thumbnails/fast-200w.webp',
+            }],
+        }
+        entry.save()
+
+        self.bookmark_url = reverse('bookmark', kwargs={'entryid': entry.id})
+        self.client.put(self.bookmark_url)
+
+    def get_responses(self, url):
+        """
+        Return the response content for a url with the fast path
+        and with the DRF serializers
+        """
+        cache.clear()
+        fast_response = self.client.get(url)
+        cache.clear()
+
+        with mock.patch('pulseapi.entries.serializers.fast.compile_serializer', return_value=None):
+            drf_response = self.client.get(url)
+
+        self.assertEqual(fast_response.status_code, 200)
+        self.assertEqual(drf_response.status_code, 200)
+        return fast_response.content, drf_response.content
+
+    def assert_same_responses(self, url):
+        fast_content, drf_content = self.get_responses(url)
+        self.assertEqual(fast_content, drf_content)
+
+    def test_fast_path_is_used(self):
+        """
+        Make sure the fast path is used for the common entry serializers only
+        """
+        self.assertIsNotNone(compile_serializer(EntrySerializerWithCreators()))
+        self.assertIsNotNone(compile_serializer(EntrySerializerWithV1Creators(context={'fields': ['id', 'tags']})))
+        self.assertIsNone(compile_serializer(ProjectEntrySerializer()))
+
+    def test_entry_lists(self):
+        """
+        Make sure entry lists are identical in every API version
+        """
+        for _, version in API_VERSION_LIST:
+            url = '/api/pulse/{version}/entries/?format=json&page_size=50'.format(version=version)
+
+            with self.subTest(version=version):
+                self.assert_same_responses(url)
+                self.assert_same_responses(url + '&view=compact')
+                self.assert_same_responses(url + '&fields=id,tags,published_by,related_creators,created')
+
+    def test_anonymous_entry_lists(self):
+        """
+        Make sure anonymous entry lists are identical
+        """
+        self.client.logout()
+
+        for _, version in API_VERSION_LIST:
+            with self.subTest(version=version):
+                self.assert_same_responses(
+                    '/api/pulse/{version}/entries/?format=json&page_size=50'.format(version=version)
+                )
+
+    def test_profile_entries(self):
+        """
+        Make sure the entries of profiles are identical
+        """
+        profile = self.entries[0].related_entry_creators.last().profile
+        profile.is_active = True
+        profile.save()
+
+        for _, version in API_VERSION_LIST:
+            url = '/api/pulse/{version}/profiles/{pk}/entries/?format=json&created&published&favorited'.format(
+                version=version,
+                pk=profile.id,
+            )
+
+            with self.subTest(version=version):
+                self.assert_same_responses(url)
+
+    def test_entries_without_related_data(self):
+        """
+        Make sure entries without any related data are identical
+        """
+        Entry.objects.all().delete()
+        EntryFactory()
+
+        self.assert_same_responses('/api/pulse/entries/?format=json')
@@ -0,0 +1,78 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pulseapi.tests import PulseMemberTestCase
+
+
+class TestEntryListFields(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_entries(self, query):
+        response = self.client.get('{url}?{query}'.format(url=reverse('entries-list'), query=query))
+        self.assertEqual(response.status_code, 200)
+        return json.loads(str(response.content, 'utf-8'))['results']
+
+    def count_queries(self, query):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('{url}?{query}'.format(url=reverse('entries-list'), query=query))
+        return len(context.captured_queries)
+
+    def test_compact_view(self):
+        """
+        Make sure the compact view only includes what entry grids show
+        """
+        entries = self.get_entries('view=compact')
+
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertSetEqual(
+                set(entry),
+                {'id', 'title', 'content_url', 'thumbnail', 'thumbnails', 'is_bookmarked', 'related_creators'},
+            )
+
+    def test_requested_fields(self):
+        """
+        Make sure only the requested fields are included
+        """
+        entries = self.get_entries('fields=id,title,tags')
+
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertSetEqual(set(entry), {'id', 'title', 'tags'})
+
+    def test_fields_do_not_share_cached_entries(self):
+        """
+        Make sure cached entries with some of the fields aren't
+        served to requests for other fields
+        """
+        self.get_entries('fields=id')
+        entries = self.get_entries('fields=id,title')
+
+        for entry in entries:
+            self.assertIn('title', entry)
+
+        self.assertIn('tags', self.get_entries('')[0])
+
+    def test_unknown_fields(self):
+        """
+        Make sure unknown fields and views are rejected
+        """
+        url = reverse('entries-list')
+
+        self.assertEqual(self.client.get('{}?fields=id,password'.format(url)).status_code, 400)
+        self.assertEqual(self.client.get('{}?view=huge'.format(url)).status_code, 400)
+        self.assertEqual(self.client.get('{}?view=compact&fields=tags'.format(url)).status_code, 400)
+
+    def test_fewer_fields_run_fewer_queries(self):
+        """
+        Make sure only the related data of the requested fields is fetched
+        """
+        self.assertLess(self.count_queries('view=compact'), self.count_queries(''))
+        self.assertLess(self.count_queries('fields=id,title'), self.count_queries('view=compact'))
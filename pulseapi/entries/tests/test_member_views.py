@@ -1,8 +1,11 @@
 import json
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from pulseapi.entries.models import Entry, ModerationState
 from pulseapi.creators.models import EntryCreator
+from pulseapi.jobs.worker import run_pending_jobs
 from pulseapi.tags.models import Tag
 from pulseapi.tests import PulseMemberTestCase
 from pulseapi.users.factory import BasicEmailUserFactory
@@ -130,6 +133,9 @@ class TestEntryAPIJSONView(PulseMemberTestCase):
         dual_entry.tags.add(libraries)
         dual_entry.save()
 
+        # Search vectors are updated by background jobs
+        run_pending_jobs()
+
     def test_single_tag_search(self):
         response = self.client.get('/api/pulse/entries/?search=curricculum&format=json')
         self.assertEqual(response.status_code, 200)
@@ -150,6 +156,68 @@ class TestEntryAPIJSONView(PulseMemberTestCase):
         count = response_data['count']
         self.assertEqual(count, 1)
 
+    def test_search_matches_prefixes(self):
+        response = self.client.get('/api/pulse/entries/?search=librar&format=json')
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(str(response.content, 'utf-8'))
+        self.assertEqual(response_data['count'], 2)
+
+    def test_search_matches_stop_word_prefixes(self):
+        """
+        Make sure search terms that are stop words still match as prefixes
+        """
+        entry = Entry.objects.create(
+            title='Canadian theories', description='an overview', entry_type='news', published_by=self.user)
+        entry.set_moderation_state('Approved')
+        entry.save()
+        run_pending_jobs()
+
+        for term in ('can', 'the', 'over', 'the can over'):
+            response = self.client.get(f'/api/pulse/entries/?search={term}&format=json')
+            self.assertEqual(response.status_code, 200)
+            response_data = json.loads(str(response.content, 'utf-8'))
+            ids = [result['id'] for result in response_data['results']]
+            self.assertIn(entry.id, ids, term)
+
+    def test_search_is_ranked(self):
+        """
+        Make sure entries matching a search term in their title rank above
+        entries that only match it in their description
+        """
+        description_entry = Entry.objects.create(
+            title='first entry', description='all about mozilla', entry_type='news', published_by=self.user)
+        description_entry.set_moderation_state('Approved')
+        description_entry.save()
+
+        title_entry = Entry.objects.create(
+            title='mozilla entry', description='second entry', entry_type='news', published_by=self.user)
+        title_entry.set_moderation_state('Approved')
+        title_entry.save()
+        run_pending_jobs()
+
+        response = self.client.get('/api/pulse/entries/?search=mozilla&format=json')
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(str(response.content, 'utf-8'))
+        ids = [entry['id'] for entry in response_data['results']]
+        self.assertListEqual(ids, [title_entry.id, description_entry.id])
+
+    def test_search_follows_tag_changes(self):
+        tag = Tag.objects.get(name='libraries')
+        tag.name = 'bibliotheques'
+        tag.save()
+        run_pending_jobs()
+
+        response = self.client.get('/api/pulse/entries/?search=bibliotheques&format=json')
+        response_data = json.loads(str(response.content, 'utf-8'))
+        self.assertEqual(response_data['count'], 2)
+
+        Entry.objects.get(title='lib_entry').tags.clear()
+        run_pending_jobs()
+
+        response = self.client.get('/api/pulse/entries/?search=bibliotheques&format=json')
+        response_data = json.loads(str(response.content, 'utf-8'))
+        self.assertEqual(response_data['count'], 1)
+
     def test_inactive_profile_entry_is_hidden(self):
         """
         Creating two entries of the same name, to test that the
@@ -166,6 +234,7 @@ class TestEntryAPIJSONView(PulseMemberTestCase):
             title=entry_name, entry_type='news', published_by=inactive_profile_user)
         inactive_profile_entry.set_moderation_state('Approved')
         inactive_profile_entry.save()
+        run_pending_jobs()
 
         response = self.client.get(f'/api/pulse/entries/?search={test_entry}&format=json')
         self.assertEqual(response.status_code, 200)
@@ -174,3 +243,58 @@ class TestEntryAPIJSONView(PulseMemberTestCase):
         returned_entry = response_data['results'][0]
         self.assertEqual(count, 1)
         self.assertNotEqual(inactive_profile_entry.id, returned_entry['id'])
+
+    def test_bulk_bookmarks(self):
+        """
+        Make sure entries can be bookmarked and unbookmarked in bulk,
+        and that the resulting bookmarks are returned
+        """
+        first, second = self.entries
+        url = reverse('bulk-bookmarks')
+
+        payload = self.generatePostPayload(data={'ids': [first.id, second.id, first.id, 999999]})
+        response = self.client.post(url, payload)
+        self.assertEqual(response.status_code, 200)
+        bookmarks = json.loads(str(response.content, 'utf-8'))['bookmarks']
+        self.assertCountEqual(bookmarks, [first.id, second.id])
+
+        # bookmarking again doesn't create duplicates
+        payload = self.generatePostPayload(data={'ids': [first.id]})
+        response = self.client.post(url, payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(first.bookmarked_by.count(), 1)
+        first.refresh_from_db()
+        self.assertEqual(first.bookmark_count, 1)
+
+        payload = self.generatePostPayload(data={'ids': [first.id]})
+        response = self.client.delete(url, payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(str(response.content, 'utf-8'))['bookmarks'], [second.id])
+        first.refresh_from_db()
+        self.assertEqual(first.bookmark_count, 0)
+
+    def test_bulk_bookmarks_query_count(self):
+        """
+        Make sure bulk bookmarking doesn't run queries per entry
+        """
+        url = reverse('bulk-bookmarks')
+
+        def bookmark(entries):
+            payload = self.generatePostPayload(data={'ids': [entry.id for entry in entries]})
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(url, payload)
+            self.assertEqual(response.status_code, 200)
+            return len(context.captured_queries)
+
+        query_count = bookmark(self.entries[:1])
+        more_entries = [Entry.objects.create(title='bulk', published_by=self.user) for i in range(3)]
+
+        self.assertEqual(bookmark(more_entries), query_count)
+
+    def test_bulk_bookmarks_invalid_ids(self):
+        """
+        Make sure bulk bookmarking rejects ids that aren't integers
+        """
+        payload = self.generatePostPayload(data={'ids': ['one']})
+        response = self.client.post(reverse('bulk-bookmarks'), payload)
+        self.assertEqual(response.status_code, 400)
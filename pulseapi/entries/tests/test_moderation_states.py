@@ -0,0 +1,75 @@
+from django.test import TestCase
+
+from pulseapi.entries.models import Entry, ModerationState, ModerationStateRegistry, moderation_states
+from pulseapi.entries.factory import EntryFactory
+from pulseapi.users.factory import BasicEmailUserFactory
+
+
+class TestModerationStateRegistry(TestCase):
+    def setUp(self):
+        moderation_states.clear()
+        self.approved = ModerationState.objects.get(name='Approved')
+
+    def test_names_are_resolved_once(self):
+        """
+        Make sure moderation states are only loaded once
+        """
+        with self.assertNumQueries(1):
+            self.assertEqual(moderation_states.get_id('Approved'), self.approved.id)
+            self.assertEqual(moderation_states.get_id('Approved'), self.approved.id)
+            Entry(moderation_state_id=self.approved.id).is_approved()
+
+        self.assertIsNone(moderation_states.get_id('Not a state'))
+
+    def test_registry_follows_changes(self):
+        """
+        Make sure new, renamed and deleted moderation states are picked up
+        """
+        moderation_states.get_id('Approved')
+
+        state = ModerationState.objects.create(name='Archived')
+        self.assertEqual(moderation_states.get_id('Archived'), state.id)
+
+        state.name = 'Hidden'
+        state.save()
+        self.assertIsNone(moderation_states.get_id('Archived'))
+        self.assertEqual(moderation_states.get_id('Hidden'), state.id)
+
+        state.delete()
+        self.assertIsNone(moderation_states.get_id('Hidden'))
+
+    def test_registry_is_shared(self):
+        """
+        Make sure changes are picked up by the registries of other worker processes
+        """
+        other_worker_states = ModerationStateRegistry()
+        state = ModerationState.objects.create(name='Archived')
+        self.assertEqual(other_worker_states.get_id('Archived'), state.id)
+
+        state.name = 'Hidden'
+        state.save()
+        self.assertIsNone(other_worker_states.get_id('Archived'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(other_worker_states.get_id('Hidden'), state.id)
+
+    def test_public_entries(self):
+        """
+        Make sure public entries are filtered without joining moderation states
+        """
+        user = BasicEmailUserFactory()
+        entry = EntryFactory(published_by=user)
+        pending = EntryFactory(published_by=user, moderation_state=ModerationState.objects.get(name='Pending'))
+        queryset = Entry.objects.public()
+
+        self.assertNotIn(ModerationState._meta.db_table, str(queryset.query))
+        self.assertIn(entry, queryset)
+        self.assertNotIn(pending, queryset)
+        self.assertTrue(entry.is_approved())
+        self.assertFalse(pending.is_approved())
+
+    def test_default_moderation_state(self):
+        """
+        Make sure new entries get the first moderation state by default
+        """
+        self.assertEqual(Entry().moderation_state_id, ModerationState.objects.order_by('id').first().id)
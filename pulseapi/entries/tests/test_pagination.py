@@ -0,0 +1,81 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pulseapi.entries.models import Entry
+from pulseapi.profiles.models import UserBookmarks
+from pulseapi.tests import PulseMemberTestCase
+
+
+class TestEntryCursorPagination(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def get_all_pages(self, url):
+        ids = []
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = json.loads(str(response.content, 'utf-8'))
+            self.assertNotIn('count', page)
+            ids.extend(entry['id'] for entry in page['results'])
+            url = page['next']
+
+        return ids
+
+    def test_cursor_pagination_walks_all_entries(self):
+        """
+        Make sure following `next` links visits every entry once, newest first
+        """
+        expected_ids = list(
+            Entry.objects.public().by_active_profile().order_by('-id').values_list('id', flat=True)
+        )
+
+        ids = self.get_all_pages('{url}?cursor=&page_size=1'.format(url=reverse('entries-list')))
+
+        self.assertListEqual(ids, expected_ids)
+
+    def test_cursor_pagination_by_created(self):
+        """
+        Make sure cursor pagination can be ordered by creation date
+        """
+        expected_ids = list(
+            Entry.objects.public().by_active_profile().order_by('-created', '-id').values_list('id', flat=True)
+        )
+
+        ids = self.get_all_pages('{url}?cursor=&page_size=1&ordering=-created'.format(url=reverse('entries-list')))
+
+        self.assertListEqual(ids, expected_ids)
+
+    def test_cursor_pagination_does_not_count(self):
+        """
+        Make sure cursor paginated listings don't run a COUNT query
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('{url}?cursor='.format(url=reverse('entries-list')))
+
+        for query in context.captured_queries:
+            self.assertNotIn('COUNT(', query['sql'].upper())
+
+    def test_bookmarks_cursor_pagination(self):
+        """
+        Make sure bookmarks are cursor paginated in the order they were bookmarked
+        """
+        profile = self.user.profile
+        first, second = self.entries
+        now = timezone.now()
+        # `timestamp` is auto_now, so we set it after the fact
+        for entry, bookmarked_at in ((first, now), (second, now - timedelta(days=1))):
+            UserBookmarks.objects.create(entry=entry, profile=profile)
+            UserBookmarks.objects.filter(entry=entry, profile=profile).update(timestamp=bookmarked_at)
+
+        ids = self.get_all_pages('{url}?cursor=&page_size=1'.format(url=reverse('user-bookmarks')))
+
+        self.assertListEqual(ids, [first.id, second.id])
@@ -2,7 +2,6 @@ import json
 from math import ceil
 from django.urls import reverse
 from django.conf import settings
-from django.test.client import MULTIPART_CONTENT
 from django.http.request import HttpRequest
 from rest_framework import status
 from rest_framework.request import Request
@@ -11,6 +10,7 @@ from pulseapi.creators.models import EntryCreator
 from pulseapi.profiles.models import UserProfile
 from pulseapi.entries.models import Entry, ModerationState
 from pulseapi.helptypes.factory import HelpTypeFactory
+from pulseapi.jobs.worker import run_pending_jobs
 from pulseapi.entries.serializers import (
     EntrySerializerWithV1Creators,
     EntrySerializerWithCreators,
@@ -50,9 +50,9 @@ def run_test_entry_creators(test_case, api_version=None, creator_id_key='creator
 class TestEntryView(PulseStaffTestCase):
     def test_force_json(self):
         """
-        We should only allow JSON content-types in this view and reject others
+        We should only allow JSON (and multipart thumbnail uploads) in this view and reject others
         """
-        response = self.client.post('/api/pulse/entries/', content_type=MULTIPART_CONTENT)
+        response = self.client.post('/api/pulse/entries/', content_type='application/x-www-form-urlencoded')
         self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
 
     def test_get_single_entry_data(self):
@@ -363,6 +363,8 @@ class TestEntryView(PulseStaffTestCase):
             '/api/pulse/entries/',
             data=self.generatePostPayload(data=payload)
         )
+        # Search vectors are updated by background jobs
+        run_pending_jobs()
         searchList = self.client.get('/api/pulse/entries/?search=setup')
         entriesJson = json.loads(str(searchList.content, 'utf-8'))
         self.assertEqual(len(entriesJson['results']), 1)
@@ -511,19 +513,31 @@ class TestEntryView(PulseStaffTestCase):
         put_url = '/api/pulse/entries/' + str(id) + '/bookmark'
 
         postresponse = self.client.put(put_url)
-        self.assertEqual(postresponse.status_code, 204)
+        self.assertEqual(postresponse.status_code, 200)
+        self.assertEqual(
+            json.loads(str(postresponse.content, 'utf-8')),
+            {'is_bookmarked': True, 'bookmark_count': 1},
+        )
 
         # verify bookmark count is now one
         bookmarks = entry.bookmarked_by.count()
         self.assertEqual(bookmarks, 1)
+        entry.refresh_from_db()
+        self.assertEqual(entry.bookmark_count, 1)
 
         # put again, which should clear the bookmark flag for this user
         postresponse = self.client.put(put_url)
-        self.assertEqual(postresponse.status_code, 204)
+        self.assertEqual(postresponse.status_code, 200)
+        self.assertEqual(
+            json.loads(str(postresponse.content, 'utf-8')),
+            {'is_bookmarked': False, 'bookmark_count': 0},
+        )
 
         # verify bookmark count is now zero
         bookmarks = entry.bookmarked_by.count()
         self.assertEqual(bookmarks, 0)
+        entry.refresh_from_db()
+        self.assertEqual(entry.bookmark_count, 0)
 
     def test_bookmarked_entries_view(self):
         """
@@ -619,6 +633,12 @@ class TestEntryView(PulseStaffTestCase):
         bookmarks2 = entry2.bookmarked_by.count()
         self.assertEqual(bookmarks2, 1)
 
+        # verify the denormalized counts were kept in sync
+        entry1.refresh_from_db()
+        entry2.refresh_from_db()
+        self.assertEqual(entry1.bookmark_count, 1)
+        self.assertEqual(entry2.bookmark_count, 1)
+
     def test_post_bookmark_entries_with_invalid_param(self):
         """
         Verify that bookmarking a list of entries with invalid ids
@@ -6,8 +6,10 @@ from pulseapi.entries.views import (
     toggle_featured,
     EntryView,
     BookmarkedEntries,
+    BulkBookmarksView,
     ModerationStateView,
     EntriesListView,
+    EntryFacetsView,
     ProjectEntriesListView,
     NewsEntriesListView,
     CurriculumEntriesListView,
@@ -21,6 +23,11 @@ urlpatterns = [
         EntriesListView.as_view(),
         name='entries-list'
     ),
+    url(
+        '^facets/$',
+        EntryFacetsView.as_view(),
+        name='entries-facets'
+    ),
     url(
         'curriculum/',
         CurriculumEntriesListView.as_view(),
@@ -46,6 +53,11 @@ urlpatterns = [
         SessionEntriesListView.as_view(),
         name='session-entries'
     ),
+    url(
+        '^bookmarks/bulk/$',
+        BulkBookmarksView.as_view(),
+        name='bulk-bookmarks'
+    ),
     url(
         'bookmarks/',
         BookmarkedEntries.as_view(),
@@ -4,12 +4,14 @@ Views to get entries
 
 import base64
 import operator
+import re
 import django_filters
 from functools import reduce
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db import models
 from django.db.models import Q
 
@@ -19,26 +21,30 @@ from django_filters.rest_framework import (
 )
 
 from rest_framework import status
-from rest_framework.compat import distinct
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import (
     OrderingFilter,
     SearchFilter
 )
 from rest_framework.generics import (
+    GenericAPIView,
     ListCreateAPIView,
     RetrieveAPIView,
     ListAPIView,
     get_object_or_404
 )
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
-from rest_framework.parsers import JSONParser
+from rest_framework.views import APIView
 
-from pulseapi.entries.models import Entry, ModerationState
+from pulseapi.entries.cache import get_entries_cache_key
+from pulseapi.entries.models import Entry, EntryFacet, ModerationState, SEARCH_CONFIG, moderation_states
 from pulseapi.entries.serializers import (
     EntrySerializerWithV1Creators,
     EntrySerializerWithCreators,
+    EntryWithV1CreatorsBaseSerializer,
+    EntryWithCreatorsBaseSerializer,
     ModerationStateSerializer,
 )
 from .serializers import (
@@ -51,6 +57,9 @@ from .serializers import (
 
 from pulseapi.profiles.models import UserBookmarks
 
+from pulseapi.utility.conditional import ConditionalRetrieveMixin
+from pulseapi.utility.renderers import get_json_parser_class
+from pulseapi.utility.uploads import ThumbnailUploadParser
 from pulseapi.utility.userpermissions import is_staff_address
 
 
@@ -65,20 +74,13 @@ def toggle_bookmark(request, entryid, **kwargs):
     user = request.user
 
     if user.is_authenticated:
-        profile = user.profile
+        entry = get_object_or_404(Entry.objects.only('id'), id=entryid)
+        bookmarked, bookmark_count = UserBookmarks.objects.toggle_bookmark(user.profile, entry.id)
 
-        entry = get_object_or_404(Entry, id=entryid)
-
-        # find out if there is already a {user,entry,(timestamp)} triple
-        bookmarks = entry.bookmarked_by.filter(profile=profile)
-
-        # if there is a bookmark, remove it. Otherwise, make one.
-        if bookmarks:
-            bookmarks.delete()
-        else:
-            UserBookmarks.objects.create(entry=entry, profile=profile)
-
-        return Response("Toggled bookmark.", status=status.HTTP_204_NO_CONTENT)
+        return Response({
+            'is_bookmarked': bookmarked,
+            'bookmark_count': bookmark_count,
+        })
     return Response("Anonymous bookmarks cannot be saved.", status=status.HTTP_403_FORBIDDEN)
 
 
@@ -165,12 +167,151 @@ def post_validate(request):
 class EntriesPagination(PageNumberPagination):
     """
     Add support for pagination and custom page size
+
+    Requests that pass the `?cursor=` query parameter (even empty, to get
+    the first page) are paginated with `EntriesCursorPagination` instead.
     """
     # page size decided in https://github.com/mozilla/network-pulse-api/issues/39
     page_size = 48
     page_size_query_param = 'page_size'
     max_page_size = 1000
 
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if EntriesCursorPagination.cursor_query_param in request.query_params:
+            self.cursor_paginator = EntriesCursorPagination()
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view=view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+
+        return super().to_html()
+
+
+class EntriesCursorPagination(CursorPagination):
+    """
+    Keyset pagination for infinite-scroll clients: pages are fetched by
+    filtering on the last seen position rather than with an OFFSET, and
+    no total count is computed, so deep pages are as cheap as the first.
+
+    Only orderings on indexed, (nearly) unique fields are supported. A view
+    can declare its own `cursor_orderings`, and clients pick one with the
+    `?ordering=` query parameter. The first one is the default.
+    """
+    page_size = EntriesPagination.page_size
+    page_size_query_param = EntriesPagination.page_size_query_param
+    max_page_size = EntriesPagination.max_page_size
+    cursor_orderings = ('-id', '-created')
+
+    def get_ordering(self, request, queryset, view):
+        cursor_orderings = getattr(view, 'cursor_orderings', self.cursor_orderings)
+        ordering = request.query_params.get('ordering')
+
+        if ordering not in cursor_orderings:
+            ordering = cursor_orderings[0]
+
+        # Break ties on the primary key so that the ordering is stable
+        if ordering != '-id':
+            return (ordering, '-id')
+
+        return (ordering,)
+
+
+class CachedEntryListMixin:
+    """
+    Serve anonymous list requests from the response cache.
+
+    Responses for authenticated users contain per-user data (such
+    as `is_bookmarked`), so those are always built from scratch.
+    """
+    def get_list_cache_key(self, request):
+        if not settings.CACHE_API_RESPONSES or request.user.is_authenticated:
+            return None
+
+        return get_entries_cache_key('list', request, type(self).__name__)
+
+    def list(self, request, *args, **kwargs):
+        cache_key = self.get_list_cache_key(request)
+
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+
+        data = cache.get(cache_key)
+
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data, settings.API_RESPONSE_CACHE_TIMEOUT)
+
+        return response
+
+
+class EntryListFieldsMixin:
+    """
+    Pick the entry serializer for list requests, and the fields it
+    includes, from the `?view=` and `?fields=` query parameters.
+    """
+    def get_serializer_class(self):
+        request = self.request
+        is_v1 = request and request.version == settings.API_VERSIONS['version_1']
+
+        if request and request.method == 'GET':
+            view = request.query_params.get('view', None)
+
+            if view == 'compact':
+                return EntryWithV1CreatorsBaseSerializer if is_v1 else EntryWithCreatorsBaseSerializer
+
+            if view:
+                raise ValidationError({'view': 'Unknown view "{}", the only view is "compact"'.format(view)})
+
+        if is_v1:
+            return EntrySerializerWithV1Creators
+
+        return EntrySerializerWithCreators
+
+    def get_requested_fields(self):
+        """
+        Return the entry fields requested with `?fields=`, or None
+        if every field of the serializer should be included.
+        """
+        fields = self.request.query_params.get('fields', None)
+
+        if self.request.method != 'GET' or not fields:
+            return None
+
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown_fields = set(fields) - set(self.get_serializer_class()().fields)
+
+        if unknown_fields:
+            raise ValidationError({
+                'fields': 'Unknown entry fields: {}'.format(', '.join(sorted(unknown_fields)))
+            })
+
+        return fields
+
+    def get_serializer_context(self):
+        return {
+            'user': self.request.user,
+            'version': self.request.version,
+            'cache_entries': True,
+            'fields': self.get_requested_fields(),
+        }
+
 
 class EntryCustomFilter(FilterSet):
     """
@@ -211,15 +352,42 @@ class EntryCustomFilter(FilterSet):
         fields = ['tags', 'issues', 'featured', ]
 
 
-class EntryView(RetrieveAPIView):
+class EntryFacetFilter(FilterSet):
+    """
+    The filters of EntryCustomFilter that can be applied to entry facets,
+    plus filtering by entry type.
+    """
+    tag = django_filters.CharFilter(method='filter_facet')
+    issue = django_filters.CharFilter(method='filter_facet')
+    help_type = django_filters.CharFilter(method='filter_facet')
+    entry_type = django_filters.CharFilter(method='filter_facet')
+    has_help_types = django_filters.BooleanFilter(method='filter_has_help_types')
+    featured = django_filters.BooleanFilter(method='filter_featured')
+
+    def filter_facet(self, queryset, name, value):
+        return queryset.filter_entries(name, value)
+
+    def filter_has_help_types(self, queryset, name, value):
+        return queryset.filter_entries('help_type', None, exclude=not value)
+
+    def filter_featured(self, queryset, name, value):
+        return queryset.filter_entries('featured', None, exclude=not value)
+
+    class Meta:
+        model = EntryFacet
+        fields = []
+
+
+class EntryView(ConditionalRetrieveMixin, RetrieveAPIView):
     """
-    A view to retrieve individual entries
+    A view to retrieve individual entries. Responses have an ETag,
+    and unchanged entries are answered with a 304.
     """
 
     queryset = Entry.objects.public().with_related()
     pagination_class = None
     parser_classes = (
-        JSONParser,
+        get_json_parser_class(),
     )
 
     def get_serializer_class(self):
@@ -235,11 +403,15 @@ class EntryView(RetrieveAPIView):
             'user': self.request.user
         }
 
+    def get_modified(self):
+        return Entry.objects.public().filter(pk=self.kwargs['pk']).values_list('modified', flat=True).first()
 
-class BookmarkedEntries(ListAPIView):
+
+class BookmarkedEntries(EntryListFieldsMixin, ListAPIView):
     pagination_class = EntriesPagination
+    cursor_orderings = ('-bookmarked_at', '-id', '-created')
     parser_classes = (
-        JSONParser,
+        get_json_parser_class(),
     )
 
     def get_queryset(self):
@@ -249,20 +421,9 @@ class BookmarkedEntries(ListAPIView):
             return Entry.objects.none()
 
         bookmarks = UserBookmarks.objects.filter(profile=user.profile)
-        return Entry.objects.filter(bookmarked_by__in=bookmarks).order_by('-bookmarked_by__timestamp')
-
-    def get_serializer_class(self):
-        request = self.request
-
-        if request and request.version == settings.API_VERSIONS['version_1']:
-            return EntrySerializerWithV1Creators
-
-        return EntrySerializerWithCreators
-
-    def get_serializer_context(self):
-        return {
-            'user': self.request.user
-        }
+        return Entry.objects.filter(bookmarked_by__in=bookmarks).annotate(
+            bookmarked_at=models.F('bookmarked_by__timestamp')
+        ).order_by('-bookmarked_at')
 
     # When people POST to this route, we want to do some
     # custom validation involving CSRF and nonce validation,
@@ -279,24 +440,11 @@ class BookmarkedEntries(ListAPIView):
             user = request.user
             entryids = self.request.query_params.get('ids', None)
 
-            def bookmark_entry(entryid):
-                # find the entry for this id
-                try:
-                    entry = Entry.objects.get(id=entryid)
-                except ObjectDoesNotExist:
-                    return
-
-                # find out if there is already a {user,entry,(timestamp)} triple
-                profile = user.profile
-                bookmarks = entry.bookmarked_by.filter(profile=profile)
-
-                # make a bookmark if there isn't one already
-                if not bookmarks:
-                    UserBookmarks.objects.create(entry=entry, profile=profile)
-
             if entryids is not None and user.is_authenticated:
-                for entryid in entryids.split(','):
-                    bookmark_entry(entryid)
+                UserBookmarks.objects.bookmark_entries(
+                    user.profile,
+                    [int(entryid) for entryid in entryids.split(',') if entryid.strip().isdigit()],
+                )
 
             return Response("Entries bookmarked.", status=status.HTTP_204_NO_CONTENT)
         else:
@@ -306,6 +454,63 @@ class BookmarkedEntries(ListAPIView):
             )
 
 
+class BulkBookmarksView(APIView):
+    """
+    A view to bookmark (POST) or unbookmark (DELETE) a set of entries at
+    once, for the current user. Entry ids are passed as an `ids` list in
+    the payload, along with the csrf token and nonce. Ids of entries that
+    don't exist are ignored.
+
+    Both methods respond with the ids of all the entries that the user has
+    bookmarked, most recently bookmarked first.
+
+    **Route** - `/entries/bookmarks/bulk`
+    """
+    parser_classes = (
+        get_json_parser_class(),
+    )
+
+    def get_entry_ids(self, request):
+        entry_ids = request.data.get('ids', [])
+
+        if isinstance(entry_ids, str):
+            entry_ids = entry_ids.split(',')
+
+        try:
+            return [int(entry_id) for entry_id in entry_ids]
+        except (TypeError, ValueError):
+            raise ValidationError({'ids': 'Entry ids must be a list of integers.'})
+
+    def update_bookmarks(self, request, update):
+        validation_result = post_validate(request)
+
+        if validation_result is not True:
+            return Response(
+                "post validation failed",
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        # invalidate the nonce, so this form cannot be
+        # resubmitted with the current id
+        request.session['nonce'] = False
+
+        profile = request.user.profile
+        update(profile, self.get_entry_ids(request))
+
+        bookmarked_entry_ids = UserBookmarks.objects.filter(profile=profile).order_by(
+            '-timestamp',
+            '-id',
+        ).values_list('entry_id', flat=True)
+
+        return Response({'bookmarks': list(bookmarked_entry_ids)})
+
+    def post(self, request, *args, **kwargs):
+        return self.update_bookmarks(request, UserBookmarks.objects.bookmark_entries)
+
+    def delete(self, request, *args, **kwargs):
+        return self.update_bookmarks(request, UserBookmarks.objects.unbookmark_entries)
+
+
 class ModerationStateView(ListAPIView):
     """
     A view to retrieve all moderation states
@@ -313,113 +518,69 @@ class ModerationStateView(ListAPIView):
     queryset = ModerationState.objects.all()
     serializer_class = ModerationStateSerializer
     parser_classes = (
-        JSONParser,
+        get_json_parser_class(),
     )
 
 
 # see https://stackoverflow.com/questions/60326973
-class SearchWithNormalTagFiltering(SearchFilter):
+class EntrySearchFilter(SearchFilter):
     """
-    This is a custom search filter that allows the same kind of
-    matching that DRF v3.6.3 allowed wrt many to many relations,
-    where multiple terms have to all match, but do _not_ need
-    to match against single m2m relations, so a ?search=a,b
-    will match an entry with two tags a and b, but not with
-    single tag a or tag b.
+    A full-text search filter that runs against the entries' weighted
+    `search_vector` (see `Entry.search_vector`) and orders the results by
+    rank. Every search term has to match, but terms do _not_ need to match
+    against a single tag, so a ?search=a,b will match an entry with two
+    tags a and b, but not with single tag a or tag b. Terms are matched
+    as prefixes, so ?search=clim will match "climate".
+
+    Every word is matched both stemmed and as typed, because the search
+    configuration drops stop words from queries altogether, which would
+    keep ?search=can from matching "canada".
     """
-    def required_m2m_optimization(self, view):
-        return getattr(view, 'use_m2m_optimization', True)
+    def get_search_query(self, search_terms):
+        queries = []
 
-    def get_search_fields(self, view, request):
-        # For DRF versions >=3.9.2 remove this method,
-        # as it already has get_search_fields built in.
-        return getattr(view, 'search_fields', None)
-
-    def chained_queryset_filter(self, queryset, search_terms, orm_lookups):
         for search_term in search_terms:
-            queries = [
-                models.Q(**{orm_lookup: search_term})
-                for orm_lookup in orm_lookups
-            ]
-            queryset = queryset.filter(reduce(operator.or_, queries))
-        return queryset
+            # Only keep the words from a term, so that users can't
+            # inject tsquery operators into the query.
+            for word in re.findall(r'\w+', search_term):
+                prefix = "'{word}':*".format(word=word)
+                queries.append(
+                    SearchQuery(prefix, config=SEARCH_CONFIG, search_type='raw') |
+                    SearchQuery(prefix, config='simple', search_type='raw')
+                )
 
-    def optimized_queryset_filter(self, queryset, search_terms, orm_lookups):
-        conditions = []
-        for search_term in search_terms:
-            queries = [
-                models.Q(**{orm_lookup: search_term})
-                for orm_lookup in orm_lookups
-            ]
-            conditions.append(reduce(operator.or_, queries))
+        if not queries:
+            return None
 
-        return queryset.filter(reduce(operator.and_, conditions))
+        return reduce(operator.and_, queries)
 
     def filter_queryset(self, request, queryset, view):
-        search_fields = self.get_search_fields(view, request)
-        search_terms = self.get_search_terms(request)
+        query = self.get_search_query(self.get_search_terms(request))
 
-        if not search_fields or not search_terms:
+        if query is None:
             return queryset
 
-        orm_lookups = [
-            self.construct_search(str(search_field))
-            for search_field in search_fields
-        ]
-
-        base = queryset
-        if self.required_m2m_optimization(view):
-            queryset = self.optimized_queryset_filter(queryset, search_terms, orm_lookups)
-        else:
-            queryset = self.chained_queryset_filter(queryset, search_terms, orm_lookups)
-
-        if self.must_call_distinct(queryset, search_fields):
-            # Filtering against a many-to-many field requires us to
-            # call queryset.distinct() in order to avoid duplicate items
-            # in the resulting queryset.
-            # We try to avoid this if possible, for performance reasons.
-            queryset = distinct(queryset, base)
-        return queryset
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(models.F('search_vector'), query)
+        ).order_by('-search_rank', '-id')
 
 
-class EntriesListView(ListCreateAPIView):
+class EntryFilterMixin:
     """
-    A view that permits a GET to allow listing all the entries
-    in the database
-
-    **Route** - `/entries`
-
-    #Query Parameters -
-
-    - `?search=` - Search by title, description, get_involved, interest,
-                   creator, and tag.
-    - `?ids=` - Filter only for entries with specific ids. Argument
-                must be a comma-separated list of integer ids.
-    - `?tag=` - Allows filtering entries by a specific tag
-    - `?issue=` - Allows filtering entries by a specific issue
-    - `?help_type=` - Allows filtering entries by a specific help type
-    - `?has_help_types=<True or False>` - Filter entries by whether they have
-                                          help types or not. Note that `True`
-                                          or `False` is case-sensitive.
-    - `?featured=True` (or False) - both capitalied. Boolean is set in admin UI
-    - `?page=` - Page number, defaults to 1
-    - `?page_size=` - Number of results on a page. Defaults to 48
-    - `?ordering=` - Property you'd like to order the results by. Prepend with
-                     `-` to reverse. e.g. `?ordering=-title`
-    - `?moderationstate=` - Filter results to only show the indicated moderation
-                            state, by name. This will only filter if the calling
-                            user has moderation permissions.
+    The entries of a list request, filtered by its query parameters as
+    documented on EntriesListView.
     """
-    pagination_class = EntriesPagination
-
     filter_backends = (
         DjangoFilterBackend,
-        SearchWithNormalTagFiltering,
+        EntrySearchFilter,
         OrderingFilter,
     )
 
     filter_class = EntryCustomFilter
 
+    # The fields that make up Entry.search_vector. EntrySearchFilter doesn't
+    # query these directly, but DRF needs them to render the search control
+    # in the browsable API.
     search_fields = (
         'title',
         'description',
@@ -428,15 +589,6 @@ class EntriesListView(ListCreateAPIView):
         'tags__name',
     )
 
-    # Forces DRF to use pre-3.6.4 matching for many-to-many relations, so that
-    # searching for multiple terms will find only entry that match all terms,
-    # but many-to-many will resolve on the m2m set, not "one relation in the set".
-    use_m2m_optimization = False
-
-    parser_classes = (
-        JSONParser,
-    )
-
     # Custom queryset handling: if the route was called as
     # /entries/?ids=1,2,3,4,... or /entries/?creators=a,b,c...
     # only return entries filtered on those property values.
@@ -461,12 +613,14 @@ class EntriesListView(ListCreateAPIView):
             is_moderator = user.has_perm('entries.change_entry')
 
             if is_superuser is True or is_moderator is True:
-                mvalue = ModerationState.objects.get(name=modstate)
+                mvalue = moderation_states.get_id(modstate)
                 if mvalue is not None:
-                    queryset = Entry.objects.filter(moderation_state=mvalue)
+                    queryset = Entry.objects.filter(moderation_state_id=mvalue)
 
+        # Related data is not prefetched here: the list serializer only
+        # fetches it for entries that it doesn't have cached yet.
         if queryset is False:
-            queryset = Entry.objects.public().with_related().by_active_profile()
+            queryset = Entry.objects.public().by_active_profile()
 
         # If the query was for a set of specific entries,
         # filter the query set further.
@@ -505,18 +659,128 @@ class EntriesListView(ListCreateAPIView):
 
         return queryset
 
-    def get_serializer_class(self):
-        request = self.request
 
-        if request and request.version == settings.API_VERSIONS['version_1']:
-            return EntrySerializerWithV1Creators
+class EntryFacetsView(EntryFilterMixin, GenericAPIView):
+    """
+    A view to get the number of public entries for every tag, issue, help
+    type and entry type, out of the entries that match a set of filters.
+    Counts are aggregated from the EntryFacet table rather than from the
+    entries themselves.
 
-        return EntrySerializerWithCreators
+    **Route** - `/entries/facets`
 
-    def get_serializer_context(self):
-        return {
-            'user': self.request.user
+    #Query Parameters -
+
+    - `?tag=`, `?issue=`, `?help_type=`, `?has_help_types=` and `?featured=`
+      filter entries like they do for `/entries`
+    - `?entry_type=` - Only count entries of a specific entry type
+    - Any other query parameter of `/entries`, such as `?search=` or `?ids=`,
+      filters entries like it does for `/entries`. Only public entries
+      have facets, so `?moderationstate=` doesn't count anything else.
+    """
+    FACET_KEYS = {
+        'tag': 'tags',
+        'issue': 'issues',
+        'help_type': 'help_types',
+        'entry_type': 'entry_types',
+    }
+
+    def get_cache_key(self, request):
+        # Like entry lists, the entries of moderators' requests depend on
+        # their permissions, so only anonymous requests are cached.
+        if not settings.CACHE_API_RESPONSES or request.user.is_authenticated:
+            return None
+
+        return get_entries_cache_key('facets', request, type(self).__name__)
+
+    def get(self, request, **kwargs):
+        cache_key = self.get_cache_key(request)
+        data = cache.get(cache_key) if cache_key is not None else None
+
+        if data is not None:
+            return Response(data)
+
+        filterset = EntryFacetFilter(request.query_params, queryset=EntryFacet.objects.all())
+
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        facets = filterset.qs
+
+        # The facet filters are applied to the facets table directly, but
+        # the other filters of entry lists need the filtered entries.
+        if set(request.query_params) - set(EntryFacetFilter.base_filters):
+            entries = self.filter_queryset(self.get_queryset())
+            facets = facets.filter(entry_id__in=entries.order_by().values('pk'))
+
+        data = {
+            'count': 0,
+            'featured': 0,
         }
+        data.update({key: [] for key in self.FACET_KEYS.values()})
+
+        for facet in facets.counts().order_by('facet', 'value'):
+            if facet['facet'] == 'featured':
+                data['featured'] = facet['count']
+                continue
+
+            # Every listed entry has exactly one entry type
+            if facet['facet'] == 'entry_type':
+                data['count'] += facet['count']
+
+            data[self.FACET_KEYS[facet['facet']]].append({
+                'name': facet['value'],
+                'count': facet['count'],
+            })
+
+        if cache_key is not None:
+            cache.set(cache_key, data, settings.API_RESPONSE_CACHE_TIMEOUT)
+
+        return Response(data)
+
+
+class EntriesListView(EntryListFieldsMixin, CachedEntryListMixin, EntryFilterMixin, ListCreateAPIView):
+    """
+    A view that permits a GET to allow listing all the entries
+    in the database
+
+    **Route** - `/entries`
+
+    #Query Parameters -
+
+    - `?search=` - Search by title, description, get_involved, interest,
+                   creator, and tag.
+    - `?ids=` - Filter only for entries with specific ids. Argument
+                must be a comma-separated list of integer ids.
+    - `?tag=` - Allows filtering entries by a specific tag
+    - `?issue=` - Allows filtering entries by a specific issue
+    - `?help_type=` - Allows filtering entries by a specific help type
+    - `?has_help_types=<True or False>` - Filter entries by whether they have
+                                          help types or not. Note that `True`
+                                          or `False` is case-sensitive.
+    - `?featured=True` (or False) - both capitalied. Boolean is set in admin UI
+    - `?page=` - Page number, defaults to 1
+    - `?page_size=` - Number of results on a page. Defaults to 48
+    - `?cursor=` - Use cursor pagination instead of page numbers. Pass it
+                   empty for the first page, then follow the `next` links.
+                   Responses don't include a `count`, and only
+                   `?ordering=-id` (default) or `?ordering=-created` apply.
+    - `?ordering=` - Property you'd like to order the results by. Prepend with
+                     `-` to reverse. e.g. `?ordering=-title`
+    - `?moderationstate=` - Filter results to only show the indicated moderation
+                            state, by name. This will only filter if the calling
+                            user has moderation permissions.
+    - `?view=compact` - Only include the id, title, content url, thumbnails,
+                        bookmark state and creators of every entry.
+    - `?fields=` - Only include the listed entry fields. Argument must be
+                   a comma-separated list of field names.
+    """
+    pagination_class = EntriesPagination
+
+    parser_classes = (
+        get_json_parser_class(),
+        ThumbnailUploadParser,
+    )
 
     # When people POST to this route, we want to do some
     # custom validation involving CSRF and nonce validation,
@@ -540,12 +804,13 @@ class EntriesListView(ListCreateAPIView):
             we need to check using "if hasattr(request.data,'thumbnail'):"
             as we as "if request.data['thumnail']" and these are pretty
             much mutually exclusive patterns. A try/pass make far more sense.
+            Thumbnails of multipart requests are already uploaded files.
             '''
 
             try:
                 thumbnail = request_data['thumbnail']
                 # do we actually need to repack as ContentFile?
-                if thumbnail['name'] and thumbnail['base64']:
+                if isinstance(thumbnail, dict) and thumbnail['name'] and thumbnail['base64']:
                     name = thumbnail['name']
                     encdata = thumbnail['base64']
                     proxy = ContentFile(base64.b64decode(encdata), name=name)
@@ -575,20 +840,16 @@ class EntriesListView(ListCreateAPIView):
                 # the posting, and set 'featured' to false.
                 #
                 # see https://github.com/mozilla/network-pulse-api/issues/83
-                moderation_state = ModerationState.objects.get(
-                    name='Pending'
-                )
+                moderation_state_id = moderation_states.get_id('Pending')
 
                 if is_staff_address(user.email):
-                    moderation_state = ModerationState.objects.get(
-                        name='Approved'
-                    )
+                    moderation_state_id = moderation_states.get_id('Approved')
 
                 # save the entry
                 saved_entry = serializer.save(
                     published_by=user,
                     featured=False,
-                    moderation_state=moderation_state
+                    moderation_state_id=moderation_state_id
                 )
 
                 return Response({'status': 'submitted', 'id': saved_entry.id})
@@ -0,0 +1,35 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    """
+    Show the queued, running and failed jobs
+    """
+
+    list_display = (
+        'id',
+        'name',
+        'status',
+        'attempts',
+        'available_at',
+        'created',
+    )
+
+    list_filter = (
+        'status',
+        'name',
+    )
+
+    readonly_fields = (
+        'name',
+        'arguments',
+        'attempts',
+        'created',
+        'finished_at',
+        'last_error',
+    )
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    name = 'pulseapi.jobs'
+
+    def ready(self):
+        # Import the jobs.py module of every app, so that
+        # their job functions are registered.
+        autodiscover_modules('jobs')
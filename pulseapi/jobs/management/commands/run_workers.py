@@ -0,0 +1,95 @@
+"""
+Run queued background jobs with a pool of worker threads or processes.
+"""
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from pulseapi.jobs.worker import work
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-c',
+            '--concurrency',
+            action='store',
+            type=int,
+            default=settings.JOBS_CONCURRENCY,
+            dest='concurrency',
+            help='How many jobs to run at the same time. Default: {}'.format(settings.JOBS_CONCURRENCY)
+        )
+
+        parser.add_argument(
+            '--pool',
+            action='store',
+            choices=('thread', 'process'),
+            default='thread',
+            dest='pool',
+            help='Whether to run jobs in threads or in processes. Default: thread'
+        )
+
+        parser.add_argument(
+            '--visibility-timeout',
+            action='store',
+            type=int,
+            default=settings.JOBS_VISIBILITY_TIMEOUT,
+            dest='visibility_timeout',
+            help='How many seconds a worker has to finish a job before it is run again. '
+                 'Default: {}'.format(settings.JOBS_VISIBILITY_TIMEOUT)
+        )
+
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            dest='once',
+            help='Stop once there are no more jobs to run, instead of waiting for new ones'
+        )
+
+    def handle(self, *args, **options):
+        if options['pool'] == 'process':
+            stop_event = multiprocessing.Event()
+            worker_class = multiprocessing.Process
+            # Forked processes can't share the database connection of this one
+            connections.close_all()
+        else:
+            stop_event = threading.Event()
+            worker_class = threading.Thread
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        workers = [
+            worker_class(
+                target=work,
+                name='worker-{}'.format(i),
+                args=(stop_event,),
+                kwargs={
+                    'visibility_timeout': options['visibility_timeout'],
+                    'once': options['once'],
+                },
+            )
+            for i in range(options['concurrency'])
+        ]
+
+        self.stdout.write('Starting {concurrency} {pool} workers'.format(
+            concurrency=options['concurrency'],
+            pool=options['pool'],
+        ))
+
+        for worker in workers:
+            worker.start()
+
+        for worker in workers:
+            worker.join()
+
+        self.stdout.write(self.style.SUCCESS('Done!'))
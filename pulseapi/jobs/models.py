@@ -0,0 +1,100 @@
+"""A queue of background jobs, stored in the database and run by `manage.py run_workers`"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.db import models, transaction
+from django.utils import timezone
+
+
+class JobQuerySet(models.query.QuerySet):
+    """
+    A queryset for jobs with queueing operations
+    """
+
+    def enqueue(self, name, **arguments):
+        """
+        Add a job that calls the job function registered under `name` with
+        the given keyword arguments. The job is part of the current
+        transaction, so it only runs if that transaction is committed.
+        """
+        return self.create(name=name, arguments=arguments, max_attempts=settings.JOBS_MAX_ATTEMPTS)
+
+    def claim(self, visibility_timeout):
+        """
+        Mark the next available job as running and return it, or None if
+        there is none. A claimed job becomes available again once its
+        visibility timeout (in seconds) has passed, in case the worker that
+        claimed it stopped without finishing it. Jobs are claimed one at a
+        time, right before they run, so that the timeout only has to cover
+        a single job. Jobs that are claimed by another worker at the same
+        time are skipped rather than waited for.
+        """
+        now = timezone.now()
+
+        # Jobs that timed out on their last attempt are not retried
+        self.filter(
+            status=Job.RUNNING,
+            available_at__lte=now,
+            attempts__gte=models.F('max_attempts'),
+        ).update(status=Job.FAILED, last_error='Timed out', finished_at=now)
+
+        with transaction.atomic():
+            job = self.filter(
+                status__in=(Job.QUEUED, Job.RUNNING),
+                available_at__lte=now,
+            ).order_by('available_at', 'id').select_for_update(skip_locked=True).first()
+
+            if job is None:
+                return None
+
+            job.status = Job.RUNNING
+            job.attempts += 1
+            job.available_at = now + timedelta(seconds=visibility_timeout)
+            job.save(update_fields=['status', 'attempts', 'available_at'])
+
+        return job
+
+
+class Job(models.Model):
+    """
+    A call to a registered job function. Jobs are deleted once they succeed.
+    Jobs that fail are retried with an increasing delay, and are kept as
+    failed, along with their last error, after `max_attempts` attempts.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'queued'),
+        (RUNNING, 'running'),
+        (FAILED, 'failed'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    arguments = JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # When a queued job can run, or when a running job times out
+    available_at = models.DateTimeField(default=timezone.now)
+    created = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    def __str__(self):
+        return '{name} {status} ({attempts}/{max_attempts})'.format(
+            name=self.name,
+            status=self.status,
+            attempts=self.attempts,
+            max_attempts=self.max_attempts,
+        )
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='jobs_status_available'),
+        ]
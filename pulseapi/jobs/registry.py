@@ -0,0 +1,47 @@
+"""
+The functions that jobs can call.
+
+Apps register their job functions in a `jobs.py` module, which is imported
+when the jobs app is ready:
+
+    @register('thumbnails.update')
+    def update_thumbnails(model, pk):
+        ...
+
+and queue calls to them with `enqueue('thumbnails.update', model=..., pk=...)`.
+Arguments are stored as JSON, so they have to be JSON serializable.
+"""
+job_functions = {}
+
+
+def register(name):
+    """
+    Register the decorated function as the job function called `name`
+    """
+    def decorator(function):
+        if name in job_functions:
+            raise ValueError('A job function called "{name}" is already registered'.format(name=name))
+
+        job_functions[name] = function
+        return function
+
+    return decorator
+
+
+def get_job_function(name):
+    try:
+        return job_functions[name]
+    except KeyError:
+        raise LookupError('No job function called "{name}" is registered'.format(name=name))
+
+
+def enqueue(name, **arguments):
+    """
+    Queue a call to the job function called `name`,
+    as part of the current transaction
+    """
+    # Import Job here, as this module is imported before models are loaded
+    from pulseapi.jobs.models import Job
+
+    get_job_function(name)
+    return Job.objects.enqueue(name, **arguments)
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from pulseapi.entries.factory import EntryFactory
+from pulseapi.jobs.models import Job
+from pulseapi.jobs.registry import enqueue, job_functions
+from pulseapi.jobs.worker import run_job, run_pending_jobs
+from pulseapi.profiles.factory import BasicUserProfileFactory
+from pulseapi.users.factory import BasicEmailUserFactory
+
+
+def fail(**kwargs):
+    raise ValueError('Something went wrong')
+
+
+@override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_DELAY=10)
+class TestJobs(TestCase):
+    def setUp(self):
+        self.calls = []
+        functions = mock.patch.dict(job_functions, {
+            'tests.record': lambda **kwargs: self.calls.append(kwargs),
+            'tests.fail': fail,
+        })
+        functions.start()
+        self.addCleanup(functions.stop)
+        Job.objects.all().delete()
+
+    def make_available(self, job):
+        Job.objects.filter(pk=job.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+
+    def test_successful_job(self):
+        """
+        Make sure jobs are called with their arguments and deleted once they succeed
+        """
+        enqueue('tests.record', entry_ids=[1, 2])
+
+        self.assertEqual(run_pending_jobs(), 1)
+        self.assertEqual(self.calls, [{'entry_ids': [1, 2]}])
+        self.assertFalse(Job.objects.exists())
+
+    def test_unknown_job(self):
+        """
+        Make sure only registered job functions can be queued
+        """
+        with self.assertRaises(LookupError):
+            enqueue('tests.unknown')
+
+    def test_failed_job(self):
+        """
+        Make sure failed jobs are retried after a delay, until they run out of attempts
+        """
+        job = enqueue('tests.fail')
+        before = timezone.now()
+        run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('Something went wrong', job.last_error)
+        self.assertGreaterEqual(job.available_at, before + timedelta(seconds=10))
+
+        # Not available to run again yet
+        self.assertEqual(run_pending_jobs(), 0)
+
+        self.make_available(job)
+        run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_visibility_timeout(self):
+        """
+        Make sure claimed jobs are only claimed again once they timed out
+        """
+        job = enqueue('tests.record')
+
+        self.assertEqual(Job.objects.claim(visibility_timeout=60), job)
+        self.assertIsNone(Job.objects.claim(visibility_timeout=60))
+
+        self.make_available(job)
+        claimed = Job.objects.claim(visibility_timeout=60)
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.attempts, 2)
+
+        # Timing out on the last attempt fails the job
+        self.make_available(job)
+        self.assertIsNone(Job.objects.claim(visibility_timeout=60))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.last_error, 'Timed out')
+
+    def test_claim_one_job(self):
+        """
+        Make sure jobs are claimed one at a time, oldest first
+        """
+        first = enqueue('tests.record')
+        second = enqueue('tests.record')
+
+        self.assertEqual(Job.objects.claim(visibility_timeout=60), first)
+
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.QUEUED)
+        self.assertEqual(Job.objects.claim(visibility_timeout=60), second)
+
+    def test_outdated_claim(self):
+        """
+        Make sure a job that timed out and was claimed again is left to its last claim
+        """
+        enqueue('tests.fail')
+        job = Job.objects.claim(visibility_timeout=60)
+
+        self.make_available(job)
+        Job.objects.claim(visibility_timeout=60)
+
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertEqual(job.attempts, 2)
+
+
+class TestQueuedSideEffects(TestCase):
+    def test_entry_and_profile_jobs(self):
+        """
+        Make sure saving entries and profiles queues their thumbnail resizing,
+        and the rebuilding of entry facets and search vectors
+        """
+        entry = EntryFactory(published_by=BasicEmailUserFactory())
+        profile = BasicUserProfileFactory()
+        Job.objects.all().delete()
+
+        entry.thumbnail.name = 'images/entries/new.png'
+        entry.save()
+        profile.save()
+
+        # Factories set thumbnails without resizing them
+        self.assertEqual(list(Job.objects.order_by('name', 'id').values_list('name', 'arguments')), [
+            ('entries.update_facets', {'entry_ids': [entry.id]}),
+            ('entries.update_search_vectors', {'entry_ids': [entry.id]}),
+            ('thumbnails.update', {'model': 'entries.Entry', 'pk': entry.id}),
+            ('thumbnails.update', {'model': 'profiles.UserProfile', 'pk': profile.id}),
+        ])
+
+        with override_settings(GENERATE_THUMBNAILS=False):
+            entry.thumbnail.name = 'images/entries/other.png'
+            entry.save()
+
+        self.assertEqual(Job.objects.filter(name='thumbnails.update').count(), 2)
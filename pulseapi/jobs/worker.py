@@ -0,0 +1,104 @@
+"""
+Running queued jobs.
+
+Every worker claims an available job and runs it, one job at a time, and
+waits for `poll_interval` seconds when there is nothing to run. Job functions
+run in autocommit mode, like views do, so those that make several changes
+that belong together should use their own transaction. `manage.py
+run_workers` runs several workers in a pool of threads or processes.
+"""
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from pulseapi.jobs.models import Job
+from pulseapi.jobs.registry import get_job_function
+
+logger = logging.getLogger(__name__)
+
+
+def get_retry_delay(attempts):
+    """
+    Return how long to wait before retrying a job that failed `attempts`
+    times: the retry delay, doubled for every attempt after the first.
+    """
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run_job(job):
+    """
+    Run a claimed job, and delete it if it succeeds. Failed jobs are queued
+    again or marked as failed. A job that took longer than its visibility
+    timeout may have been claimed again by then, in which case its outcome
+    is left to the worker that claimed it last.
+    """
+    claimed = Job.objects.filter(pk=job.pk, status=Job.RUNNING, attempts=job.attempts)
+
+    try:
+        get_job_function(job.name)(**job.arguments)
+    except Exception:
+        logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.name, job.attempts)
+        now = timezone.now()
+
+        if job.attempts >= job.max_attempts:
+            claimed.update(status=Job.FAILED, finished_at=now, last_error=traceback.format_exc())
+        else:
+            claimed.update(
+                status=Job.QUEUED,
+                available_at=now + get_retry_delay(job.attempts),
+                last_error=traceback.format_exc(),
+            )
+
+        return False
+
+    claimed.delete()
+    return True
+
+
+def run_pending_jobs(visibility_timeout=None, stop_event=None):
+    """
+    Run jobs until none are available, or until `stop_event` is set,
+    and return how many were run
+    """
+    visibility_timeout = visibility_timeout or settings.JOBS_VISIBILITY_TIMEOUT
+    count = 0
+
+    while stop_event is None or not stop_event.is_set():
+        job = Job.objects.claim(visibility_timeout)
+
+        if job is None:
+            break
+
+        run_job(job)
+        count += 1
+
+    return count
+
+
+def work(stop_event, visibility_timeout=None, poll_interval=None, once=False):
+    """
+    Run jobs as they become available, until `stop_event` is set,
+    or until none are available if `once` is set
+    """
+    poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+    logger.info('Worker %s started', threading.current_thread().name)
+
+    try:
+        while not stop_event.is_set():
+            run_pending_jobs(visibility_timeout, stop_event)
+
+            if once:
+                break
+
+            stop_event.wait(poll_interval)
+    finally:
+        # Every thread has its own database connection, and
+        # processes shouldn't share the connections they forked with.
+        connections.close_all()
+
+    logger.info('Worker %s stopped', threading.current_thread().name)
@@ -1,6 +1,4 @@
 from ajax_select import register, LookupChannel
-from django.db.models import Q
-from itertools import chain
 
 from pulseapi.profiles.models import UserProfile
 
@@ -9,15 +7,11 @@ from pulseapi.profiles.models import UserProfile
 class UserProfilesLookup(LookupChannel):
     model = UserProfile
 
-    def get_query(self, q, request):
-        queryset = self.model.objects.all()
-        startswith_lookup = Q(custom_name__istartswith=q) | Q(related_user__name__istartswith=q)
-        qs_startswith = queryset.filter(startswith_lookup)
-        qs_contains = queryset.filter(
-            Q(custom_name__icontains=q) | Q(related_user__name__icontains=q)
-        ).exclude(startswith_lookup)
+    # The number of suggestions shown in the autocomplete dropdown
+    max_results = 20
 
-        return list(chain(qs_startswith, qs_contains))
+    def get_query(self, q, request):
+        return self.model.objects.search_by_name(q).select_related('related_user')[:self.max_results]
 
     def format_item_display(self, item):
         return f'<span class="profile">{str(item)}</span>'
@@ -0,0 +1,45 @@
+# Generated by Django 2.2.13 on 2026-10-18 11:00
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def set_display_names(apps, schema_editor):
+    UserProfile = apps.get_model('profiles', 'UserProfile')
+    EmailUser = apps.get_model('users', 'EmailUser')
+
+    user_names = EmailUser.objects.filter(profile=models.OuterRef('pk')).values('name')[:1]
+
+    UserProfile.objects.update(display_name=models.Case(
+        models.When(
+            custom_name__regex=r'^\s*$',
+            then=Coalesce(models.Subquery(user_names), models.Value('')),
+        ),
+        default=models.F('custom_name'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0025_transfer_user_isactive_to_profile'),
+        ('users', '0010_emailuser_is_active'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='userprofile',
+            name='display_name',
+            field=models.CharField(blank=True, editable=False, max_length=1000),
+        ),
+        migrations.RunPython(set_display_names, migrations.RunPython.noop),
+        # Django's case-insensitive lookups compare UPPER() values, so that's
+        # what we index. Django 2.2 can't declare expression indexes on models.
+        migrations.RunSQL(
+            'CREATE INDEX profiles_userprofile_display_name_trgm '
+            'ON profiles_userprofile USING gin (UPPER(display_name) gin_trgm_ops);',
+            'DROP INDEX profiles_userprofile_display_name_trgm;',
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.13 on 2026-10-18 11:48
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_bookmarks(apps, schema_editor):
+    Entry = apps.get_model('entries', 'Entry')
+    UserBookmarks = apps.get_model('profiles', 'UserBookmarks')
+
+    duplicates = UserBookmarks.objects.filter(profile__isnull=False).values('entry', 'profile').annotate(
+        first_id=models.Min('id'),
+        count=models.Count('id'),
+    ).filter(count__gt=1)
+
+    entry_ids = set()
+
+    for duplicate in duplicates:
+        UserBookmarks.objects.filter(
+            entry=duplicate['entry'],
+            profile=duplicate['profile'],
+        ).exclude(id=duplicate['first_id']).delete()
+        entry_ids.add(duplicate['entry'])
+
+    bookmark_counts = UserBookmarks.objects.filter(
+        entry=models.OuterRef('pk')
+    ).order_by().values('entry').annotate(count=models.Count('*')).values('count')
+
+    Entry.objects.filter(pk__in=entry_ids).update(
+        bookmark_count=Coalesce(models.Subquery(bookmark_counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0026_entry_bookmark_count'),
+        ('profiles', '0026_userprofile_display_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_bookmarks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='userbookmarks',
+            constraint=models.UniqueConstraint(fields=('entry', 'profile'), name='unique_bookmark_per_profile'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.13 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0027_userbookmarks_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userbookmarks',
+            index=models.Index(fields=['profile', '-timestamp'], name='profiles_bookmarks_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(condition=models.Q(is_active=True), fields=['id'], name='profiles_active_id'),
+        ),
+    ]
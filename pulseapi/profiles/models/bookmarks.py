@@ -1,4 +1,126 @@
-from django.db import models
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from pulseapi.entries.cache import bump_entries_generation
+
+
+def touch_bookmarks(profile_id, entries):
+    """
+    Bump the versions of a profile and of the entries
+    that it bookmarked or stopped bookmarking
+    """
+    apps.get_model('profiles', 'UserProfile').objects.filter(pk=profile_id).touch()
+    entries.touch()
+
+
+class UserBookmarksQuerySet(models.query.QuerySet):
+    def delete_bookmarks(self, profile_id, entry_ids):
+        """
+        Delete a profile's bookmarks for a set of entries with a single
+        DELETE, without sending signals, and return the ids of the entries
+        that were actually unbookmarked.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM {table} WHERE profile_id = %s AND entry_id = ANY(%s) RETURNING entry_id'.format(
+                    table=self.model._meta.db_table,
+                ),
+                [profile_id, list(entry_ids)],
+            )
+            return [entry_id for (entry_id,) in cursor.fetchall()]
+
+    def insert_bookmark(self, profile_id, entry_id):
+        """
+        Bookmark an entry for a profile with a single INSERT, without
+        sending signals, unless it is already bookmarked. Returns whether
+        a bookmark was inserted.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} (entry_id, profile_id, timestamp) VALUES (%s, %s, %s) '
+                'ON CONFLICT (entry_id, profile_id) DO NOTHING RETURNING id'.format(
+                    table=self.model._meta.db_table,
+                ),
+                [entry_id, profile_id, timezone.now()],
+            )
+            return cursor.fetchone() is not None
+
+    def toggle_bookmark(self, profile, entry_id):
+        """
+        Bookmark an entry for a profile if it isn't bookmarked yet,
+        otherwise remove the bookmark. Returns whether the entry is now
+        bookmarked, and its bookmark count.
+
+        Rather than checking whether a bookmark exists first, we try to
+        delete it and only insert one if nothing was deleted. Both
+        statements report the rows they actually changed, and the bookmark
+        count is adjusted by those alone, so concurrent toggles can neither
+        create duplicate bookmarks nor count one twice.
+        """
+        Entry = apps.get_model('entries', 'Entry')
+        entries = Entry.objects.filter(pk=entry_id)
+
+        with transaction.atomic():
+            if self.delete_bookmarks(profile.pk, [entry_id]):
+                bookmarked, change = False, -1
+            else:
+                # A concurrent request may have bookmarked the entry first
+                bookmarked = True
+                change = 1 if self.insert_bookmark(profile.pk, entry_id) else 0
+
+            if change:
+                entries.update(bookmark_count=Greatest(F('bookmark_count') + change, 0))
+                touch_bookmarks(profile.pk, entries)
+                bump_entries_generation()
+
+            bookmark_count = entries.values_list('bookmark_count', flat=True).first()
+
+        return bookmarked, bookmark_count
+
+    def bookmark_entries(self, profile, entry_ids):
+        """
+        Bookmark a set of entries for a profile with a single INSERT,
+        skipping entry ids that don't exist or are already bookmarked.
+        Returns the ids of the entries that exist.
+        """
+        Entry = apps.get_model('entries', 'Entry')
+        entries = Entry.objects.filter(pk__in=entry_ids)
+        entry_ids = list(entries.values_list('pk', flat=True))
+
+        if not entry_ids:
+            return entry_ids
+
+        self.bulk_create(
+            [UserBookmarks(entry_id=entry_id, profile=profile) for entry_id in entry_ids],
+            ignore_conflicts=True,
+        )
+
+        # Bulk inserts don't send post_save signals, and with ignore_conflicts
+        # we can't tell which bookmarks were new, so we recount instead.
+        entries.update_bookmark_counts()
+        touch_bookmarks(profile.pk, entries)
+        bump_entries_generation()
+
+        return entry_ids
+
+    def unbookmark_entries(self, profile, entry_ids):
+        """
+        Remove a profile's bookmarks for a set of entries with a single
+        DELETE, and update the entries that were unbookmarked as a whole.
+        """
+        Entry = apps.get_model('entries', 'Entry')
+        entry_ids = self.delete_bookmarks(profile.pk, entry_ids)
+
+        if not entry_ids:
+            return
+
+        entries = Entry.objects.filter(pk__in=entry_ids)
+        entries.update_bookmark_counts()
+        touch_bookmarks(profile.pk, entries)
+        bump_entries_generation()
 
 
 class UserBookmarks(models.Model):
@@ -24,6 +146,8 @@ class UserBookmarks(models.Model):
         auto_now=True,
     )
 
+    objects = UserBookmarksQuerySet.as_manager()
+
     def __str__(self):
         return 'bookmark for "{e}" by [{p}]'.format(
             e=self.entry,
@@ -33,3 +157,10 @@ class UserBookmarks(models.Model):
     class Meta:
         verbose_name = "Bookmarks"
         verbose_name_plural = "Bookmarks"
+        constraints = [
+            models.UniqueConstraint(fields=['entry', 'profile'], name='unique_bookmark_per_profile'),
+        ]
+        indexes = [
+            # A profile's bookmarks, most recently bookmarked first
+            models.Index(fields=['profile', '-timestamp'], name='profiles_bookmarks_recent'),
+        ]
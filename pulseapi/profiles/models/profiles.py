@@ -1,10 +1,14 @@
 import os
 
 from django.conf import settings
+from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
 from django.utils import timezone
 
+from pulseapi.utility.expressions import SubqueryCount
+
 from . import ProfileType
 
 
@@ -32,6 +36,101 @@ class UserProfileQuerySet(models.query.QuerySet):
         """
         return self.filter(is_active=True)
 
+    def touch(self):
+        """
+        Bump the `modified` timestamp of all profiles in this queryset,
+        and record the modifications in the change log
+        """
+        # Import Change here to avoid circular import
+        from pulseapi.changes.models import Change
+
+        profile_ids = list(self.values_list('pk', flat=True))
+        self.model.objects.filter(pk__in=profile_ids).update(modified=timezone.now())
+        Change.objects.record(Change.PROFILE, profile_ids, Change.MODIFIED)
+
+    def with_entry_counts(self):
+        """
+        Annotate every profile with the number of public entries they
+        created (`created_entry_count`) or published (`published_entry_count`),
+        and the number of entries they bookmarked (`favorited_entry_count`),
+        with one subquery per count.
+        """
+        # Import these here to avoid circular imports
+        from pulseapi.creators.models import EntryCreator
+        from pulseapi.entries.models import Entry
+        from . import UserBookmarks
+
+        created = EntryCreator.objects.filter(
+            profile=models.OuterRef('pk'),
+            entry__in=Entry.objects.public().values('pk'),
+        )
+        published = Entry.objects.public().order_by().filter(published_by__profile=models.OuterRef('pk'))
+        favorited = UserBookmarks.objects.filter(profile=models.OuterRef('pk'))
+
+        return self.annotate(
+            created_entry_count=SubqueryCount(created.order_by().values('pk')),
+            published_entry_count=SubqueryCount(published.values('pk')),
+            favorited_entry_count=SubqueryCount(favorited.order_by().values('pk')),
+        )
+
+    def with_related_entry_count(self):
+        """
+        Annotate every profile with the number of public entries they
+        created, published or bookmarked, counting each entry once
+        (`related_entry_count`).
+        """
+        # Import Entry here to avoid circular import
+        from pulseapi.entries.models import Entry
+
+        related = Entry.objects.public().order_by().filter(
+            models.Q(related_entry_creators__profile=models.OuterRef('pk')) |
+            models.Q(published_by__profile=models.OuterRef('pk')) |
+            models.Q(bookmarked_by__profile=models.OuterRef('pk'))
+        ).distinct()
+
+        return self.annotate(related_entry_count=SubqueryCount(related.values('pk')))
+
+    def search_by_name(self, name):
+        """
+        Return the profiles whose display name contains `name`, ranking the
+        profiles whose names start with `name` first. The queryset's own
+        ordering is kept within each rank.
+
+        The display name already falls back to the name of the profile's
+        user, and lookups are backed by a trigram index on
+        UPPER(display_name).
+        """
+        ordering = self.query.order_by or ('display_name', 'id')
+        contains = models.Q(display_name__icontains=name)
+        starts_with = models.Q(display_name__istartswith=name)
+
+        return self.filter(contains).annotate(
+            name_rank=models.Case(
+                models.When(starts_with, then=models.Value(0)),
+                default=models.Value(1),
+                output_field=models.IntegerField(),
+            )
+        ).order_by('name_rank', *ordering)
+
+    def update_display_names(self):
+        """
+        Recompute the display_name for all profiles in this queryset
+        with a single UPDATE query
+        """
+        # Import EmailUser here to avoid circular import
+        from pulseapi.users.models import EmailUser
+
+        user_names = EmailUser.objects.filter(profile=models.OuterRef('pk')).values('name')[:1]
+
+        return self.update(display_name=models.Case(
+            # blank values, including pure whitespace, don't count:
+            models.When(
+                custom_name__regex=r'^\s*$',
+                then=Coalesce(models.Subquery(user_names), models.Value('')),
+            ),
+            default=models.F('custom_name'),
+        ))
+
 
 class UserProfile(models.Model):
     """
@@ -45,6 +144,12 @@ class UserProfile(models.Model):
         auto_now_add=True
     )
 
+    # When this profile, or anything that is serialized with it (its user,
+    # entries and bookmarks), last changed. See Entry.modified.
+    modified = models.DateTimeField(
+        auto_now=True,
+    )
+
     # This flag determines whether this profile has been
     # activated, meaning it can be retrieved through REST
     # API calls and might get crosslinked into data structures
@@ -74,6 +179,15 @@ class UserProfile(models.Model):
 
     custom_name.short_description = 'Custom user name'
 
+    # A copy of `name`, so that profiles can be searched by name in
+    # the database. It is updated whenever the profile is saved, and
+    # whenever its user's name changes (see the users app's signals).
+    display_name = models.CharField(
+        max_length=1000,
+        blank=True,
+        editable=False,
+    )
+
     # Accessing the Profile-indicated name needs various stages
     # of fallback.
     # Note that we cannot use this accessor as a lookup field in querysets
@@ -133,6 +247,14 @@ class UserProfile(models.Model):
         blank=True
     )
 
+    # Resized versions of the thumbnail, see pulseapi/utility/thumbnails.py
+    thumbnails = JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+    )
+    thumbnail_widths = (100, 200, 400)
+
     def thumbnail_image_tag(self):
         if not self.thumbnail:
             return format_html('<span>No image to preview</span>')
@@ -235,6 +357,7 @@ class UserProfile(models.Model):
     def save(self, *args, **kwargs):
         if self.profile_type is None:
             self.profile_type = ProfileType.get_default_profile_type()
+        self.display_name = self.name or ''
         super(UserProfile, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -245,3 +368,7 @@ class UserProfile(models.Model):
 
     class Meta:
         verbose_name = "Profile"
+        indexes = [
+            # Profile listings only count and page through active profiles
+            models.Index(fields=['id'], condition=models.Q(is_active=True), name='profiles_active_id'),
+        ]
@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+from django.db import models
 from django.db.models import Q, Prefetch
 from rest_framework import serializers
 
@@ -54,18 +57,21 @@ class UserProfileEntriesSerializer(serializers.Serializer):
         # If none of the filter options are provided, only return the count of
         # entries associated with this profile
         if not (include_created or include_published or include_favorited):
-            entry_count = Entry.objects.public().filter(
-                Q(related_entry_creators__profile=instance) |
-                Q(published_by=instance.user) |
-                Q(bookmarked_by__profile=instance)
-            ).distinct().count()
+            if hasattr(instance, 'related_entry_count'):
+                entry_count = instance.related_entry_count
+            else:
+                entry_count = Entry.objects.public().filter(
+                    Q(related_entry_creators__profile=instance) |
+                    Q(published_by=instance.user) |
+                    Q(bookmarked_by__profile=instance)
+                ).distinct().count()
             return {
                 'entry_count': entry_count
             }
 
         entry_queryset = Entry.objects.prefetch_related(
             'related_entry_creators__profile__related_user',
-            'bookmarked_by__profile__related_user',
+            'bookmarked_by',
         )
 
         if include_created:
@@ -119,6 +125,67 @@ class UserProfileEntriesSerializer(serializers.Serializer):
         return data
 
 
+def attach_serialized_entries(profiles, user=None):
+    """
+    Serialize the public entries published and created by a batch of
+    profiles with a fixed number of queries, however many profiles and
+    entries there are, and attach them to each profile as
+    `serialized_published_entries` and `serialized_created_entries`.
+    """
+    profile_ids = [profile.id for profile in profiles]
+    published_entry_ids = defaultdict(list)
+    created_entry_ids = defaultdict(list)
+
+    entry_creators = EntryCreator.objects.filter(
+        profile_id__in=profile_ids,
+        entry__in=Entry.objects.public(),
+    ).order_by('-id').values_list('profile_id', 'entry_id')
+
+    for profile_id, entry_id in entry_creators:
+        created_entry_ids[profile_id].append(entry_id)
+
+    entries = list(
+        Entry.objects.public().filter(
+            Q(published_by__profile_id__in=profile_ids) |
+            Q(id__in=[entry_id for entry_ids in created_entry_ids.values() for entry_id in entry_ids])
+        ).select_related('published_by').order_by('-id')
+    )
+
+    for entry in entries:
+        published_entry_ids[entry.published_by.profile_id].append(entry.id)
+
+    serialized_entries = {
+        serialized_entry['id']: serialized_entry
+        for serialized_entry in EntrySerializerWithV1Creators(
+            entries,
+            many=True,
+            context={
+                'user': user,
+                'cache_entries': True,
+            }
+        ).data
+    }
+
+    for profile in profiles:
+        profile.serialized_published_entries = [
+            serialized_entries[entry_id] for entry_id in published_entry_ids[profile.id]
+        ]
+        profile.serialized_created_entries = [
+            serialized_entries[entry_id] for entry_id in created_entry_ids[profile.id]
+        ]
+
+
+class UserProfileWithEntriesListSerializer(serializers.ListSerializer):
+    """
+    Serializes a list of profiles with their entries, fetching the
+    entries for all profiles at once.
+    """
+    def to_representation(self, data):
+        profiles = list(data.all() if isinstance(data, models.Manager) else data)
+        attach_serialized_entries(profiles, user=self.context.get('user'))
+        return super().to_representation(profiles)
+
+
 class UserProfilePublicWithEntriesSerializer(UserProfilePublicSerializer):
     """
     Serializes a user profile for public view and includes all entries
@@ -127,16 +194,18 @@ class UserProfilePublicWithEntriesSerializer(UserProfilePublicSerializer):
     published_entries = serializers.SerializerMethodField()
 
     def get_published_entries(self, instance):
-        user = instance.user
+        if not hasattr(instance, 'serialized_published_entries'):
+            attach_serialized_entries([instance], user=self.context.get('user'))
 
-        return EntrySerializerWithV1Creators(
-            user.entries.public().with_related().order_by('-id'),
-            many=True,
-            context={'user': self.context.get('user')}
-        ).data if user else []
+        return instance.serialized_published_entries
 
     created_entries = serializers.SerializerMethodField()
 
     def get_created_entries(self, instance):
-        entry_creators = EntryCreator.objects.filter(profile=instance).order_by('-id')
-        return [EntrySerializerWithV1Creators(x.entry).data for x in entry_creators if x.entry.is_approved()]
+        if not hasattr(instance, 'serialized_created_entries'):
+            attach_serialized_entries([instance], user=self.context.get('user'))
+
+        return instance.serialized_created_entries
+
+    class Meta(UserProfilePublicSerializer.Meta):
+        list_serializer_class = UserProfileWithEntriesListSerializer
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from pulseapi.entries.models import Entry
 from pulseapi.issues.models import Issue
 from pulseapi.profiles.models import UserProfile
+from pulseapi.utility.serializer_fields import ThumbnailsField
 
 
 # Helper function to remove a value from a dictionary
@@ -45,6 +46,8 @@ class UserProfileListSerializer(UserProfileTrimExtendedInfoMixin, serializers.Mo
     A serializer to serialize user profiles for optimally viewing
     in a list
     """
+    thumbnails = ThumbnailsField()
+
     def to_representation(self, instance):
         serialized_profile = super().to_representation(instance)
         return self.trim_extended_information_from_dict(
@@ -60,6 +63,7 @@ class UserProfileListSerializer(UserProfileTrimExtendedInfoMixin, serializers.Mo
             'is_active',
             'is_group',
             'thumbnail',
+            'thumbnails',
             'user_bio',
             'user_bio_long',
             'location',
@@ -98,6 +102,7 @@ class UserProfileSerializer(UserProfileTrimExtendedInfoMixin, serializers.ModelS
         required=False,
         allow_null=True,
     )
+    thumbnails = ThumbnailsField()
     issues = serializers.SlugRelatedField(
         many=True,
         slug_field='name',
@@ -140,6 +145,15 @@ class UserProfileSerializer(UserProfileTrimExtendedInfoMixin, serializers.ModelS
     entry_count = serializers.SerializerMethodField()
 
     def get_entry_count(self, obj):
+        # Use the counts from UserProfileQuerySet.with_entry_counts() if the
+        # profile was fetched with them, so that lists don't query per profile.
+        if hasattr(obj, 'created_entry_count'):
+            return {
+                'created': obj.created_entry_count,
+                'published': obj.published_entry_count,
+                'favorited': obj.favorited_entry_count,
+            }
+
         entry_queryset = Entry.objects.public()
 
         return {
@@ -172,6 +186,7 @@ class UserProfileSerializer(UserProfileTrimExtendedInfoMixin, serializers.ModelS
         read_only_fields = ('profile_type', 'entry_count', 'is_active',)
         exclude = [
             'created_at',
+            'modified',
             'bookmarks',
             'id',
             'is_group',
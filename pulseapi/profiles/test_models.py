@@ -1,8 +1,14 @@
 from datetime import date
+from unittest import mock
+
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 
-from pulseapi.profiles.models import CohortRecord
+from pulseapi.entries.factory import EntryFactory
+from pulseapi.entries.models import Entry
+from pulseapi.profiles.models import CohortRecord, UserBookmarks, UserProfile
+from pulseapi.profiles.models.bookmarks import UserBookmarksQuerySet
+from pulseapi.users.factory import BasicEmailUserFactory
 from pulseapi.utility.validators import YearValidator
 from pulseapi.profiles.factory import (
     BasicUserProfileFactory,
@@ -53,3 +59,121 @@ class TestProfileCategories(TestCase):
                 profile=self.profile,
                 program=self.programs[0],
             )
+
+
+class TestProfileNameSearch(TestCase):
+    def setUp(self):
+        self.custom = BasicUserProfileFactory(custom_name='Mozilla Foundation')
+        self.contains = BasicUserProfileFactory(custom_name='Friends of Mozilla')
+        self.user_named = BasicUserProfileFactory(custom_name='')
+        BasicEmailUserFactory(profile=self.user_named, name='Mozillaphile')
+        self.custom_named_user = BasicUserProfileFactory(custom_name='A pseudonym')
+        BasicEmailUserFactory(profile=self.custom_named_user, name='Mozilla Fan')
+        self.unrelated = BasicUserProfileFactory(custom_name='Someone else')
+
+    def test_display_name_falls_back_to_user_name(self):
+        self.user_named.refresh_from_db()
+        self.assertEqual(self.user_named.display_name, 'Mozillaphile')
+
+        user = self.user_named.related_user
+        user.name = 'Renamed Mozillaphile'
+        user.save()
+
+        self.user_named.refresh_from_db()
+        self.assertEqual(self.user_named.display_name, 'Renamed Mozillaphile')
+
+        self.user_named.custom_name = 'Custom Mozillaphile'
+        self.user_named.save()
+        self.user_named.refresh_from_db()
+        self.assertEqual(self.user_named.display_name, 'Custom Mozillaphile')
+
+    def test_search_by_name_ranks_prefix_matches_first(self):
+        results = list(UserProfile.objects.order_by('id').search_by_name('mozilla'))
+
+        self.assertListEqual(results, [self.custom, self.user_named, self.contains])
+
+    def test_search_by_name_matches_display_names(self):
+        """
+        Make sure profiles with a custom name are found by that name rather than by the name of their user
+        """
+        self.assertListEqual(list(UserProfile.objects.search_by_name('pseudonym')), [self.custom_named_user])
+        self.assertListEqual(list(UserProfile.objects.search_by_name('fan')), [])
+
+
+class TestToggleBookmark(TestCase):
+    def setUp(self):
+        self.entry = EntryFactory(published_by=BasicEmailUserFactory())
+        self.profile = BasicUserProfileFactory()
+
+    def test_toggle_bookmark(self):
+        """
+        Make sure toggling bookmarks an entry once, then removes the bookmark
+        """
+        other_profile = BasicUserProfileFactory()
+        UserBookmarks.objects.create(entry=self.entry, profile=other_profile)
+
+        self.assertEqual(UserBookmarks.objects.toggle_bookmark(self.profile, self.entry.id), (True, 2))
+        self.assertEqual(UserBookmarks.objects.toggle_bookmark(self.profile, self.entry.id), (False, 1))
+        self.assertEqual(UserBookmarks.objects.toggle_bookmark(self.profile, self.entry.id), (True, 2))
+        self.assertEqual(self.entry.bookmarked_by.filter(profile=self.profile).count(), 1)
+
+    def test_toggle_bookmark_lost_race(self):
+        """
+        Make sure a toggle that loses a race with a concurrent bookmark
+        doesn't create a duplicate bookmark or count it twice
+        """
+        def delete_then_bookmark_concurrently(queryset, profile_id, entry_ids):
+            deleted = delete_bookmarks(queryset, profile_id, entry_ids)
+            # The concurrent request inserts its bookmark right before we do
+            UserBookmarks.objects.create(entry=self.entry, profile=self.profile)
+            return deleted
+
+        delete_bookmarks = UserBookmarksQuerySet.delete_bookmarks
+
+        with mock.patch.object(UserBookmarksQuerySet, 'delete_bookmarks', delete_then_bookmark_concurrently):
+            bookmarked, bookmark_count = UserBookmarks.objects.toggle_bookmark(self.profile, self.entry.id)
+
+        self.assertEqual((bookmarked, bookmark_count), (True, 1))
+        self.assertEqual(self.entry.bookmarked_by.count(), 1)
+
+    def test_toggle_bookmark_lost_delete_race(self):
+        """
+        Make sure a toggle whose bookmark was deleted by a concurrent toggle
+        doesn't count the deletion twice
+        """
+        UserBookmarks.objects.create(entry=self.entry, profile=self.profile)
+
+        def delete_concurrently(queryset, profile_id, entry_ids):
+            # The concurrent request deletes the bookmark right before we do
+            delete_bookmarks(queryset, profile_id, entry_ids)
+            Entry.objects.filter(pk=self.entry.pk).update(bookmark_count=0)
+            return delete_bookmarks(queryset, profile_id, entry_ids)
+
+        delete_bookmarks = UserBookmarksQuerySet.delete_bookmarks
+
+        with mock.patch.object(UserBookmarksQuerySet, 'delete_bookmarks', delete_concurrently):
+            bookmarked, bookmark_count = UserBookmarks.objects.toggle_bookmark(self.profile, self.entry.id)
+
+        self.assertEqual((bookmarked, bookmark_count), (True, 1))
+        self.assertEqual(self.entry.bookmarked_by.count(), 1)
+
+    def test_unbookmark_entries(self):
+        """
+        Make sure entries are unbookmarked in bulk, with the same number
+        of queries however many there are
+        """
+        other_entry = EntryFactory(published_by=BasicEmailUserFactory())
+        UserBookmarks.objects.bookmark_entries(self.profile, [self.entry.id, other_entry.id])
+        UserBookmarks.objects.create(entry=self.entry, profile=BasicUserProfileFactory())
+
+        with self.assertNumQueries(11):
+            UserBookmarks.objects.unbookmark_entries(self.profile, [self.entry.id, other_entry.id])
+
+        self.assertFalse(UserBookmarks.objects.filter(profile=self.profile).exists())
+        self.assertEqual(
+            list(Entry.objects.filter(pk__in=[self.entry.id, other_entry.id]).order_by('pk').values_list(
+                'bookmark_count',
+                flat=True,
+            )),
+            [1, 0],
+        )
@@ -1,8 +1,11 @@
 import json
 from math import ceil
+from unittest.mock import patch
 from urllib.parse import urlencode
 from django.urls import reverse
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.http.request import HttpRequest
 from rest_framework.request import Request
 
@@ -15,7 +18,7 @@ from pulseapi.entries.serializers import (
     EntryWithCreatorsBaseSerializer,
     EntryWithV1CreatorsBaseSerializer,
 )
-from pulseapi.profiles.views.profiles import ProfilesPagination
+from pulseapi.profiles.views.profiles import ProfilesPagination, UserProfileListAPIView
 from pulseapi.entries.factory import BasicEntryFactory
 from pulseapi.users.factory import BasicEmailUserFactory
 from pulseapi.creators.models import EntryCreator
@@ -358,7 +361,7 @@ class TestProfileView(PulseMemberTestCase):
                         type=profile_type.value,
                         qs=urlencode(query_dict)
                     )
-                ).content,
+                ).getvalue(),
                 'utf-8'
             ))
             serialized_profile_list = profile_serializer_class(
@@ -419,6 +422,76 @@ class TestProfileView(PulseMemberTestCase):
             query_dict={'basic': ''}
         )
 
+    def run_test_profile_list_query_count(self, api_version):
+        """
+        Make sure the number of queries for a profile list doesn't
+        depend on the number of profiles in it, or on their entries
+        """
+        (profile_type, _) = ProfileType.objects.get_or_create(value='query-count-type')
+        approved = ModerationState.objects.get(name='Approved')
+        url = '{url}?profile_type={type}'.format(
+            url=reverse('profile_list', args=[api_version + '/']),
+            type=profile_type.value,
+        )
+
+        query_counts = []
+        for _ in range(2):
+            for _ in range(3):
+                profile = ExtendedUserProfileFactory(profile_type=profile_type)
+                user = BasicEmailUserFactory(profile=profile)
+                BasicEntryFactory(published_by=user, moderation_state=approved)
+                created_entry = BasicEntryFactory(published_by=self.user, moderation_state=approved)
+                EntryCreatorFactory(profile=profile, entry=created_entry)
+
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+                # streamed responses only query the database as they're consumed
+                profiles = json.loads(str(response.getvalue(), 'utf-8'))
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(profiles), 3 * (len(query_counts) + 1))
+            query_counts.append(len(context.captured_queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_profile_list_v1_query_count(self):
+        self.run_test_profile_list_query_count(settings.API_VERSIONS['version_1'])
+
+    def test_profile_list_v2_query_count(self):
+        self.run_test_profile_list_query_count(settings.API_VERSIONS['version_2'])
+
+    def test_profile_list_v2_is_streamed_in_chunks(self):
+        """
+        Make sure unpaginated JSON profile lists are streamed, chunk by chunk
+        """
+        (profile_type, _) = ProfileType.objects.get_or_create(value='streaming-type')
+        for _ in range(5):
+            ExtendedUserProfileFactory(profile_type=profile_type)
+
+        url = '{url}?profile_type={type}'.format(
+            url=reverse('profile_list', args=[settings.API_VERSIONS['version_2'] + '/']),
+            type=profile_type.value,
+        )
+
+        with patch.object(UserProfileListAPIView, 'stream_chunk_size', 2):
+            response = self.client.get(url)
+
+        self.assertTrue(response.streaming)
+        response_profiles = json.loads(str(response.getvalue(), 'utf-8'))
+        expected_profiles = UserProfilePublicSerializer(
+            UserProfile.objects.filter(profile_type=profile_type).order_by('-id'),
+            context={'user': self.user},
+            many=True,
+        ).data
+        self.assertListEqual(response_profiles, expected_profiles)
+
+    def test_profile_list_v3_is_not_streamed(self):
+        response = self.client.get('{url}?is_active=True'.format(
+            url=reverse('profile_list', args=[settings.API_VERSIONS['version_3'] + '/']),
+        ))
+
+        self.assertFalse(response.streaming)
+
     def test_profile_list_filtering(self):
         profile_types = ['a', 'b', 'c']
         program_types = ['a', 'b']
@@ -444,21 +517,21 @@ class TestProfileView(PulseMemberTestCase):
         for profile_type in profile_types:
             url = ('{url}?profile_type={type}').format(url=profile_url, type=profile_type)
             response = self.client.get(url)
-            entriesjson = json.loads(str(response.content, 'utf-8'))
+            entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
             self.assertEqual(len(entriesjson), 4)
 
         # There should be six results for each program type
         for program_type in program_types:
             url = ('{url}?program_type={type}').format(url=profile_url, type=program_type)
             response = self.client.get(url)
-            entriesjson = json.loads(str(response.content, 'utf-8'))
+            entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
             self.assertEqual(len(entriesjson), 6)
 
         # There should be six results for each program year
         for program_year in program_years:
             url = ('{url}?program_year={type}').format(url=profile_url, type=program_year)
             response = self.client.get(url)
-            entriesjson = json.loads(str(response.content, 'utf-8'))
+            entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
             self.assertEqual(len(entriesjson), 6)
 
         # There should only be one result for each unique combination
@@ -472,7 +545,7 @@ class TestProfileView(PulseMemberTestCase):
                         v3=program_year
                     )
                     response = self.client.get(url)
-                    entriesjson = json.loads(str(response.content, 'utf-8'))
+                    entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
                     self.assertEqual(len(entriesjson), 1)
 
     def test_profile_list_filtering_active_v2(self):
@@ -494,7 +567,7 @@ class TestProfileView(PulseMemberTestCase):
         profile_url = reverse('profile_list')
         url = ('{url}?unsupported_arg=should_be_empty_response').format(url=profile_url)
         response = self.client.get(url)
-        entriesjson = json.loads(str(response.content, 'utf-8'))
+        entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
         self.assertEqual(len(entriesjson), 0)
 
     def test_profile_categories(self):
@@ -519,7 +592,7 @@ class TestProfileView(PulseMemberTestCase):
         profile_url = reverse('profile_list')
         url = ('{url}?is_active=True').format(url=profile_url)
         response = self.client.get(url)
-        entriesjson = json.loads(str(response.content, 'utf-8'))
+        entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
         num_of_inactive_profiles = sum(profile['is_active'] is False for profile in entriesjson)
         list_of_returned_profile_ids = [profile['profile_id'] for profile in entriesjson]
 
@@ -541,7 +614,7 @@ class TestProfileView(PulseMemberTestCase):
         profile_url = reverse('profile_list')
         url = ('{url}?is_active=False').format(url=profile_url)
         response = self.client.get(url)
-        entriesjson = json.loads(str(response.content, 'utf-8'))
+        entriesjson = json.loads(str(response.getvalue(), 'utf-8'))
         num_of_active_profiles = sum(profile['is_active'] is True for profile in entriesjson)
         list_of_returned_profile_ids = [profile['profile_id'] for profile in entriesjson]
 
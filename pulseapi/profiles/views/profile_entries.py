@@ -17,11 +17,14 @@ class UserProfileEntriesAPIView(APIView):
         that can be filtered by entries that this profile - was
         a creator on, was a publisher of, or favorited.
         """
-        profile = get_object_or_404(
-            UserProfile.objects.select_related('related_user'),
-            pk=pk,
-        )
         query = request.query_params
+        profiles = UserProfile.objects.select_related('related_user')
+
+        if not ('created' in query or 'published' in query or 'favorited' in query):
+            # Only the number of related entries will be serialized
+            profiles = profiles.with_related_entry_count()
+
+        profile = get_object_or_404(profiles, pk=pk)
         EntrySerializerClass = EntryWithCreatorsBaseSerializer
 
         if request and request.version == settings.API_VERSIONS['version_1']:
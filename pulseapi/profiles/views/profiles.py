@@ -1,10 +1,11 @@
 import base64
-from itertools import chain
+from itertools import islice
 import django_filters
 
 from django.core.files.base import ContentFile
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import prefetch_related_objects
+from django.http import StreamingHttpResponse
 
 from django_filters.rest_framework import (
     DjangoFilterBackend,
@@ -23,6 +24,8 @@ from rest_framework.generics import (
     get_object_or_404,
 )
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import FormParser
+from rest_framework.renderers import JSONRenderer
 
 from pulseapi.profiles.models import UserProfile
 from pulseapi.profiles.serializers import (
@@ -32,6 +35,9 @@ from pulseapi.profiles.serializers import (
     UserProfileBasicSerializer,
     UserProfileListSerializer,
 )
+from pulseapi.utility.conditional import ConditionalRetrieveMixin
+from pulseapi.utility.renderers import get_json_parser_class
+from pulseapi.utility.uploads import ProfileUploadParser
 
 
 class IsProfileOwner(permissions.BasePermission):
@@ -47,13 +53,18 @@ class UserProfileAPIView(RetrieveUpdateAPIView):
 
     serializer_class = UserProfileSerializer
 
+    parser_classes = (
+        get_json_parser_class(),
+        FormParser,
+        ProfileUploadParser,
+    )
+
     def get_object(self):
         user = self.request.user
         return get_object_or_404(
-            UserProfile.objects.prefetch_related(
+            UserProfile.objects.with_entry_counts().prefetch_related(
                 'issues',
                 'related_user',
-                'bookmarks_from',
             ),
             related_user=user
         )
@@ -72,12 +83,13 @@ class UserProfileAPIView(RetrieveUpdateAPIView):
         we need to check using "if hasattr(request.data,'thumbnail'):"
         as we as "if request.data['thumbnail']" and these are pretty
         much mutually exclusive patterns. A try/pass make far more sense.
+        Thumbnails of multipart requests are already uploaded files.
         """
 
         payload = request.data
         thumbnail = payload.get('thumbnail')
 
-        if thumbnail:
+        if isinstance(thumbnail, dict):
             name = thumbnail.get('name')
             encdata = thumbnail.get('base64')
             if name and encdata:
@@ -89,8 +101,8 @@ class UserProfileAPIView(RetrieveUpdateAPIView):
         return super(UserProfileAPIView, self).put(request, *args, **kwargs)
 
 
-class UserProfilePublicAPIView(RetrieveAPIView):
-    queryset = UserProfile.objects.all()
+class UserProfilePublicAPIView(ConditionalRetrieveMixin, RetrieveAPIView):
+    queryset = UserProfile.objects.with_entry_counts()
 
     def get_serializer_class(self):
         if self.request.version == settings.API_VERSIONS['version_1']:
@@ -103,12 +115,23 @@ class UserProfilePublicAPIView(RetrieveAPIView):
             'user': self.request.user
         }
 
+    def get_modified(self):
+        return UserProfile.objects.filter(pk=self.kwargs['pk']).values_list('modified', flat=True).first()
+
 
 class UserProfilePublicSelfAPIView(UserProfilePublicAPIView):
     def get_object(self):
         user = self.request.user
         return get_object_or_404(self.queryset, related_user=user)
 
+    def get_modified(self):
+        user = self.request.user
+
+        if not user.is_authenticated:
+            return None
+
+        return UserProfile.objects.filter(related_user=user).values_list('modified', flat=True).first()
+
 
 class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
     pass
@@ -143,12 +166,7 @@ class ProfileCustomFilter(FilterSet):
     name = django_filters.CharFilter(method='filter_name')
 
     def filter_name(self, queryset, name, value):
-        startswith_lookup = Q(custom_name__istartswith=value) | Q(related_user__name__istartswith=value)
-        qs_startswith = queryset.filter(startswith_lookup)
-        qs_contains = queryset.filter(
-            Q(custom_name__icontains=value) | Q(related_user__name__icontains=value)
-        ).exclude(startswith_lookup)
-        return list(chain(qs_startswith, qs_contains))
+        return queryset.search_by_name(value)
 
     limit = django_filters.NumberFilter(method='filter_limit')
 
@@ -205,7 +223,56 @@ class ProfilesPagination(PageNumberPagination):
     max_page_size = 50
 
 
-class UserProfileListAPIView(ListAPIView):
+class StreamingJSONListMixin:
+    """
+    Stream JSON list responses one serialized item at a time instead of
+    rendering the whole list in memory, for list views that can't be
+    paginated. Instances are read from the database in chunks of
+    `stream_chunk_size`, and each chunk gets the queryset's prefetches.
+
+    Other renderers (e.g. the browsable API) are not affected.
+    """
+    stream_chunk_size = 100
+
+    def should_stream(self, request):
+        return isinstance(request.accepted_renderer, JSONRenderer)
+
+    def list(self, request, *args, **kwargs):
+        if not self.should_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return StreamingHttpResponse(
+            self.stream_json_list(queryset, request.accepted_renderer),
+            content_type=request.accepted_renderer.media_type,
+        )
+
+    def stream_json_list(self, queryset, renderer):
+        # QuerySet.iterator() ignores prefetch_related() in Django 2.2,
+        # so we prefetch for every chunk ourselves.
+        prefetch_lookups = getattr(queryset, '_prefetch_related_lookups', ())
+        instances = queryset.iterator(chunk_size=self.stream_chunk_size)
+        separator = b''
+
+        yield b'['
+
+        while True:
+            chunk = list(islice(instances, self.stream_chunk_size))
+
+            if not chunk:
+                break
+
+            prefetch_related_objects(chunk, *prefetch_lookups)
+
+            for item in self.get_serializer(chunk, many=True).data:
+                yield separator + renderer.render(item)
+                separator = b','
+
+        yield b']'
+
+
+class UserProfileListAPIView(StreamingJSONListMixin, ListAPIView):
     """
     Query Params:
         search=(search in name, affiliation, user_bio, user_bio_long, location)
@@ -247,22 +314,43 @@ class UserProfileListAPIView(ListAPIView):
         # active or inactive profiles. If we are filtering based on anything else, filter out
         # inactive profiles by default.
         if 'is_active' in queries:
-            queryset = UserProfile.objects.all().prefetch_related('related_user')
+            queryset = UserProfile.objects.all().select_related('related_user')
         else:
-            queryset = UserProfile.objects.active().prefetch_related('related_user')
+            queryset = UserProfile.objects.active().select_related('related_user')
 
-        if not request or request.version != settings.API_VERSIONS['version_2']:
-            # for all requests that aren't v2, we don't need to prefetch
+        if not request:
+            return queryset
+
+        version = request.version
+        is_v1 = version == settings.API_VERSIONS['version_1']
+
+        if 'basic' in request.query_params and not is_v1:
+            # basic profiles don't include any relationship data
+            return queryset
+
+        if not is_v1 and version != settings.API_VERSIONS['version_2']:
+            # for all requests that aren't v1 or v2, we don't need to prefetch
             # anything else because no other relationship data is selected
             return queryset
 
-        return queryset.prefetch_related(
-            'issues',
+        # v1 profiles also include their entries, which are fetched
+        # for the whole list by UserProfileWithEntriesListSerializer
+        # The profile's own relations are joined rather than prefetched, as
+        # v1 and v2 are streamed, and prefetches run again for every chunk.
+        return queryset.with_entry_counts().select_related(
             'profile_type',
             'program_type',
             'program_year',
-            'bookmarks_from',
-        )
+        ).prefetch_related('issues')
+
+    def should_stream(self, request):
+        version = request.version
+
+        # Version 1 and 2 of the API aren't paginated, so we stream them
+        if version == settings.API_VERSIONS['version_1'] or version == settings.API_VERSIONS['version_2']:
+            return super().should_stream(request)
+
+        return False
 
     def paginate_queryset(self, queryset):
         request = self.request
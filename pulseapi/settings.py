@@ -15,6 +15,7 @@ import environ
 import logging.config
 
 from urllib.parse import quote_plus
+from django.core.exceptions import ImproperlyConfigured
 
 if sys.version_info < (3, 6):
     raise ValueError("Please upgrade to Python 3.6 or later")
@@ -115,13 +116,15 @@ INSTALLED_APPS = list(filter(None, [
     'rest_framework',
     'storages',
     'pulseapi.utility',
-    'pulseapi.entries',
+    'pulseapi.entries.apps.EntriesConfig',  # necessary for signals.py to work
     'pulseapi.tags',
     'pulseapi.issues',
     'pulseapi.helptypes',
     'pulseapi.users.apps.UsersConfig',  # necessary for signals.py to work
     'pulseapi.profiles',
     'pulseapi.creators',
+    'pulseapi.changes.apps.ChangesConfig',  # necessary for signals.py to work
+    'pulseapi.jobs.apps.JobsConfig',  # necessary for jobs.py modules to be found
     # see INTERNAL_IPS for when this actually activates when DEBUG is set:
     'debug_toolbar' if DEBUG is True else None,
 ]))
@@ -253,6 +256,66 @@ if DATABASE_URL is not None:
     DATABASES['default'].update(dj_database_url.config())
 
 
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+#
+# This defaults to a per-process memory cache. Cached API responses are
+# invalidated through the cache itself, which only reaches every worker
+# process if they share the cache, so API responses are only cached when
+# CACHE_URL points at a shared cache (for e.g. memcache://...) unless
+# CACHE_API_RESPONSES says otherwise.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+CACHE_API_RESPONSES = env(
+    'CACHE_API_RESPONSES',
+    cast=bool,
+    default=CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS,
+)
+
+# A single development server can use its own memory cache, but production
+# workers would serve stale responses for each other's changes.
+if CACHE_API_RESPONSES and not DEBUG and CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        'CACHE_API_RESPONSES requires CACHE_URL to point at a cache that is shared by every worker process'
+    )
+
+# How long (in seconds) cached API responses are kept. Cached responses are
+# invalidated as soon as the data they were built from changes, so this
+# timeout only bounds how long unused responses take up space in the cache.
+API_RESPONSE_CACHE_TIMEOUT = env('API_RESPONSE_CACHE_TIMEOUT', cast=int, default=60 * 60)
+
+# How long (in days) all changes are kept in the change feed, see
+# pulseapi/changes/management/commands/prune_changes.py
+CHANGE_FEED_RETENTION_DAYS = env('CHANGE_FEED_RETENTION_DAYS', cast=int, default=30)
+
+# Whether resized versions of uploaded thumbnails are generated,
+# see pulseapi/utility/thumbnails.py
+GENERATE_THUMBNAILS = env('GENERATE_THUMBNAILS', cast=bool, default=True)
+
+# The largest thumbnail (in bytes) that can be uploaded as a multipart
+# file, see pulseapi/utility/uploads.py. This defaults to the limit that
+# the admin forms enforce, see pulseapi/utility/image_validation.py
+MAX_THUMBNAIL_UPLOAD_SIZE = env('MAX_THUMBNAIL_UPLOAD_SIZE', cast=int, default=512 * 1024)
+
+# Background jobs, see pulseapi/jobs/worker.py. The visibility timeout is how
+# long (in seconds) a worker has to finish the jobs it claimed before they are
+# handed to another worker, and failed jobs are retried after the retry delay,
+# doubled for every attempt after the first.
+JOBS_CONCURRENCY = env('JOBS_CONCURRENCY', cast=int, default=2)
+JOBS_VISIBILITY_TIMEOUT = env('JOBS_VISIBILITY_TIMEOUT', cast=int, default=300)
+JOBS_MAX_ATTEMPTS = env('JOBS_MAX_ATTEMPTS', cast=int, default=5)
+JOBS_RETRY_DELAY = env('JOBS_RETRY_DELAY', cast=int, default=30)
+JOBS_POLL_INTERVAL = env('JOBS_POLL_INTERVAL', cast=float, default=1)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/1.10/ref/settings/#auth-password-validators
 
@@ -316,6 +379,17 @@ REST_FRAMEWORK = {
     # For e.g. /api/pulse/entries/ will default to /api/pulse/v1/
     'DEFAULT_VERSION': API_VERSIONS[DEFAULT_VERSION],
     'ALLOWED_VERSIONS': list(API_VERSIONS.values()),
+    # JSON is rendered and parsed with orjson. Swap these for DRF's
+    # JSONRenderer and JSONParser to use the standard library instead.
+    'DEFAULT_RENDERER_CLASSES': (
+        'pulseapi.utility.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'pulseapi.utility.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # CORS settings
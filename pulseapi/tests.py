@@ -12,6 +12,7 @@ from pulseapi.users.factory import BasicEmailUserFactory
 from pulseapi.profiles.factory import BasicUserProfileFactory
 from pulseapi.creators.factory import EntryCreatorFactory
 from pulseapi.entries.factory import EntryFactory
+from pulseapi.jobs.worker import run_pending_jobs
 from pulseapi.versioning import PulseAPIVersioning
 
 from pulseapi.utility.userpermissions import (
@@ -167,6 +168,8 @@ def boostrap(test, name, email, is_moderator=False, is_active=False):
 
     setup_users_with_profiles(test)
     setup_entries(test, creator_users=test.users_with_profiles)
+    # Search vectors and facets are updated by background jobs
+    run_pending_jobs()
 
 
 class PulseMemberTestCase(TestCase):
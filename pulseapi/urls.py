@@ -54,6 +54,7 @@ urlpatterns = [
     url(versioned_api_url('issues/'), include('pulseapi.issues.urls')),
     url(versioned_api_url('helptypes/'), include('pulseapi.helptypes.urls')),
     url(versioned_api_url('creators/'), include('pulseapi.creators.urls')),
+    url(versioned_api_url('changes/'), include('pulseapi.changes.urls')),
 
     # We provide an alternative route on the main `/api/pulse` route to allow
     # getting and editing a user's profile for the currently authenticated user
@@ -0,0 +1,93 @@
+"""
+Cached snapshots of the login status of users.
+
+The frontend asks for the login status of its user on every page load, so
+the parts of it that come from the database (names, profile id, moderator
+flag) are cached per user. A snapshot is only used for sessions whose auth
+hash matches the one it was created for, the same check Django does when it
+loads the user of a session. Snapshots are removed by the signal handlers in
+signals.py whenever a user, their profile or their groups change, which only
+reaches every worker process through a shared cache, so snapshots are only
+used when API responses are cached (see CACHE_API_RESPONSES in settings.py).
+"""
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+USER_STATUS_CACHE_TIMEOUT = 60 * 60
+
+ANONYMOUS_USER_STATUS = {
+    'loggedin': False,
+}
+
+
+def get_user_status_cache_key(user_id):
+    return 'users:status:{user_id}'.format(user_id=user_id)
+
+
+def build_user_status(user):
+    """
+    Return the login status of a user, as served by the userstatus route.
+    Only values that are set are included, and the profile id is a string
+    for backwards-compatibility.
+    """
+    if not user.is_authenticated:
+        return ANONYMOUS_USER_STATUS
+
+    status = {'username': user.name}
+    profile = user.profile
+
+    if profile:
+        status['profileid'] = str(profile.id)
+        if profile.custom_name:
+            status['customname'] = profile.custom_name
+
+    status['email'] = user.email
+    status['loggedin'] = True
+
+    # A user is a moderator if they are in the moderator group
+    # or if they are a superuser, because superusers can do anything.
+    if user.is_superuser or user.groups.filter(name='moderator').exists():
+        status['moderator'] = True
+
+    return status
+
+
+def get_user_status(request):
+    """
+    Return the login status for the user of a request, from the
+    cache if possible, without loading the user from the database.
+    """
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+
+    if user_id is None or session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return ANONYMOUS_USER_STATUS
+
+    if not settings.CACHE_API_RESPONSES:
+        return build_user_status(request.user)
+
+    cache_key = get_user_status_cache_key(user_id)
+    snapshot = cache.get(cache_key)
+
+    if snapshot is not None and constant_time_compare(session.get(HASH_SESSION_KEY, ''), snapshot['session_hash']):
+        return snapshot['status']
+
+    user = request.user
+    status = build_user_status(user)
+
+    if user.is_authenticated:
+        cache.set(cache_key, {
+            'session_hash': user.get_session_auth_hash(),
+            'status': status,
+        }, USER_STATUS_CACHE_TIMEOUT)
+
+    return status
+
+
+def invalidate_user_status(user_ids):
+    """
+    Remove the cached login status of some users
+    """
+    cache.delete_many([get_user_status_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,22 @@
+# Generated by Django 2.2.13 on 2026-10-18 13:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_emailuser_is_active'),
+        # pg_trgm is enabled along with the profile display name index
+        ('profiles', '0026_userprofile_display_name'),
+    ]
+
+    operations = [
+        # Profile name searches also match the name of the profile's user,
+        # with the same case-insensitive lookups as display_name.
+        migrations.RunSQL(
+            'CREATE INDEX users_emailuser_name_trgm '
+            'ON users_emailuser USING gin (UPPER(name) gin_trgm_ops);',
+            'DROP INDEX users_emailuser_name_trgm;',
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.13 on 2026-10-18 16:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_emailuser_name_trgm'),
+    ]
+
+    operations = [
+        # Profile name searches only look at the profile's display name,
+        # which already falls back to the name of the profile's user.
+        migrations.RunSQL(
+            'DROP INDEX users_emailuser_name_trgm;',
+            'CREATE INDEX users_emailuser_name_trgm '
+            'ON users_emailuser USING gin (UPPER(name) gin_trgm_ops);',
+        ),
+    ]
@@ -1,6 +1,8 @@
+from django.contrib.auth.models import Group
 from django.dispatch import receiver
-from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 
+from .cache import invalidate_user_status
 from .models import EmailUser
 from pulseapi.profiles.models import UserProfile
 
@@ -12,3 +14,48 @@ def delete_profile_for_user(sender, **kwargs):
         related_profile = UserProfile.objects.get(id=related_profile_id)
         if related_profile:
             related_profile.delete()
+
+
+@receiver(post_save, sender=EmailUser)
+def update_profile_display_name(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which doesn't affect the name
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+
+    if instance.profile_id:
+        UserProfile.objects.filter(id=instance.profile_id).update_display_names()
+
+
+@receiver(post_save, sender=EmailUser)
+@receiver(post_delete, sender=EmailUser)
+def invalidate_status_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which isn't part of the status
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+
+    invalidate_user_status([instance.id])
+
+
+@receiver(post_save, sender=UserProfile)
+def invalidate_status_on_profile_save(sender, instance, **kwargs):
+    invalidate_user_status(EmailUser.objects.filter(profile=instance).values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=EmailUser.groups.through)
+def invalidate_status_on_group_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # A user was added to or removed from groups
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_user_status([instance.id])
+    elif action in ('post_add', 'post_remove'):
+        # Users were added to or removed from a group
+        invalidate_user_status(pk_set)
+    elif action == 'pre_clear':
+        # All users are about to be removed from a group
+        invalidate_user_status(instance.user_set.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_status_on_group_change(sender, instance, **kwargs):
+    invalidate_user_status(instance.user_set.values_list('id', flat=True))
@@ -1,5 +1,9 @@
 import json
 
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+
 from pulseapi.tests import PulseMemberTestCase
 
 
@@ -49,3 +53,63 @@ class TestUserViews(PulseMemberTestCase):
         self.assertTrue(json_obj['profileid'])
         self.assertEqual(type(json_obj['profileid']), str)
         self.assertEqual(json_obj['username'], 'plain user')
+
+    @override_settings(CACHE_API_RESPONSES=True)
+    def test_user_status_is_cached(self):
+        """
+        Assert that repeated /userstatus calls don't query the database
+        """
+        cache.clear()
+        response = self.client.get('/api/pulse/userstatus/')
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get('/api/pulse/userstatus/')
+
+        self.assertEqual(response.content, cached_response.content)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/pulse/nonce/').status_code, 200)
+
+        self.client.logout()
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/pulse/userstatus/')
+
+        self.assertEqual(response.json(), {'loggedin': False})
+
+    @override_settings(CACHE_API_RESPONSES=True)
+    def test_user_status_follows_changes(self):
+        """
+        Assert that /userstatus reflects changes to the user's
+        profile and groups
+        """
+        self.client.get('/api/pulse/userstatus/')
+        self.assertNotIn('moderator', self.client.get('/api/pulse/userstatus/').json())
+
+        moderators = Group.objects.get(name='moderator')
+        self.user.groups.add(moderators)
+        self.assertTrue(self.client.get('/api/pulse/userstatus/').json()['moderator'])
+
+        moderators.user_set.remove(self.user)
+        self.assertNotIn('moderator', self.client.get('/api/pulse/userstatus/').json())
+
+        profile = self.user.profile
+        profile.custom_name = 'a new name'
+        profile.save()
+        self.assertEqual(self.client.get('/api/pulse/userstatus/').json()['customname'], 'a new name')
+
+        self.user.name = 'another name'
+        self.user.save()
+        self.assertEqual(self.client.get('/api/pulse/userstatus/').json()['username'], 'another name')
+
+    @override_settings(CACHE_API_RESPONSES=True)
+    def test_user_status_of_changed_password(self):
+        """
+        Assert that sessions are logged out when the user's password changes
+        """
+        self.client.get('/api/pulse/userstatus/')
+        self.user.set_password('a new password')
+        self.user.save()
+
+        self.assertFalse(self.client.get('/api/pulse/userstatus/').json()['loggedin'])
+        self.assertEqual(self.client.get('/api/pulse/nonce/').status_code, 403)
@@ -8,12 +8,14 @@ from django.core.exceptions import ValidationError
 from django.http import (HttpResponse, HttpResponseNotFound)
 from django.shortcuts import (redirect, render)
 from django.contrib.auth import login, logout
+from django.middleware.csrf import get_token
 from apiclient.discovery import build
 from rest_framework.decorators import api_view, renderer_classes
-from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from .cache import get_user_status
 from .models import EmailUser
+from pulseapi.utility.renderers import get_json_renderer_class, json_response
 from pulseapi.utility.userpermissions import is_staff_address
 from pulseapi.settings import API_VERSION_LIST
 
@@ -77,13 +79,14 @@ def nonce(request, **kwargs):
     and inform the user what this value is so they can use
     it for signing their POST for a new entry.
     """
-    if not request.user.is_authenticated:
+    if not get_user_status(request)['loggedin']:
         return HttpResponse('Not authorized', status=403)
 
     new_nonce_value(request)
-    return render(request, 'users/nonce.json', {
-        'nonce': request.session['nonce']
-    }, content_type="application/json")
+    return json_response({
+        'nonce': request.session['nonce'],
+        'csrf_token': get_token(request),
+    })
 
 
 # API ROUTE: /userstatus
@@ -95,37 +98,12 @@ def userstatus(request, **kwargs):
     status is "logged in", also include the user name and
     user email. NOTE: these values should never be persistently
     cached by applications, for obvious reasons.
-    """
-    username = False
-    profileid = False
-    customname = False
-    email = False
-
-    user = request.user
-    loggedin = user.is_authenticated
 
-    # A user is a moderator if they are in the moderator group
-    # or if they are a superuser, because superusers can do anything.
-    moderator = user.groups.filter(name='moderator')
-    is_moderator = len(moderator) > 0
-
-    if is_moderator is False:
-        is_moderator = user.is_superuser
-
-    if loggedin:
-        username = user.name
-        profileid = user.profile.id
-        customname = user.profile.custom_name
-        email = user.email
-
-    return render(request, 'users/userstatus.json', {
-        'username': username,
-        'profileid': profileid,
-        'customname': customname,
-        'email': email,
-        'loggedin': loggedin,
-        'moderator': is_moderator,
-    }, content_type="application/json")
+    The status comes from a snapshot that is cached for the
+    session's user (see cache.py), so this usually doesn't
+    need to query the database at all.
+    """
+    return json_response(get_user_status(request))
 
 
 # API ROUTE: /
@@ -285,7 +263,7 @@ def callback(request, **kwargs):
 # We include kwargs here to capture the version parameter from the url (whatever it may be named as) even though we do
 # not use it inside this function. To access the version inside this function, we use request.version.
 @api_view()
-@renderer_classes((JSONRenderer,))
+@renderer_classes((get_json_renderer_class(),))
 def api_status(request, **kwargs):
     """
     Check whether the API is alive and running by returning some
@@ -0,0 +1,64 @@
+"""
+Conditional GET support for the detail routes of versioned objects.
+
+Entries and profiles have a `modified` timestamp that is bumped whenever
+anything in their responses changes, so an ETag can be computed from that
+timestamp alone. Clients that send the ETag back in `If-None-Match` get a
+304 without the object being loaded or serialized at all.
+"""
+import hashlib
+
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+def get_etag(request, modified):
+    """
+    Return the ETag of the response to a request for an object that was
+    last modified at `modified`. Responses include values that depend on
+    the logged in user (like `is_bookmarked`), so the session's user and
+    auth hash are part of the ETag, as well as the url, which includes
+    the API version.
+    """
+    session = request.session
+    version = '\n'.join((
+        request.get_full_path(),
+        modified.isoformat(),
+        str(session.get(SESSION_KEY, '')),
+        session.get(HASH_SESSION_KEY, ''),
+    ))
+
+    return quote_etag(hashlib.sha1(version.encode()).hexdigest())
+
+
+class ConditionalRetrieveMixin:
+    """
+    A mixin for RetrieveAPIViews that adds an ETag to responses and answers
+    matching If-None-Match requests with a 304. Views have to implement
+    get_modified(), which should look up the `modified` timestamp of the
+    requested object with a single query, and return None if there is no
+    such object.
+    """
+    def perform_authentication(self, request):
+        # The ETag only needs the session, so the user is loaded
+        # lazily, the first time the view needs `request.user`.
+        pass
+
+    def get_modified(self):
+        raise NotImplementedError('get_modified() must be implemented')
+
+    def retrieve(self, request, *args, **kwargs):
+        modified = self.get_modified()
+
+        if modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = get_etag(request, modified)
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        return response
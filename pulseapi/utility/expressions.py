@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class SubqueryCount(models.Subquery):
+    """
+    Count the rows returned by a queryset that references the outer
+    query through OuterRef, e.g. to annotate related object counts
+    without joining (and grouping by) the related tables.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = models.IntegerField()
+
+
+class TransactionId(models.Func):
+    """
+    The id of the current transaction, which is assigned one if it
+    didn't write anything yet
+    """
+    function = 'txid_current'
+    output_field = models.BigIntegerField()
+
+
+class AssignedTransactionId(models.Func):
+    """
+    The id of the current transaction, or NULL if it wasn't assigned one
+    """
+    function = 'txid_current_if_assigned'
+    output_field = models.BigIntegerField()
+
+
+class OldestRunningTransactionId(models.Func):
+    """
+    The id of the oldest transaction that is still running. Transactions
+    with lower ids are all either committed or rolled back.
+    """
+    template = 'txid_snapshot_xmin(txid_current_snapshot())'
+    output_field = models.BigIntegerField()
@@ -0,0 +1,9 @@
+from django.apps import apps
+
+from pulseapi.jobs.registry import register
+from pulseapi.utility.thumbnails import update_thumbnails
+
+
+@register('thumbnails.update')
+def update_thumbnails_job(model, pk):
+    update_thumbnails(apps.get_model(model), pk)
@@ -0,0 +1,218 @@
+"""
+Report the API queries that can't be served by an index.
+
+Like run_benchmarks, this seeds a throwaway test database and requests the
+public API routes, and then runs EXPLAIN on every query they ran. Sequential
+scans are discouraged for the EXPLAIN (with `enable_seqscan = off`), so that
+Postgres picks an index whenever one could serve the query, however small
+the tables are. Any sequential scan that is left means that no index can
+serve that part of the query.
+"""
+import json
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from pulseapi.utility.management.commands.run_benchmarks import (
+    BENCHMARK_CACHES,
+    clear_cache,
+    get_busiest_profile_id,
+    get_routes,
+    seed_data,
+    versioned,
+)
+
+# Lookup tables with a handful of rows, which are always read in full
+IGNORED_TABLES = (
+    'entries_moderationstate',
+    'helptypes_helptype',
+    'issues_issue',
+    'profiles_profiletype',
+    'profiles_programtype',
+    'profiles_programyear',
+)
+
+
+def get_filter_routes():
+    """
+    Return the entry listing variants that filter or order entries
+    in ways that the benchmark routes don't.
+    """
+    from pulseapi.issues.models import Issue
+    from pulseapi.tags.models import Tag
+
+    entries_url = versioned('entries-list', 'version_3')
+    tag = Tag.objects.order_by('id').values_list('name', flat=True).first()
+    issue = Issue.objects.order_by('id').values_list('name', flat=True).first()
+
+    return [
+        ('entries-featured', entries_url + '?featured=True'),
+        ('entries-by-tag', '{url}?tag={tag}'.format(url=entries_url, tag=tag)),
+        ('entries-by-issue', '{url}?issue={issue}'.format(url=entries_url, issue=issue)),
+        ('entries-by-created', entries_url + '?cursor=&ordering=-created'),
+        ('projects', versioned('project-entries', 'version_3')),
+        ('bookmarks', versioned('user-bookmarks', 'version_3')),
+    ]
+
+
+def get_seq_scans(plan, scans=None):
+    """
+    Return the names of the tables that are read with a sequential
+    scan anywhere in an EXPLAIN (FORMAT JSON) plan
+    """
+    scans = [] if scans is None else scans
+
+    if plan.get('Node Type') == 'Seq Scan':
+        scans.append(plan['Relation Name'])
+
+    for subplan in plan.get('Plans', ()):
+        get_seq_scans(subplan, scans)
+
+    return scans
+
+
+def explain_seq_scans(sql):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return get_seq_scans(plan[0]['Plan'])
+
+
+def get_route_seq_scans(client, url):
+    """
+    Request a url and return a dictionary of {table name: [queries]}
+    for the tables that its queries scan sequentially
+    """
+    reset_queries()
+    clear_cache()
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+        getattr(response, 'getvalue', lambda: response.content)()
+
+    queries = [query['sql'] for query in context.captured_queries]
+
+    if response.status_code != 200:
+        raise CommandError('{url} responded with a {status}'.format(url=url, status=response.status_code))
+
+    seq_scans = defaultdict(list)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SET enable_seqscan = off')
+
+    try:
+        for sql in queries:
+            if not sql.lstrip().upper().startswith('SELECT'):
+                continue
+
+            for table in explain_seq_scans(sql):
+                if table not in IGNORED_TABLES and sql not in seq_scans[table]:
+                    seq_scans[table].append(sql)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = on')
+
+    return seq_scans
+
+
+class Command(BaseCommand):
+    help = 'Report the API queries that still read tables with sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            action='store',
+            type=int,
+            default=1234,
+            dest='seed',
+            help='A seed value for generating the dataset. Default: 1234'
+        )
+
+        parser.add_argument(
+            '-s',
+            '--scale',
+            action='store',
+            type=int,
+            default=1,
+            dest='scale',
+            help='How large the dataset should be. Each step adds 60 profiles and 200 entries. Default: 1'
+        )
+
+        parser.add_argument(
+            '--queries',
+            action='store_true',
+            dest='queries',
+            help='Print the queries that use sequential scans'
+        )
+
+        parser.add_argument(
+            '--fail',
+            action='store_true',
+            dest='fail',
+            help='Exit with an error if any query uses a sequential scan'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, CACHE_API_RESPONSES=True, GENERATE_THUMBNAILS=False):
+                report = self.report_seq_scans(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if not report:
+            self.stdout.write(self.style.SUCCESS('No API query uses a sequential scan'))
+            return
+
+        if options['fail']:
+            raise CommandError('Sequential scans in: {}'.format(', '.join(report)))
+
+    def report_seq_scans(self, options):
+        from pulseapi.users.models import EmailUser
+
+        self.stdout.write('Seeding the dataset with seed {}'.format(options['seed']))
+        seed_data(options['seed'], options['scale'])
+
+        # Requests are made as the user with the most bookmarks, so
+        # that the per-user parts of the responses are covered too.
+        client = Client()
+        client.force_login(EmailUser.objects.annotate(
+            bookmark_count=Count('profile__bookmarks_from'),
+        ).order_by('-bookmark_count', 'id')[0])
+        report = {}
+
+        for name, url in get_routes(get_busiest_profile_id()) + get_filter_routes():
+            seq_scans = get_route_seq_scans(client, url)
+
+            if not seq_scans:
+                self.stdout.write('{name:<24} ok'.format(name=name))
+                continue
+
+            report[name] = seq_scans
+            self.stdout.write(self.style.WARNING('{name:<24} {tables}'.format(
+                name=name,
+                tables=', '.join(sorted(seq_scans)),
+            )))
+
+            if options['queries']:
+                for table, queries in sorted(seq_scans.items()):
+                    for sql in queries:
+                        self.stdout.write('    {table}: {sql}'.format(table=table, sql=sql))
+
+        return report
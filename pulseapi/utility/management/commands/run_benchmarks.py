@@ -0,0 +1,451 @@
+"""
+Benchmark the public API routes against a large, deterministic dataset.
+
+The benchmarks run against a throwaway test database, so the data in your
+development database is left untouched. For every route we record the number
+of queries it runs, its p50/p95 latency and the peak memory allocated while
+handling it. Query counts are compared against the budgets recorded in
+`pulseapi/utility/benchmark_budgets.json`, and the run fails if any route
+goes over its budget.
+
+We also time encoding and decoding the responses of the largest routes with
+the configured JSON renderer and parser, compared to DRF's stdlib versions.
+"""
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, reset_queries, transaction
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from factory.random import reseed_random
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from pulseapi.jobs.worker import run_pending_jobs
+from pulseapi.utility.renderers import get_json_parser, get_json_renderer
+
+BUDGETS_PATH = os.path.join(settings.BASE_DIR, 'pulseapi', 'utility', 'benchmark_budgets.json')
+
+# Benchmarks use their own cache, which is cleared before every request so
+# that we measure the work done to build a response rather than a cache lookup.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pulseapi-benchmarks',
+    },
+}
+
+# The routes whose responses are used for the JSON encoding benchmarks
+JSON_BENCHMARK_ROUTES = ('entries', 'profiles-v1')
+
+
+def versioned(name, version, **kwargs):
+    # Versioned routes can't be reversed with both the version and
+    # keyword arguments, so we add the version to the unversioned url.
+    url = reverse(name, kwargs=kwargs or None)
+    return url.replace('/api/pulse/', '/api/pulse/{}/'.format(settings.API_VERSIONS[version]), 1)
+
+
+def get_routes(profile_id):
+    """
+    Return a list of (name, url) tuples for every route we benchmark.
+    """
+    return [
+        ('entries', versioned('entries-list', 'version_3') + '?page_size=50'),
+        ('entries-cursor', versioned('entries-list', 'version_3') + '?cursor=&page_size=50'),
+        ('entries-v1', versioned('entries-list', 'version_1') + '?page_size=50'),
+        ('entries-compact', versioned('entries-list', 'version_3') + '?view=compact&page_size=50'),
+        ('entries-facets', versioned('entries-facets', 'version_3')),
+        ('profiles-v1', versioned('profile_list', 'version_1') + '?is_active=True'),
+        ('profiles-v2', versioned('profile_list', 'version_2') + '?is_active=True'),
+        ('profiles-v3', versioned('profile_list', 'version_3') + '?is_active=True&page_size=50'),
+        ('profile-entries', '{url}?created&published&favorited'.format(
+            url=versioned('profile-entries', 'version_3', pk=profile_id),
+        )),
+        ('profile-entries-v1', '{url}?created&published&favorited'.format(
+            url=versioned('profile-entries', 'version_1', pk=profile_id),
+        )),
+        ('profile-entries-counts', versioned('profile-entries', 'version_3', pk=profile_id)),
+        ('creators', versioned('creators-list', 'version_1')),
+        ('creators-by-name', versioned('creators-list', 'version_1') + '?name=a'),
+        ('rss-latest', '/rss/latest'),
+        ('rss-featured', '/rss/featured'),
+        ('atom-latest', '/atom/latest'),
+        ('atom-featured', '/atom/featured'),
+    ]
+
+
+def percentile(values, percent):
+    """
+    Return the nearest-rank percentile of a list of numbers
+    """
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def create_ignoring_duplicates(factory_class, **kwargs):
+    # Factories generate random emails and pick profiles in a round-robin
+    # fashion, so they can run into unique constraints on large datasets.
+    try:
+        with transaction.atomic():
+            return factory_class.create(**kwargs)
+    except IntegrityError:
+        return None
+
+
+def seed_data(seed, scale):
+    """
+    Populate the database with a deterministic dataset whose size
+    grows linearly with `scale`.
+    """
+    # The factories query the database when they are imported,
+    # so we only import them once the test database is set up.
+    from pulseapi.creators.factory import EntryCreatorFactory
+    from pulseapi.entries.factory import BasicEntryFactory
+    from pulseapi.entries.models import Entry
+    from pulseapi.profiles.factory import ExtendedUserProfileFactory, UserBookmarksFactory
+    from pulseapi.tags.factory import TagFactory
+    from pulseapi.users.factory import BasicEmailUserFactory
+
+    random.seed(seed)
+    reseed_random(seed)
+
+    for i in range(6):
+        create_ignoring_duplicates(TagFactory)
+
+    for i in range(50 * scale):
+        create_ignoring_duplicates(BasicEmailUserFactory, active=True)
+
+    for i in range(10 * scale):
+        create_ignoring_duplicates(BasicEmailUserFactory, active=True, profile=ExtendedUserProfileFactory())
+
+    entries = [BasicEntryFactory.create() for i in range(200 * scale)]
+
+    for entry in entries:
+        for i in range(random.randint(0, 3)):
+            create_ignoring_duplicates(EntryCreatorFactory, entry=entry)
+
+        if entry.is_approved():
+            for i in range(random.randint(0, 5)):
+                create_ignoring_duplicates(UserBookmarksFactory, entry=entry)
+
+    # Make sure some entries show up in the featured feeds
+    featured_entries = Entry.objects.filter(id__in=[entry.id for entry in entries[::10]])
+    featured_entries.update(featured=True)
+    featured_entries.update_facets()
+
+    # Search vectors and facets are updated by background jobs
+    run_pending_jobs()
+
+
+def get_dataset_summary():
+    from pulseapi.creators.models import EntryCreator
+    from pulseapi.entries.models import Entry
+    from pulseapi.profiles.models import UserBookmarks, UserProfile
+
+    return {
+        'entries': Entry.objects.count(),
+        'public_entries': Entry.objects.public().count(),
+        'profiles': UserProfile.objects.count(),
+        'creators': EntryCreator.objects.count(),
+        'bookmarks': UserBookmarks.objects.count(),
+    }
+
+
+def get_busiest_profile_id():
+    """
+    Return the id of the profile that created the most public entries, among
+    those that also published and bookmarked some, so that the profile
+    entries benchmarks have plenty of data to serialize, and serialize every
+    kind of related entry whatever the seeded data turns out to be.
+    """
+    from pulseapi.entries.models import Entry
+    from pulseapi.profiles.models import UserProfile
+
+    public_entries = Entry.objects.public()
+
+    return UserProfile.objects.annotate(
+        created_count=Count(
+            'related_entry_creators',
+            filter=Q(related_entry_creators__entry__in=public_entries),
+            distinct=True,
+        ),
+        published_count=Count(
+            'related_user__entries',
+            filter=Q(related_user__entries__in=public_entries),
+            distinct=True,
+        ),
+        bookmark_count=Count(
+            'bookmarks_from',
+            filter=Q(bookmarks_from__entry__in=public_entries),
+            distinct=True,
+        ),
+    ).filter(
+        created_count__gt=0,
+        published_count__gt=0,
+        bookmark_count__gt=0,
+    ).order_by('-created_count', 'id').values_list('id', flat=True)[0]
+
+
+def request(client, url):
+    response = client.get(url)
+    # Streaming responses only do their work as their content is consumed
+    content = response.getvalue()
+    return response, content
+
+
+def clear_cache():
+    from pulseapi.entries.models import moderation_states
+
+    cache.clear()
+    # Unlike responses, moderation state ids stay cached for as long as the
+    # states don't change, so they are no part of the work a request does.
+    moderation_states.load()
+
+
+def benchmark_route(client, url, iterations):
+    # Start from an empty query log, since a full one would hide the
+    # queries run by the request from CaptureQueriesContext.
+    reset_queries()
+    clear_cache()
+    with CaptureQueriesContext(connection) as context:
+        response, content = request(client, url)
+
+    # The query log is reset by every following request
+    query_count = len(context.captured_queries)
+
+    if response.status_code != 200:
+        raise CommandError('{url} responded with a {status}'.format(url=url, status=response.status_code))
+
+    timings = []
+    for i in range(iterations):
+        clear_cache()
+        start = time.perf_counter()
+        request(client, url)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    clear_cache()
+    tracemalloc.start()
+    request(client, url)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'url': url,
+        'queries': query_count,
+        'response_bytes': len(content),
+        'latency_ms': {
+            'p50': round(percentile(timings, 50), 2),
+            'p95': round(percentile(timings, 95), 2),
+            'max': round(max(timings), 2),
+        },
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+    }
+
+
+def time_calls(function, iterations):
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'p50': round(percentile(timings, 50), 3),
+        'p95': round(percentile(timings, 95), 3),
+    }
+
+
+def benchmark_json(content, iterations):
+    """
+    Time encoding and decoding a response's JSON with DRF's renderer
+    and parser, and with the ones configured in REST_FRAMEWORK.
+    """
+    data = json.loads(content)
+    implementations = {
+        'stdlib': (JSONRenderer(), JSONParser()),
+        'configured': (get_json_renderer(), get_json_parser()),
+    }
+    result = {'bytes': len(content)}
+
+    for name, (renderer, parser) in implementations.items():
+        result[name] = {
+            'renderer': type(renderer).__name__,
+            'parser': type(parser).__name__,
+            'encode_ms': time_calls(lambda: renderer.render(data), iterations),
+            'decode_ms': time_calls(lambda: parser.parse(io.BytesIO(content)), iterations),
+        }
+
+    return result
+
+
+def load_budgets(path):
+    if not os.path.isfile(path):
+        return {}
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark query counts, latency and memory use of the public API routes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            action='store',
+            type=int,
+            default=1234,
+            dest='seed',
+            help='A seed value for generating the benchmark dataset. Default: 1234'
+        )
+
+        parser.add_argument(
+            '-s',
+            '--scale',
+            action='store',
+            type=int,
+            default=5,
+            dest='scale',
+            help='How large the dataset should be. Each step adds 60 profiles and 200 entries. Default: 5'
+        )
+
+        parser.add_argument(
+            '-i',
+            '--iterations',
+            action='store',
+            type=int,
+            default=20,
+            dest='iterations',
+            help='The number of timed requests per route. Default: 20'
+        )
+
+        parser.add_argument(
+            '-o',
+            '--output',
+            action='store',
+            default='benchmark-report.json',
+            dest='output',
+            help='Where to write the JSON report. Default: benchmark-report.json'
+        )
+
+        parser.add_argument(
+            '--budgets',
+            action='store',
+            default=BUDGETS_PATH,
+            dest='budgets',
+            help='The JSON file with the query budget of every route'
+        )
+
+        parser.add_argument(
+            '--update-budgets',
+            action='store_true',
+            dest='update_budgets',
+            help='Record the measured query counts as the new budgets instead of checking them'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES, CACHE_API_RESPONSES=True, GENERATE_THUMBNAILS=False):
+                report = self.run_benchmarks(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write('Report written to {}'.format(options['output']))
+
+        if options['update_budgets']:
+            budgets = {name: result['queries'] for name, result in report['routes'].items()}
+            with open(options['budgets'], 'w') as f:
+                json.dump(budgets, f, indent=2, sort_keys=True)
+                f.write('\n')
+
+            self.stdout.write(self.style.SUCCESS('Query budgets updated in {}'.format(options['budgets'])))
+            return
+
+        if report['regressions']:
+            raise CommandError('Query budgets exceeded: {}'.format(', '.join(report['regressions'])))
+
+        self.stdout.write(self.style.SUCCESS('All routes are within their query budgets'))
+
+    def run_benchmarks(self, options):
+        self.stdout.write('Seeding the benchmark dataset with seed {}'.format(options['seed']))
+        seed_data(options['seed'], options['scale'])
+
+        budgets = load_budgets(options['budgets'])
+        client = Client()
+        routes = {}
+        regressions = []
+
+        json_benchmarks = {}
+
+        for name, url in get_routes(get_busiest_profile_id()):
+            result = benchmark_route(client, url, options['iterations'])
+            budget = budgets.get(name)
+            result['query_budget'] = budget
+            routes[name] = result
+
+            line = '{name:<24} {queries:>4} queries  p50 {p50:>8.2f}ms  p95 {p95:>8.2f}ms  {memory:>10.1f}KB'.format(
+                name=name,
+                queries=result['queries'],
+                p50=result['latency_ms']['p50'],
+                p95=result['latency_ms']['p95'],
+                memory=result['peak_memory_kb'],
+            )
+
+            if budget is not None and result['queries'] > budget:
+                regressions.append('{name} ({queries} > {budget})'.format(
+                    name=name,
+                    queries=result['queries'],
+                    budget=budget,
+                ))
+                line = self.style.ERROR(line)
+
+            self.stdout.write(line)
+
+            if name in JSON_BENCHMARK_ROUTES:
+                response, content = request(client, url)
+                json_benchmarks[name] = benchmark_json(content, options['iterations'])
+
+        for name, result in json_benchmarks.items():
+            self.stdout.write(
+                '{name:<24} JSON encode p50 {stdlib_encode:>7.3f}ms -> {encode:>7.3f}ms  '
+                'decode p50 {stdlib_decode:>7.3f}ms -> {decode:>7.3f}ms'.format(
+                    name=name,
+                    stdlib_encode=result['stdlib']['encode_ms']['p50'],
+                    encode=result['configured']['encode_ms']['p50'],
+                    stdlib_decode=result['stdlib']['decode_ms']['p50'],
+                    decode=result['configured']['decode_ms']['p50'],
+                )
+            )
+
+        return {
+            'seed': options['seed'],
+            'scale': options['scale'],
+            'iterations': options['iterations'],
+            'dataset': get_dataset_summary(),
+            'routes': routes,
+            'json': json_benchmarks,
+            'regressions': regressions,
+        }
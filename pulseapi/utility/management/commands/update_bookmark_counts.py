@@ -0,0 +1,18 @@
+"""
+Recompute the denormalized bookmark count of every entry from the bookmarks table.
+"""
+from django.core.management.base import BaseCommand
+
+from pulseapi.entries.models import Entry
+
+
+class Command(BaseCommand):
+    help = 'Recompute the bookmark_count of all entries'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Recomputing entry bookmark counts')
+
+        updated = Entry.objects.all().update_bookmark_counts()
+
+        self.stdout.write(f'Updated {updated} entries')
+        self.stdout.write(self.style.SUCCESS('Done!'))
@@ -0,0 +1,18 @@
+"""
+Rebuild the materialized facets of every entry from the entries and their relations.
+"""
+from django.core.management.base import BaseCommand
+
+from pulseapi.entries.models import Entry, EntryFacet
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the EntryFacet rows of all entries'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding entry facets')
+
+        Entry.objects.all().update_facets()
+
+        self.stdout.write(f'Created {EntryFacet.objects.count()} facets')
+        self.stdout.write(self.style.SUCCESS('Done!'))
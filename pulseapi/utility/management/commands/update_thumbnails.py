@@ -0,0 +1,30 @@
+"""
+Generate the resized versions of entry and profile thumbnails that are missing
+or were made from a previous thumbnail.
+"""
+from django.core.management.base import BaseCommand
+
+from pulseapi.entries.models import Entry
+from pulseapi.profiles.models import UserProfile
+from pulseapi.utility.thumbnails import update_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generate the missing resized versions of entry and profile thumbnails'
+
+    def handle(self, *args, **options):
+        for model in (Entry, UserProfile):
+            outdated = [
+                pk for pk, thumbnail, thumbnails in model.objects.values_list('pk', 'thumbnail', 'thumbnails')
+                if (thumbnail or '') != (thumbnails or {}).get('source', '')
+            ]
+
+            self.stdout.write('Updating the thumbnails of {count} {name}'.format(
+                count=len(outdated),
+                name=model._meta.verbose_name_plural,
+            ))
+
+            for pk in outdated:
+                update_thumbnails(model, pk)
+
+        self.stdout.write(self.style.SUCCESS('Done!'))
@@ -0,0 +1,131 @@
+"""
+JSON rendering and parsing with orjson.
+
+These are drop-in replacements for DRF's JSONRenderer and JSONParser, and
+are enabled through DEFAULT_RENDERER_CLASSES and DEFAULT_PARSER_CLASSES in
+the REST_FRAMEWORK settings. Views that only take or return JSON use the
+JSON classes from those settings too, see `get_json_parser_class` and
+`get_json_renderer_class`. They produce the same JSON as the DRF classes,
+including the representation of datetimes, but encode and decode large
+payloads a lot faster.
+"""
+import codecs
+
+import orjson
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.http import HttpResponse
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = (
+    # DRF formats datetimes differently from orjson, see `default`
+    orjson.OPT_PASSTHROUGH_DATETIME |
+    orjson.OPT_NON_STR_KEYS
+)
+
+fallback_encoder = JSONEncoder()
+
+
+def default(obj):
+    """
+    Encode the values that orjson doesn't know about
+    """
+    if isinstance(obj, FieldFile):
+        return obj.url if obj else None
+
+    if isinstance(obj, Promise):
+        # Lazy translation strings
+        return force_str(obj)
+
+    # Datetimes, decimals, querysets, etc. are encoded the way DRF does
+    return fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders JSON with orjson. Responses can still be pretty-printed, with
+    `?indent=` in the accepted media type, by falling back to DRF.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+        # We always fully escape \u2028 and \u2029, like DRF does,
+        # to ensure we output JSON that is a strict javascript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with orjson.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+
+            if codecs.lookup(encoding).name != 'utf-8':
+                data = data.decode(encoding)
+
+            return orjson.loads(data)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+def get_json_renderer_class():
+    """
+    Return the first JSON renderer in DEFAULT_RENDERER_CLASSES, for views
+    that only render JSON and for JSON responses outside of DRF views.
+    """
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if issubclass(renderer_class, JSONRenderer):
+            return renderer_class
+
+    return JSONRenderer
+
+
+def get_json_parser_class():
+    """
+    Return the first JSON parser in DEFAULT_PARSER_CLASSES,
+    for views that only accept JSON
+    """
+    for parser_class in api_settings.DEFAULT_PARSER_CLASSES:
+        if issubclass(parser_class, JSONParser):
+            return parser_class
+
+    return JSONParser
+
+
+def get_json_renderer():
+    return get_json_renderer_class()()
+
+
+def get_json_parser():
+    return get_json_parser_class()()
+
+
+def json_response(data, status=200):
+    """
+    Return an HttpResponse with `data` rendered by the configured JSON renderer
+    """
+    renderer = get_json_renderer()
+
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from pulseapi.utility.thumbnails import get_thumbnail_urls
+
+
+class ThumbnailsField(serializers.Field):
+    """
+    A read-only field for the resized versions of an object's thumbnail,
+    as a dictionary of {width: {width, height, jpeg url, webp url}}
+    """
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        return get_thumbnail_urls(instance.thumbnail, instance.thumbnails)
@@ -1,10 +1,18 @@
 """
 Provide RSS and Atom feeds for Pulse.
 """
+import hashlib
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
 from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
 
-from pulseapi import settings
+from pulseapi.entries.cache import get_feed_cache_key
 from pulseapi.entries.models import Entry
 
 
@@ -21,8 +29,63 @@ def get_entry_creators(entry):
         return entry.published_by.name
 
 
+class CachedFeed(Feed):
+    """
+    A feed that supports conditional GET requests without being rendered:
+    its ETag and Last-Modified are derived from the entries in the feed with
+    a single query, so feed readers polling for updates get a 304 right away.
+
+    Entries are touched whenever something that ends up in a feed changes
+    (e.g. the names of their creators, or their tags), so the feed changes
+    when the set of entries in it or the last time one of them was modified
+    changes. When API responses are cached, rendered feeds are cached for
+    their ETag, so that unrelated changes don't get them rendered again.
+    """
+    def __call__(self, request, *args, **kwargs):
+        validators = self.get_validators()
+
+        def render(request, *args, **kwargs):
+            return self.get_feed_response(request, validators['etag'], *args, **kwargs)
+
+        return condition(
+            etag_func=lambda request, *args, **kwargs: validators['etag'],
+            last_modified_func=lambda request, *args, **kwargs: validators['last_modified'],
+        )(render)(request, *args, **kwargs)
+
+    def get_validators(self):
+        feed_state = self.items().aggregate(ids=ArrayAgg('id'), last_modified=Max('modified'))
+        last_modified = feed_state['last_modified']
+        raw_etag = '{ids}|{last_modified}'.format(
+            ids=','.join(str(entry_id) for entry_id in sorted(feed_state['ids'] or [])),
+            last_modified=last_modified.isoformat() if last_modified else '',
+        )
+
+        return {
+            'etag': hashlib.md5(raw_etag.encode('utf-8')).hexdigest(),
+            'last_modified': last_modified,
+        }
+
+    def get_feed_response(self, request, etag, *args, **kwargs):
+        feed_key = get_feed_cache_key(type(self).__name__, request, etag)
+        feed = cache.get(feed_key) if settings.CACHE_API_RESPONSES else None
+
+        if feed is None:
+            rendered = super().__call__(request, *args, **kwargs)
+            feed = {
+                'content': rendered.content,
+                'content_type': rendered['Content-Type'],
+            }
+
+            if settings.CACHE_API_RESPONSES:
+                cache.set(feed_key, feed, settings.API_RESPONSE_CACHE_TIMEOUT)
+
+        # Feed sets Last-Modified to the time the latest entry was created,
+        # which is left to our own validators instead.
+        return HttpResponse(feed['content'], content_type=feed['content_type'])
+
+
 # Generic class for RSS feeds
-class RSSFeedFromPulse(Feed):
+class RSSFeedFromPulse(CachedFeed):
     def item_author_name(self, entry):
         return get_entry_creators(entry)
 
@@ -53,7 +116,7 @@ class RSSFeedFromPulse(Feed):
         return entry.frontend_entry_url()
 
     def item_categories(self, entry):
-        return list(entry.tags.values_list('name', flat=True)) + list(entry.issues.values_list('name', flat=True))
+        return [tag.name for tag in entry.tags.all()] + [issue.name for issue in entry.issues.all()]
 
 
 # RSS feed for latest entries
@@ -73,7 +136,7 @@ class RSSFeedFeaturedFromPulse(RSSFeedFromPulse):
     description = 'Subscribe to get the latest featured entries from Mozilla Pulse.'
 
     def items(self):
-        return Entry.objects.filter(featured=True).order_by('-created')[:20]
+        return Entry.objects.filter(featured=True).with_related().order_by('-created')[:20]
 
 
 # Atom feed for latest entries
@@ -0,0 +1,102 @@
+from django.urls import reverse
+
+from pulseapi.creators.models import EntryCreator
+from pulseapi.profiles.models import UserBookmarks
+from pulseapi.profiles.factory import BasicUserProfileFactory
+from pulseapi.tests import PulseMemberTestCase
+
+
+class TestConditionalRetrieve(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        self.entry = self.entries[0]
+        self.entry_url = reverse('entry', kwargs={'pk': self.entry.id})
+        self.profile = self.users_with_profiles[0].profile
+        self.profile_url = reverse('profile', kwargs={'pk': self.profile.id})
+
+    def assert_not_modified(self, url, etag):
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def assert_modified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_unchanged_entry(self):
+        """
+        Make sure unchanged entries are answered with a 304 from one query
+        """
+        etag = self.client.get(self.entry_url)['ETag']
+        self.assert_not_modified(self.entry_url, etag)
+
+        # The ETag depends on the API version and on the user
+        v1_url = reverse('entry', args=['v1/', self.entry.id])
+        self.assertEqual(self.client.get(v1_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.entry_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_entry_changes(self):
+        """
+        Make sure entries get a new ETag when they or their relations change
+        """
+        etag = self.client.get(self.entry_url)['ETag']
+
+        self.entry.title = 'a brand new title'
+        self.entry.save()
+        etag = self.assert_modified(self.entry_url, etag)
+
+        self.entry.tags.create(name='a brand new tag')
+        etag = self.assert_modified(self.entry_url, etag)
+
+        EntryCreator.objects.create(entry=self.entry, profile=BasicUserProfileFactory())
+        etag = self.assert_modified(self.entry_url, etag)
+
+        UserBookmarks.objects.toggle_bookmark(self.user.profile, self.entry.id)
+        etag = self.assert_modified(self.entry_url, etag)
+
+        UserBookmarks.objects.toggle_bookmark(self.user.profile, self.entry.id)
+        self.assert_modified(self.entry_url, etag)
+
+    def test_unchanged_profile(self):
+        """
+        Make sure unchanged profiles are answered with a 304 from one query
+        """
+        etag = self.client.get(self.profile_url)['ETag']
+        self.assert_not_modified(self.profile_url, etag)
+
+    def test_profile_changes(self):
+        """
+        Make sure profiles get a new ETag when they, their user
+        or the entries that they are listed with change
+        """
+        etag = self.client.get(self.profile_url)['ETag']
+
+        self.profile.location = 'Springfield, IL'
+        self.profile.save()
+        etag = self.assert_modified(self.profile_url, etag)
+
+        user = self.profile.user
+        user.name = 'a brand new name'
+        user.save()
+        etag = self.assert_modified(self.profile_url, etag)
+
+        entry = EntryCreator.objects.filter(profile=self.profile).first().entry
+        entry.title = 'a brand new title'
+        entry.save()
+        etag = self.assert_modified(self.profile_url, etag)
+
+        UserBookmarks.objects.bookmark_entries(self.profile, [entry.id])
+        self.assert_modified(self.profile_url, etag)
+
+    def test_missing_objects(self):
+        """
+        Make sure missing objects still respond with a 404
+        """
+        response = self.client.get(reverse('entry', kwargs={'pk': 0}), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
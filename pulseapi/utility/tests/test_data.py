@@ -4,10 +4,13 @@ from django.test import TestCase
 from django.core.management import call_command
 
 from pulseapi.entries.models import Entry
+from pulseapi.entries.factory import EntryFactory
 from pulseapi.creators.models import EntryCreator
 from pulseapi.profiles.models import UserBookmarks, UserProfile
+from pulseapi.profiles.factory import BasicUserProfileFactory
 from pulseapi.tags.models import Tag
 from pulseapi.users.models import EmailUser
+from pulseapi.users.factory import BasicEmailUserFactory
 
 models = [
     EntryCreator,
@@ -41,3 +44,25 @@ class TestFlushData(TestCase):
 
         for m in models:
             self.assertFalse(m.objects.all())
+
+
+class TestUpdateBookmarkCounts(TestCase):
+
+    def test_bookmark_counts_are_recomputed(self):
+        profiles = [BasicUserProfileFactory() for i in range(3)]
+        BasicEmailUserFactory(profile=profiles[0])
+        entries = [EntryFactory() for i in range(3)]
+
+        for count, entry in enumerate(entries):
+            for profile in profiles[:count]:
+                UserBookmarks.objects.create(entry=entry, profile=profile)
+
+        Entry.objects.update(bookmark_count=0)
+
+        call_command("update_bookmark_counts", stdout=out)
+
+        self.assertIn('Done!', out.getvalue())
+
+        for count, entry in enumerate(entries):
+            entry.refresh_from_db()
+            self.assertEqual(entry.bookmark_count, count)
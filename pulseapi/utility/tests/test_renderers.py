@@ -0,0 +1,121 @@
+import io
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from pulseapi.entries.models import Entry
+from pulseapi.tests import PulseMemberTestCase
+from pulseapi.utility.renderers import (
+    ORJSONParser,
+    ORJSONRenderer,
+    get_json_parser_class,
+    get_json_renderer_class,
+)
+
+
+class TestORJSONRenderer(TestCase):
+    def assert_renders_like_drf(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renders_like_drf(self):
+        """
+        Make sure the JSON is the same as DRF's
+        """
+        self.assert_renders_like_drf({
+            'text': 'ünïcödé "quoted" \\ </script>',
+            'separators': '  and  ',
+            'numbers': [1, -2, 3.5, Decimal('1.25')],
+            'nested': {'true': True, 'false': False, 'null': None},
+            'created': datetime(2020, 5, 17, 10, 30, 15, 123456, tzinfo=timezone.utc),
+            'naive': datetime(2020, 5, 17, 10, 30),
+            'date': date(2020, 5, 17),
+            'time': time(10, 30, 15, 500),
+        })
+        self.assert_renders_like_drf([])
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_renders_django_values(self):
+        """
+        Make sure lazy translations and image files are rendered
+        """
+        entry = Entry(thumbnail='images/entries/test.png')
+
+        self.assertEqual(
+            ORJSONRenderer().render({'text': gettext_lazy('Approved'), 'image': entry.thumbnail}),
+            '{{"text":"Approved","image":"{url}"}}'.format(url=entry.thumbnail.url).encode(),
+        )
+        self.assertEqual(ORJSONRenderer().render({'image': Entry().thumbnail}), b'{"image":null}')
+
+    def test_indented_rendering(self):
+        """
+        Make sure responses can still be pretty-printed
+        """
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+
+        self.assertEqual(ORJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+
+
+class TestORJSONParser(TestCase):
+    def parse(self, content, encoding='utf-8'):
+        return ORJSONParser().parse(io.BytesIO(content), parser_context={'encoding': encoding})
+
+    def test_parses_like_drf(self):
+        """
+        Make sure request bodies are parsed the same as with DRF
+        """
+        content = '{"title":"ünïcödé","ids":[1,2,3],"nested":{"a":null,"b":1.5}}'.encode()
+
+        self.assertEqual(self.parse(content), JSONParser().parse(io.BytesIO(content)))
+        self.assertEqual(self.parse('{"a":"é"}'.encode('latin-1'), encoding='latin-1'), {'a': 'é'})
+
+    def test_parse_errors(self):
+        """
+        Make sure invalid JSON results in a ParseError
+        """
+        for content in (b'', b'{"a":', b'{"a": NaN}', b'\xff'):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self.parse(content)
+
+
+class TestJSONSettings(TestCase):
+    def test_configured_classes(self):
+        """
+        Make sure JSON-only views use the JSON classes configured in REST_FRAMEWORK
+        """
+        self.assertIs(get_json_renderer_class(), ORJSONRenderer)
+        self.assertIs(get_json_parser_class(), ORJSONParser)
+
+        with override_settings(REST_FRAMEWORK={
+            'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+            'DEFAULT_PARSER_CLASSES': ('rest_framework.parsers.JSONParser',),
+        }):
+            self.assertIs(get_json_renderer_class(), JSONRenderer)
+            self.assertIs(get_json_parser_class(), JSONParser)
+
+
+class TestJSONViews(PulseMemberTestCase):
+    def test_invalid_json_request(self):
+        """
+        Make sure API views reject invalid JSON
+        """
+        response = self.client.post('/api/pulse/entries/', data='{"title":', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_status_escapes_names(self):
+        """
+        Make sure userstatus is valid JSON, whatever the user's name is
+        """
+        self.user.name = 'a "quoted" name'
+        self.user.save()
+
+        response = self.client.get('/api/pulse/userstatus/')
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['username'], 'a "quoted" name')
@@ -0,0 +1,26 @@
+from django.test import TestCase
+
+from pulseapi.utility.management.commands.report_seq_scans import get_seq_scans
+
+
+class TestSeqScans(TestCase):
+    def test_nested_seq_scans(self):
+        """
+        Make sure sequential scans are found anywhere in a query plan
+        """
+        plan = {
+            'Node Type': 'Nested Loop',
+            'Plans': [
+                {'Node Type': 'Seq Scan', 'Relation Name': 'entries_entry'},
+                {
+                    'Node Type': 'Hash',
+                    'Plans': [
+                        {'Node Type': 'Index Only Scan', 'Relation Name': 'entries_entry_tags'},
+                        {'Node Type': 'Seq Scan', 'Relation Name': 'tags_tag'},
+                    ],
+                },
+            ],
+        }
+
+        self.assertEqual(get_seq_scans(plan), ['entries_entry', 'tags_tag'])
+        self.assertEqual(get_seq_scans({'Node Type': 'Index Scan', 'Relation Name': 'entries_entry'}), [])
@@ -0,0 +1,109 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from pulseapi.entries.factory import EntryFactory
+from pulseapi.profiles.factory import BasicUserProfileFactory
+from pulseapi.tags.models import Tag
+from pulseapi.tests import PulseMemberTestCase
+
+
+@override_settings(CACHE_API_RESPONSES=True)
+class TestSyndicationFeeds(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_feeds_are_served_from_cache(self):
+        """
+        Make sure repeated feed requests only check whether the feed changed
+        """
+        for url in ('/rss/latest', '/rss/featured', '/atom/latest', '/atom/featured'):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+
+            with self.assertNumQueries(1):
+                second = self.client.get(url)
+
+            self.assertEqual(first.content, second.content)
+            self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_feed_conditional_get(self):
+        """
+        Make sure feed readers that already have the latest feed get a 304
+        """
+        response = self.client.get('/rss/latest')
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/rss/latest', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, 304)
+
+        not_modified = self.client.get('/rss/latest', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(CACHE_API_RESPONSES=False)
+    def test_uncached_feed_conditional_get(self):
+        """
+        Make sure feeds that aren't cached answer conditional
+        requests without being rendered
+        """
+        response = self.client.get('/rss/latest')
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/rss/latest', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/rss/latest', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_feed_outlives_unrelated_changes(self):
+        """
+        Make sure changes that don't show up in feeds, like profiles
+        without entries, don't change them or get them rendered again
+        """
+        response = self.client.get('/rss/latest')
+        profile = BasicUserProfileFactory()
+        profile.location = 'Toronto'
+        profile.save()
+
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/rss/latest', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_feed_invalidated_on_entry_change(self):
+        """
+        Make sure changing an entry updates the feed and its ETag
+        """
+        response = self.client.get('/rss/latest')
+        entry = self.entries[0]
+        entry.title = 'a brand new title'
+        entry.save()
+
+        updated = self.client.get('/rss/latest', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(updated.status_code, 200)
+        self.assertNotEqual(updated['ETag'], response['ETag'])
+        self.assertIn(b'a brand new title', updated.content)
+
+    def test_feed_query_count_does_not_depend_on_entries(self):
+        """
+        Make sure feeds fetch the related data of their entries in bulk
+        """
+        tag, _ = Tag.objects.get_or_create(name='test_feed_tag')
+
+        def count_feed_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                self.client.get('/rss/featured')
+            return len(context.captured_queries)
+
+        EntryFactory(featured=True).tags.add(tag)
+        query_count = count_feed_queries()
+
+        for i in range(3):
+            EntryFactory(featured=True).tags.add(tag)
+
+        self.assertEqual(count_feed_queries(), query_count)
@@ -0,0 +1,100 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+
+from pulseapi.entries.models import Entry
+from pulseapi.tests import PulseMemberTestCase
+from pulseapi.utility.thumbnails import update_thumbnails
+
+
+def get_image_file(width, height, image_format='PNG', mode='RGB'):
+    output = BytesIO()
+    Image.new(mode, (width, height)).save(output, image_format)
+    return ContentFile(output.getvalue())
+
+
+class TestThumbnails(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+        self.entry = self.entries[0]
+        self.entry.thumbnail.save('image.png', get_image_file(600, 300))
+        self.entry_url = reverse('entry', kwargs={'pk': self.entry.id})
+
+    def test_derivatives(self):
+        """
+        Make sure derivatives are generated at every width
+        that isn't wider than the original image
+        """
+        self.assertEqual(self.client.get(self.entry_url).json()['thumbnails'], {})
+
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+        sizes = self.entry.thumbnails['sizes']
+
+        self.assertEqual(self.entry.thumbnails['source'], self.entry.thumbnail.name)
+        self.assertEqual([(size['width'], size['height']) for size in sizes], [(200, 100), (400, 200), (600, 300)])
+
+        for size in sizes:
+            with default_storage.open(size['jpeg']) as f:
+                self.assertEqual(Image.open(f).size, (size['width'], size['height']))
+
+        thumbnails = self.client.get(self.entry_url).json()['thumbnails']
+        self.assertEqual(list(thumbnails), ['200', '400', '600'])
+        self.assertEqual(thumbnails['400']['height'], 200)
+        self.assertTrue(thumbnails['400']['jpeg'].endswith('-400w.jpg'))
+
+    def test_transparent_image(self):
+        """
+        Make sure images with transparency can be converted to JPEG
+        """
+        self.entry.thumbnail.save('image.png', get_image_file(100, 100, mode='RGBA'))
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+
+        self.assertEqual([size['width'] for size in self.entry.thumbnails['sizes']], [100])
+
+    def test_replaced_thumbnail(self):
+        """
+        Make sure derivatives of a previous thumbnail are not served,
+        and are deleted once the new thumbnail is resized
+        """
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+        previous = self.entry.thumbnails['sizes'][0]['jpeg']
+
+        self.entry.thumbnail.save('other.png', get_image_file(300, 300))
+        self.assertEqual(self.client.get(self.entry_url).json()['thumbnails'], {})
+
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+
+        self.assertEqual([size['height'] for size in self.entry.thumbnails['sizes']], [200, 300])
+        self.assertFalse(default_storage.exists(previous))
+
+    def test_removed_thumbnail(self):
+        """
+        Make sure derivatives are removed along with the thumbnail
+        """
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+        previous = self.entry.thumbnails['sizes'][0]['jpeg']
+
+        self.entry.thumbnail = None
+        self.entry.save()
+        update_thumbnails(Entry, self.entry.id)
+        self.entry.refresh_from_db()
+
+        self.assertEqual(self.entry.thumbnails, {})
+        self.assertFalse(default_storage.exists(previous))
@@ -0,0 +1,120 @@
+import base64
+import json
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from PIL import Image
+
+from pulseapi.entries.models import Entry
+from pulseapi.tests import PulseMemberTestCase
+from pulseapi.utility.tests.test_thumbnails import get_image_file
+
+
+class TestThumbnailUploads(PulseMemberTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+        self.image = get_image_file(120, 80).read()
+
+    def post_entry(self, image, **fields):
+        fields.setdefault('data', self.generatePostPayload())
+
+        return self.client.post(reverse('entries-list'), content_type=MULTIPART_CONTENT, data=dict(
+            fields,
+            thumbnail=SimpleUploadedFile('image.png', image, 'image/png'),
+        ))
+
+    def test_entry_upload(self):
+        """
+        Make sure entry thumbnails can be uploaded as multipart files
+        """
+        response = self.post_entry(self.image)
+        self.assertEqual(response.status_code, 200)
+
+        entry = Entry.objects.get(pk=response.json()['id'])
+        self.assertEqual(entry.title, 'default title')
+        self.assertEqual(set(entry.tags.values_list('name', flat=True)), {'tag1', 'tag2'})
+
+        with entry.thumbnail.open('rb'):
+            self.assertEqual(Image.open(entry.thumbnail).size, (120, 80))
+
+    def test_profile_upload(self):
+        """
+        Make sure profile thumbnails can be uploaded as multipart files,
+        and still as base64 strings
+        """
+        profile_url = reverse('myprofile')
+        # Unlike post, the test client doesn't encode multipart data for put
+        response = self.client.put(profile_url, encode_multipart(BOUNDARY, {
+            'data': json.dumps({'location': 'Toronto'}),
+            'thumbnail': SimpleUploadedFile('avatar.png', self.image, 'image/png'),
+        }), content_type=MULTIPART_CONTENT)
+        self.assertEqual(response.status_code, 200)
+
+        profile = self.user.profile
+        profile.refresh_from_db()
+        self.assertEqual(profile.location, 'Toronto')
+        self.assertTrue(profile.thumbnail.name.endswith('.png'))
+
+        response = self.client.put(profile_url, json.dumps({
+            'thumbnail': {'name': 'avatar.png', 'base64': base64.b64encode(self.image).decode()},
+        }))
+        self.assertEqual(response.status_code, 200)
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.location, 'Toronto')
+        self.assertTrue(profile.thumbnail.name.endswith('.png'))
+
+    def test_profile_form_fields(self):
+        """
+        Make sure profiles can still be updated with plain multipart form fields
+        """
+        response = self.client.put(reverse('myprofile'), encode_multipart(BOUNDARY, {
+            'location': 'Toronto',
+            'thumbnail': SimpleUploadedFile('avatar.png', self.image, 'image/png'),
+        }), content_type=MULTIPART_CONTENT)
+        self.assertEqual(response.status_code, 200)
+
+        profile = self.user.profile
+        profile.refresh_from_db()
+        self.assertEqual(profile.location, 'Toronto')
+        self.assertTrue(profile.thumbnail.name.endswith('.png'))
+
+    @override_settings(MAX_THUMBNAIL_UPLOAD_SIZE=1024)
+    def test_upload_size_limit(self):
+        """
+        Make sure uploads larger than the limit are turned down,
+        before or while they are read
+        """
+        large_image = get_image_file(1000, 1000, image_format='BMP').read()
+        entry_count = Entry.objects.count()
+
+        # Small enough to be read, but too large for a thumbnail
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=len(large_image)):
+            response = self.post_entry(large_image)
+        self.assertEqual(response.status_code, 413)
+
+        # Too large to be read at all
+        response = self.post_entry(large_image)
+        self.assertEqual(response.status_code, 413)
+
+        self.assertEqual(Entry.objects.count(), entry_count)
+
+    def test_unexpected_fields(self):
+        """
+        Make sure multipart requests only take their fields as JSON
+        """
+        response = self.post_entry(self.image, title='Form title')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.post_entry(self.image, data='["not", "an", "object"]')
+        self.assertEqual(response.status_code, 400)
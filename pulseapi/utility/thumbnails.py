@@ -0,0 +1,195 @@
+"""
+Resized derivatives of entry thumbnails and profile avatars.
+
+Uploaded images are served at their original size, which can be far larger
+than what the frontend shows. Whenever the `thumbnail` of an entry or a
+profile changes, a background job (see pulseapi/jobs) generates fixed-width JPEG
+and WebP derivatives. They are stored next to the original, and recorded
+with their dimensions in the model's `thumbnails` field:
+
+    {
+        "source": <name of the image the derivatives were made from>,
+        "sizes": [{"width": 200, "height": 150, "jpeg": <name>, "webp": <name>}, ...],
+    }
+
+Derivatives are never wider than the original image, so images that are
+narrower than some of the model's `thumbnail_widths` get fewer derivatives.
+"""
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from pulseapi.entries.cache import bump_entries_generation
+from pulseapi.jobs.registry import enqueue
+
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+
+
+def get_derivative_name(source_name, width, extension):
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+
+    return os.path.join(directory, 'thumbnails', '{stem}-{width}w.{extension}'.format(
+        stem=stem,
+        width=width,
+        extension=extension,
+    ))
+
+
+def open_image(field_file):
+    """
+    Return the image of a file field as an RGB or RGBA image,
+    rotated according to its EXIF orientation
+    """
+    with field_file.open('rb'):
+        image = Image.open(field_file)
+        image.load()
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def encode_jpeg(image):
+    if image.mode == 'RGBA':
+        # JPEG has no transparency, so transparent pixels become white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+
+    output = BytesIO()
+    image.save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return output.getvalue()
+
+
+def encode_webp(image):
+    output = BytesIO()
+    image.save(output, 'WEBP', quality=WEBP_QUALITY)
+    return output.getvalue()
+
+
+def generate_derivatives(field_file, widths):
+    """
+    Generate and store the derivatives of an image file field, and
+    return their sizes in the format of the `thumbnails` field.
+    Derivatives that were already stored for the same image (when
+    several objects share one, or when generating them again) are
+    reused as they are.
+    """
+    image = open_image(field_file)
+    storage = field_file.storage
+    encoders = [('jpeg', 'jpg', encode_jpeg)]
+
+    if features.check('webp'):
+        encoders.append(('webp', 'webp', encode_webp))
+
+    sizes = []
+
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        size = {'width': width, 'height': height}
+
+        for image_format, extension, encode in encoders:
+            name = get_derivative_name(field_file.name, width, extension)
+
+            if not storage.exists(name):
+                if resized is None:
+                    resized = image.resize((width, height), Image.LANCZOS) if width < image.width else image
+                name = storage.save(name, ContentFile(encode(resized)))
+
+            size[image_format] = name
+
+        sizes.append(size)
+
+    return sizes
+
+
+def delete_derivatives(model, storage, thumbnails):
+    """
+    Delete the stored derivatives of a `thumbnails` value,
+    unless another object still uses the same image
+    """
+    if not thumbnails or model.objects.filter(thumbnail=thumbnails['source']).exists():
+        return
+
+    for size in thumbnails['sizes']:
+        for image_format in ('jpeg', 'webp'):
+            if image_format in size:
+                storage.delete(size[image_format])
+
+
+def update_thumbnails(model, pk):
+    """
+    Generate the derivatives of the thumbnail of an entry or a profile,
+    if they haven't been generated for its current thumbnail yet
+    """
+    instance = model.objects.filter(pk=pk).first()
+
+    if instance is None:
+        return
+
+    thumbnail = instance.thumbnail
+    previous = instance.thumbnails or {}
+
+    if thumbnail:
+        if previous.get('source') == thumbnail.name:
+            return
+
+        thumbnails = {
+            'source': thumbnail.name,
+            'sizes': generate_derivatives(thumbnail, model.thumbnail_widths),
+        }
+    elif previous:
+        thumbnails = {}
+    else:
+        return
+
+    # The thumbnail may have been replaced while we were busy, in which case
+    # the derivatives are thrown away and left to the update for the new one.
+    if not model.objects.filter(pk=pk, thumbnail=thumbnail.name or '').update(thumbnails=thumbnails):
+        delete_derivatives(model, thumbnail.storage, thumbnails)
+        return
+
+    delete_derivatives(model, thumbnail.storage, previous)
+    model.objects.filter(pk=pk).touch()
+    bump_entries_generation()
+
+
+def schedule_thumbnail_update(instance):
+    """
+    Queue a job to update the derivatives of an entry's or a profile's thumbnail
+    """
+    if not settings.GENERATE_THUMBNAILS:
+        return
+
+    enqueue('thumbnails.update', model=instance._meta.label, pk=instance.pk)
+
+
+def get_thumbnail_urls(thumbnail, thumbnails):
+    """
+    Return a dictionary of {width: {width, height, jpeg url, webp url}}
+    for the derivatives of a thumbnail, or an empty dictionary if they
+    haven't been generated yet
+    """
+    if not thumbnail or not thumbnails or thumbnails.get('source') != thumbnail.name:
+        return {}
+
+    storage = thumbnail.storage
+    urls = {}
+
+    for size in thumbnails['sizes']:
+        urls[str(size['width'])] = dict(
+            {'width': size['width'], 'height': size['height']},
+            **{
+                image_format: storage.url(size[image_format])
+                for image_format in ('jpeg', 'webp') if image_format in size
+            }
+        )
+
+    return urls
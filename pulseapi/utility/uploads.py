@@ -0,0 +1,124 @@
+"""
+Multipart thumbnail uploads.
+
+Entries and profiles have always taken their thumbnail as a base64 string
+inside the JSON body, which keeps the JSON text, the decoded image and the
+parsed data in memory at the same time. They can also be sent as
+multipart/form-data, with the JSON body in a `data` part and the image in a
+`thumbnail` file part. The image is streamed to a temporary file as it is
+read, and the upload is cut off as soon as it goes over
+MAX_THUMBNAIL_UPLOAD_SIZE, before the image is ever opened.
+
+Profiles have always taken plain multipart form fields as well, so their
+multipart requests can leave out the `data` part and send their fields as
+form fields instead.
+"""
+import orjson
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.utils.datastructures import MultiValueDict
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+# The name of the part that holds the JSON body of multipart requests
+DATA_FIELD = 'data'
+THUMBNAIL_FIELD = 'thumbnail'
+
+
+class ThumbnailTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_code = 'thumbnail_too_large'
+
+    def __init__(self):
+        super().__init__('Thumbnails cannot be larger than {size} bytes.'.format(
+            size=settings.MAX_THUMBNAIL_UPLOAD_SIZE,
+        ))
+
+
+class UploadData(dict):
+    """
+    The data of a multipart request. DRF merges the uploaded files into a
+    copy of the data, which would add them as lists to a plain dictionary.
+    """
+    def copy(self):
+        return UploadData(self)
+
+    def update(self, other=(), **kwargs):
+        if isinstance(other, MultiValueDict):
+            other = other.items()
+
+        super().update(other, **kwargs)
+
+
+class ThumbnailUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream the thumbnail of a multipart request to a temporary file,
+    and stop reading as soon as it is larger than allowed.
+    Files in other parts are skipped.
+    """
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Requests that can't fit are turned away before reading any of them
+        max_length = settings.MAX_THUMBNAIL_UPLOAD_SIZE + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+
+        if content_length > max_length:
+            raise ThumbnailTooLarge()
+
+    def new_file(self, field_name, *args, **kwargs):
+        if field_name != THUMBNAIL_FIELD:
+            raise SkipFile()
+
+        super().new_file(field_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.MAX_THUMBNAIL_UPLOAD_SIZE:
+            self.file.close()
+            raise ThumbnailTooLarge()
+
+        return super().receive_data_chunk(raw_data, start)
+
+
+class ThumbnailUploadParser(MultiPartParser):
+    """
+    Parse multipart requests made of a JSON `data` part and a
+    `thumbnail` file part, into the same data a JSON request
+    with a base64 thumbnail would give, with the thumbnail
+    as an uploaded file.
+    """
+    # Whether requests without a `data` part can send their fields as form fields
+    allow_form_fields = False
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        request.upload_handlers = [ThumbnailUploadHandler(request)]
+        parsed = super().parse(stream, media_type, parser_context)
+        fields = parsed.data
+
+        if self.allow_form_fields and DATA_FIELD not in fields:
+            return parsed
+
+        unexpected = set(fields) - {DATA_FIELD}
+
+        if unexpected:
+            raise ParseError('Multipart requests can only have a "{data}" and a "{thumbnail}" part'.format(
+                data=DATA_FIELD,
+                thumbnail=THUMBNAIL_FIELD,
+            ))
+
+        try:
+            data = orjson.loads(fields.get(DATA_FIELD, '{}'))
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - {}'.format(exc))
+
+        if not isinstance(data, dict):
+            raise ParseError('The "{data}" part must be a JSON object'.format(data=DATA_FIELD))
+
+        return DataAndFiles(UploadData(data), parsed.files)
+
+
+class ProfileUploadParser(ThumbnailUploadParser):
+    """
+    Parse multipart profile updates, which can either have a JSON `data`
+    part, or plain form fields like any multipart request.
+    """
+    allow_form_fields = True
@@ -147,6 +147,18 @@ def test(ctx):
     manage(ctx, "test")
 
 
+@task
+def benchmark(ctx, arguments=""):
+    """Benchmark the API routes and check their query budgets"""
+    manage(ctx, f"run_benchmarks {arguments}")
+
+
+@task
+def seq_scans(ctx, arguments=""):
+    """Report the API queries that use sequential scans"""
+    manage(ctx, f"report_seq_scans {arguments}")
+
+
 # Pip-tools
 @task(aliases=["docker-pip-compile"])
 def pip_compile(ctx, command):